@@ -1,6 +1,6 @@
 {
     'name': 'Supplier Audit Management',
-    'version': '1.0',
+    'version': '1.1',
     'sequence': -100,
     'category': 'Inventory/Purchase',
     'summary': 'Supplier audit management system',
@@ -19,10 +19,21 @@
         'security/security.xml',
         'security/ir.model.access.csv',
         'data/audit_checklist_data.xml',
+        'data/ir_cron_data.xml',
+        'data/mail_template_data.xml',
+        'data/audit_finding_rule_data.xml',
         'views/audit_checklist_views.xml',
         'views/audit_finding_views.xml',
         'views/corrective_action_views.xml',
         'views/supplier_audit_views.xml',
+        'views/audit_programme_views.xml',
+        'views/audit_portfolio_views.xml',
+        'views/supplier_scorecard_views.xml',
+        'views/audit_profile_views.xml',
+        'wizard/audit_programme_wizard_views.xml',
+        'wizard/checklist_import_preview_views.xml',
+        'wizard/audit_export_views.xml',
+        'wizard/bulk_transition_views.xml',
         'views/menu_views.xml',
         'report/supplier_audit_report.xml',
         'report/supplier_audit_report_template.xml',
@@ -32,6 +43,10 @@
             'https://cdnjs.cloudflare.com/ajax/libs/Chart.js/3.9.1/chart.min.js',
             'supplier_audit/static/src/js/radar_chart_widget.js',
             'supplier_audit/static/src/xml/radar_chart_templates.xml',
+            'supplier_audit/static/src/js/audit_question_tabs.js',
+            'supplier_audit/static/src/xml/audit_question_tabs_templates.xml',
+            'supplier_audit/static/src/js/portfolio_dashboard.js',
+            'supplier_audit/static/src/xml/portfolio_dashboard_templates.xml',
             'supplier_audit/static/src/css/sp.css',
         ],
     },
@@ -0,0 +1,138 @@
+"""Compare the checklist import readers on a large generated checklist.
+
+Measures the parse time and the peak Python memory of streaming a checklist
+through each reader, header detection and cell extraction included (the
+part of the import that depends on the file format).
+
+Usage::
+
+    python supplier_audit/benchmarks/bench_checklist_import.py [--rows 50000]
+"""
+from io import BytesIO, StringIO
+import argparse
+import csv
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+from openpyxl import Workbook
+
+# The readers do not need Odoo: load them without importing the addon
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tools'))
+from checklist_import import READERS, cell_value, detect_header_columns  # noqa: E402
+
+HEADER = ['Category', 'Question', 'Evidence Required', 'Scoring Criteria', 'Status', 'Observation', 'Action']
+CATEGORIES = ['Management', 'Manufacturing', 'Production Readiness', 'QA']
+
+
+def generate_rows(count):
+    for i in range(count):
+        yield [
+            CATEGORIES[i % len(CATEGORIES)],
+            'Is requirement %s documented, implemented and reviewed at planned intervals?' % i,
+            'Procedure, records and review minutes for requirement %s' % i,
+            '0 = missing, 1 = partial, 2 = implemented, 3 = effective',
+            i % 4,
+            'Observation %s' % i,
+            'Action %s' % i,
+        ]
+
+
+def build_xlsx(count):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Checklist')
+    sheet.append(HEADER)
+    for row in generate_rows(count):
+        sheet.append(row)
+    output = BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def build_csv(count):
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(HEADER)
+    writer.writerows(generate_rows(count))
+    return output.getvalue().encode('utf-8')
+
+
+def _ods_row(values):
+    cells = []
+    for value in values:
+        if isinstance(value, int):
+            cells.append('<table:table-cell office:value-type="float" office:value="%s"><text:p>%s</text:p>'
+                         '</table:table-cell>' % (value, value))
+        else:
+            cells.append('<table:table-cell office:value-type="string"><text:p>%s</text:p></table:table-cell>'
+                         % escape(value))
+    return '<table:table-row>%s</table:table-row>' % ''.join(cells)
+
+
+def build_ods(count):
+    content = [
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+        '<office:body><office:spreadsheet><table:table table:name="Checklist">',
+        _ods_row(HEADER),
+    ]
+    content.extend(_ods_row(row) for row in generate_rows(count))
+    content.append('<table:table-row table:number-rows-repeated="1048000"><table:table-cell '
+                   'table:number-columns-repeated="1024"/></table:table-row>'
+                   '</table:table></office:spreadsheet></office:body></office:document-content>')
+    output = BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('mimetype', 'application/vnd.oasis.opendocument.spreadsheet', zipfile.ZIP_STORED)
+        archive.writestr('content.xml', ''.join(content))
+    return output.getvalue()
+
+
+BUILDERS = {
+    'xlsx': build_xlsx,
+    'csv': build_csv,
+    'ods': build_ods,
+}
+
+
+def parse(reader, data):
+    questions = 0
+    for _sheet_name, rows in reader(data):
+        columns = None
+        for row in rows:
+            if columns is None:
+                columns = detect_header_columns(row)
+                continue
+            if cell_value(row, columns.get('name')):
+                questions += 1
+                [cell_value(row, idx) for idx in columns.values()]
+    return questions
+
+
+def run(count):
+    print('%-6s %10s %12s %10s %14s' % ('format', 'size (KB)', 'questions', 'time (s)', 'peak mem (MB)'))
+    for extension, builder in BUILDERS.items():
+        data = builder(count)
+        reader = READERS[extension]
+
+        start = time.perf_counter()
+        questions = parse(reader, data)
+        duration = time.perf_counter() - start
+
+        tracemalloc.start()
+        parse(reader, data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print('%-6s %10d %12d %10.2f %14.1f' % (
+            extension, len(data) / 1024, questions, duration, peak / 1024 / 1024))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000, help="number of questions in the checklist")
+    run(parser.parse_args().rows)
@@ -0,0 +1,261 @@
+"""Report the query plans and timings of the module's hot queries.
+
+Seeds a large data set (suppliers, audits, question lines, findings and
+corrective actions) into a database where the module is installed, runs
+``EXPLAIN ANALYZE`` on the queries behind the list views, search filters,
+group-bys, score aggregation and scorecards, and prints their execution
+time and plan. With ``--compare`` the queries are run a second time after
+dropping the module's indexes, to measure what each index brings.
+
+Everything runs in a single transaction that is rolled back, the database
+is left untouched.
+
+Usage::
+
+    python supplier_audit/benchmarks/bench_query_plans.py --db mydb [--audits 20000] [--questions 100] [--compare]
+"""
+import argparse
+import json
+import random
+
+import psycopg2
+
+# Indexes of the module: index=True fields and the indexes of the init() methods
+MODULE_INDEXES = [
+    'supplier_audit__partner_id_index',
+    'supplier_audit__state_index',
+    'supplier_audit_date_id_index',
+    'supplier_audit_partner_done_index',
+    'supplier_audit_question_line__category_id_index',
+    'supplier_audit_question_line_audit_sequence_index',
+    'supplier_audit_question_line_audit_score_index',
+    'audit_finding__audit_id_index',
+    'audit_finding__partner_id_index',
+    'audit_finding__question_line_id_index',
+    'audit_finding__severity_index',
+    'audit_finding_partner_severe_date_index',
+    'sa_corrective_action__audit_id_index',
+    'sa_corrective_action__finding_id_index',
+    'sa_corrective_action__partner_id_index',
+    'sa_corrective_action__state_index',
+    'sa_corrective_action__due_date_index',
+    'sa_corrective_action_open_due_date_index',
+    'sa_corrective_action_open_partner_index',
+]
+
+# (label, query); %(audit_ids)s, %(audit_id)s and %(partner_id)s are sample values
+QUERIES = [
+    ('audit list', """
+        SELECT id FROM supplier_audit ORDER BY audit_date DESC, id DESC LIMIT 80
+    """),
+    ('audit filter this_month', """
+        SELECT id FROM supplier_audit
+         WHERE audit_date >= date_trunc('month', CURRENT_DATE)
+           AND audit_date < date_trunc('month', CURRENT_DATE) + interval '1 month'
+      ORDER BY audit_date DESC, id DESC LIMIT 80
+    """),
+    ('audit filter last_month', """
+        SELECT id FROM supplier_audit
+         WHERE audit_date >= date_trunc('month', CURRENT_DATE) - interval '1 month'
+           AND audit_date < date_trunc('month', CURRENT_DATE)
+      ORDER BY audit_date DESC, id DESC LIMIT 80
+    """),
+    ('audit group_by_partner', """
+        SELECT partner_id, COUNT(*) FROM supplier_audit GROUP BY partner_id ORDER BY partner_id
+    """),
+    ('audits of a supplier', """
+        SELECT id FROM supplier_audit WHERE partner_id = %(partner_id)s ORDER BY audit_date DESC, id DESC
+    """),
+    ('audit form question lines', """
+        SELECT id FROM supplier_audit_question_line WHERE audit_id = %(audit_id)s ORDER BY sequence, id
+    """),
+    ('score aggregation (500 audits)', """
+        SELECT audit_id, category_id, state, COUNT(*), COALESCE(SUM(status::int), 0)
+          FROM supplier_audit_question_line
+         WHERE audit_id IN %(audit_ids)s
+      GROUP BY audit_id, category_id, state
+    """),
+    ('findings of an audit', """
+        SELECT id FROM audit_finding WHERE audit_id = %(audit_id)s ORDER BY id DESC
+    """),
+    ('finding group_by_partner', """
+        SELECT partner_id, severity, COUNT(*) FROM audit_finding GROUP BY partner_id, severity
+    """),
+    ('actions of an audit', """
+        SELECT id FROM sa_corrective_action WHERE audit_id = %(audit_id)s ORDER BY due_date, id
+    """),
+    ('overdue open actions', """
+        SELECT id FROM sa_corrective_action
+         WHERE state NOT IN ('completed', 'cancelled') AND due_date < CURRENT_DATE
+      ORDER BY due_date, id LIMIT 80
+    """),
+    ('scorecard: last completed audits', """
+        SELECT partner_id, id FROM (
+            SELECT partner_id, id, ROW_NUMBER() OVER (PARTITION BY partner_id ORDER BY audit_date DESC, id DESC) AS rank
+              FROM supplier_audit WHERE partner_id = %(partner_id)s AND state = 'done') AS audits
+         WHERE rank <= 2
+    """),
+    ('scorecard: severe findings', """
+        SELECT partner_id, COUNT(*) FROM audit_finding
+         WHERE partner_id = %(partner_id)s AND finding_date >= CURRENT_DATE - interval '12 months'
+           AND severity IN ('critical', 'major')
+      GROUP BY partner_id
+    """),
+    ('scorecard: open actions', """
+        SELECT partner_id, COUNT(*) FROM sa_corrective_action
+         WHERE partner_id = %(partner_id)s AND state NOT IN ('completed', 'cancelled')
+      GROUP BY partner_id
+    """),
+]
+
+
+def clone_rows(cr, table, source_id, count, overrides):
+    """Insert ``count`` copies of a row, so that every NOT NULL column of
+    the installed modules gets a value; ``overrides`` is a SQL jsonb
+    expression of the columns to change, ``g`` being the copy number."""
+    cr.execute("""
+        INSERT INTO {table}
+        SELECT (jsonb_populate_record(NULL::{table}, to_jsonb(t) || jsonb_build_object('id', nextval('{table}_id_seq'))
+                                      || {overrides})).*
+          FROM {table} t, generate_series(1, %s) AS g
+         WHERE t.id = %s
+     RETURNING id
+    """.format(table=table, overrides=overrides), [count, source_id])
+    return [row[0] for row in cr.fetchall()]
+
+
+def seed(cr, audits, questions, partners):
+    cr.execute("SELECT id, partner_id FROM res_users WHERE id = 2")
+    uid, user_partner_id = cr.fetchone()
+    cr.execute("SELECT id FROM res_company ORDER BY id LIMIT 1")
+    company_id = cr.fetchone()[0]
+    cr.execute("SELECT id FROM audit_question_category ORDER BY sequence, id")
+    category_ids = [row[0] for row in cr.fetchall()]
+    if not category_ids:
+        raise SystemExit("No question category found, is the module installed?")
+
+    partner_ids = clone_rows(cr, 'res_partner', user_partner_id, partners,
+                             "jsonb_build_object('name', 'Bench Supplier ' || g, 'supplier_rank', 1)")
+
+    cr.execute("INSERT INTO audit_checklist (name, active) VALUES ('Bench Checklist', true) RETURNING id")
+    checklist_id = cr.fetchone()[0]
+    cr.execute("""
+        INSERT INTO audit_checklist_question (checklist_id, name, category_id, sequence, active)
+        SELECT %s, 'Bench question ' || g, (%s::int[])[1 + g %% %s], g, true
+          FROM generate_series(1, %s) AS g
+    """, [checklist_id, category_ids, len(category_ids), questions])
+
+    # Audits spread over the last three years, 3 in 7 of them completed
+    cr.execute("""
+        INSERT INTO supplier_audit (name, partner_id, audit_date, auditor_id, checklist_id, company_id, state,
+                                    compliance_score, create_uid, write_uid, create_date, write_date)
+        SELECT 'BENCH/' || g, (%s::int[])[1 + g %% %s], CURRENT_DATE - (g %% 1095), %s, %s, %s,
+               (ARRAY['draft', 'planned', 'in_progress', 'done', 'done', 'done', 'cancelled'])[1 + g %% 7],
+               random(), %s, %s, now(), now()
+          FROM generate_series(1, %s) AS g
+     RETURNING id
+    """, [partner_ids, len(partner_ids), uid, checklist_id, company_id, uid, uid, audits])
+    audit_ids = [row[0] for row in cr.fetchall()]
+
+    cr.execute("""
+        INSERT INTO supplier_audit_question_line (audit_id, question_id, category_id, sequence, state, status)
+        SELECT a.id, q.id, q.category_id, q.sequence,
+               (ARRAY['pending', 'answered', 'answered', 'na'])[1 + (a.id + q.id) %% 4],
+               ((a.id + q.id) %% 4)::varchar
+          FROM supplier_audit a, audit_checklist_question q
+         WHERE a.name LIKE 'BENCH/%%' AND q.checklist_id = %s
+    """, [checklist_id])
+    cr.execute("""
+        INSERT INTO audit_finding (name, description, audit_id, partner_id, severity, finding_date, state)
+        SELECT 'BFIND/' || a.id || '/' || g, 'Bench finding', a.id, a.partner_id,
+               (ARRAY['critical', 'major', 'minor', 'observation'])[1 + (a.id + g) % 4], a.audit_date, 'open'
+          FROM supplier_audit a, generate_series(1, 3) AS g
+         WHERE a.name LIKE 'BENCH/%'
+    """)
+    cr.execute("""
+        INSERT INTO sa_corrective_action (name, description, audit_id, finding_id, partner_id, action_type,
+                                          state, priority, escalation_level, due_date, assigned_to, company_id)
+        SELECT 'BCA/' || f.id, 'Bench action', f.audit_id, f.id, f.partner_id, 'corrective',
+               (ARRAY['draft', 'planned', 'in_progress', 'review', 'completed', 'completed', 'cancelled'])[1 + f.id %% 7],
+               '1', '0', f.finding_date + 30, %s, %s
+          FROM audit_finding f
+         WHERE f.name LIKE 'BFIND/%%'
+    """, [uid, company_id])
+    for table in ('res_partner', 'supplier_audit', 'supplier_audit_question_line', 'audit_finding',
+                  'sa_corrective_action'):
+        cr.execute('ANALYZE %s' % table)
+    return audit_ids, partner_ids
+
+
+def explain(cr, query, params):
+    cr.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + query, params)
+    result = cr.fetchone()[0]
+    result = result[0] if isinstance(result, list) else json.loads(result)[0]
+    plan = result['Plan']
+    nodes = []
+
+    def walk(node):
+        name = node['Node Type']
+        if node.get('Index Name'):
+            name += ' (%s)' % node['Index Name']
+        elif node.get('Relation Name'):
+            name += ' (%s)' % node['Relation Name']
+        nodes.append(name)
+        for child in node.get('Plans', []):
+            walk(child)
+
+    walk(plan)
+    return result['Execution Time'], nodes
+
+
+def run_queries(cr, params):
+    results = {}
+    for label, query in QUERIES:
+        explain(cr, query, params)  # warm up the cache
+        results[label] = explain(cr, query, params)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--db', required=True, help="database where supplier_audit is installed")
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', default=None)
+    parser.add_argument('--user', default=None)
+    parser.add_argument('--password', default=None)
+    parser.add_argument('--audits', type=int, default=20000)
+    parser.add_argument('--questions', type=int, default=100)
+    parser.add_argument('--partners', type=int, default=2000)
+    parser.add_argument('--compare', action='store_true', help="also run the queries without the module indexes")
+    args = parser.parse_args()
+
+    connection = psycopg2.connect(dbname=args.db, host=args.host, port=args.port,
+                                  user=args.user, password=args.password)
+    try:
+        with connection.cursor() as cr:
+            audit_ids, partner_ids = seed(cr, args.audits, args.questions, args.partners)
+            print("Seeded %s audits with %s questions each" % (len(audit_ids), args.questions))
+            params = {
+                'audit_ids': tuple(random.sample(audit_ids, min(500, len(audit_ids)))),
+                'audit_id': random.choice(audit_ids),
+                'partner_id': random.choice(partner_ids),
+            }
+            with_indexes = run_queries(cr, params)
+            without_indexes = {}
+            if args.compare:
+                for index in MODULE_INDEXES:
+                    cr.execute('DROP INDEX IF EXISTS %s' % index)
+                without_indexes = run_queries(cr, params)
+
+            print('\n%-36s %12s %12s  %s' % ('query', 'indexed ms', 'no index ms', 'plan'))
+            for label, (duration, nodes) in with_indexes.items():
+                baseline = without_indexes.get(label, (None,))[0]
+                print('%-36s %12.2f %12s  %s' % (
+                    label, duration, '%.2f' % baseline if baseline is not None else '-', ' > '.join(nodes)))
+    finally:
+        connection.rollback()
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from odoo import http
+from odoo.http import content_disposition, request
+from werkzeug.wsgi import wrap_file
+import os
+
+
+class SupplierAuditController(http.Controller):
+
+    @http.route('/supplier_audit/audit/<int:audit_id>/answers', type='json', auth='user', methods=['POST'])
+    def sync_answers(self, audit_id, answers):
+        """Bulk answer endpoint for the offline and mobile capture clients,
+        see ``supplier.audit.apply_question_answers``."""
+        audit = request.env['supplier.audit'].browse(audit_id).exists()
+        if not audit:
+            raise request.not_found()
+        audit.check_access_rights('write')
+        audit.check_access_rule('write')
+        return audit.apply_question_answers(answers)
+
+    @http.route('/supplier_audit/export/<int:wizard_id>', type='http', auth='user')
+    def download_export(self, wizard_id):
+        """Stream the export of the audit export wizard from its temporary
+        file, see ``supplier.audit.export.wizard.action_export``."""
+        wizard = request.env['supplier.audit.export.wizard'].browse(wizard_id).exists()
+        if not wizard:
+            raise request.not_found()
+        export_file, writer = wizard._export_file()
+        return request.make_response(wrap_file(request.httprequest.environ, export_file), headers=[
+            ('Content-Type', writer.mimetype),
+            ('Content-Length', os.fstat(export_file.fileno()).st_size),
+            ('Content-Disposition', content_disposition(wizard._get_export_file_name())),
+        ])
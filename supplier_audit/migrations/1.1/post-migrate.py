@@ -0,0 +1,26 @@
+"""Freeze a checklist version for the audits created before the checklist
+versions, from the questions of their lines."""
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    cr.execute("""
+        SELECT a.id, a.checklist_id, array_agg(DISTINCT l.question_id ORDER BY l.question_id)
+          FROM supplier_audit a
+          JOIN supplier_audit_question_line l ON l.audit_id = a.id
+         WHERE a.checklist_version_id IS NULL AND a.checklist_id IS NOT NULL
+      GROUP BY a.id, a.checklist_id
+    """)
+    # Audits with the same questions share their version
+    audits_by_questions = {}
+    for audit_id, checklist_id, question_ids in cr.fetchall():
+        audits_by_questions.setdefault((checklist_id, tuple(question_ids)), []).append(audit_id)
+    for (checklist_id, question_ids), audit_ids in audits_by_questions.items():
+        checklist = env['audit.checklist'].browse(checklist_id)
+        version = checklist._get_frozen_version(env['audit.checklist.question'].browse(question_ids))
+        env['supplier.audit'].browse(audit_ids).with_context(tracking_disable=True).write({
+            'checklist_version_id': version.id,
+        })
@@ -0,0 +1,75 @@
+"""Link the question lines created before the checklist versions to a
+checklist question holding their text, so that the question of a line can
+be required and the lines only store their answers."""
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Question text copied into the lines before the checklist versions
+LINE_TEXT_COLUMNS = ['name', 'evidence', 'scoring_criteria']
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    # Questions are created below for the lines whose question was
+    # deleted; they are archived, so the active column is added first
+    cr.execute("ALTER TABLE audit_checklist_question ADD COLUMN IF NOT EXISTS active boolean")
+    cr.execute("UPDATE audit_checklist_question SET active = true WHERE active IS NULL")
+
+    # Lines matching the text of a question of the checklist of their
+    # audit, the question of the same category first
+    cr.execute("""
+        UPDATE supplier_audit_question_line AS line
+           SET question_id = matched.question_id
+          FROM (SELECT DISTINCT ON (l.id) l.id, q.id AS question_id
+                  FROM supplier_audit_question_line l
+                  JOIN supplier_audit a ON a.id = l.audit_id
+                  JOIN audit_checklist_question q
+                    ON q.checklist_id = a.checklist_id
+                   AND q.name = l.name
+                   AND COALESCE(q.evidence, '') = COALESCE(l.evidence, '')
+                   AND COALESCE(q.scoring_criteria, '') = COALESCE(l.scoring_criteria, '')
+                 WHERE l.question_id IS NULL
+              ORDER BY l.id, q.category_id IS NOT DISTINCT FROM l.category_id DESC, q.id) AS matched
+         WHERE line.id = matched.id
+    """)
+    _logger.info("%s question lines matched to a checklist question", cr.rowcount)
+
+    # The other lines get an archived question with their own text
+    cr.execute("""
+        INSERT INTO audit_checklist_question (checklist_id, name, evidence, scoring_criteria, category_id,
+                                              sequence, status, active, create_uid, write_uid,
+                                              create_date, write_date)
+        SELECT DISTINCT ON (a.checklist_id, l.name, COALESCE(l.evidence, ''),
+                            COALESCE(l.scoring_criteria, ''), l.category_id)
+               a.checklist_id, l.name, l.evidence, l.scoring_criteria, l.category_id,
+               l.sequence, '3', false, 1, 1, now() at time zone 'UTC', now() at time zone 'UTC'
+          FROM supplier_audit_question_line l
+     LEFT JOIN supplier_audit a ON a.id = l.audit_id
+         WHERE l.question_id IS NULL
+      ORDER BY a.checklist_id, l.name, COALESCE(l.evidence, ''), COALESCE(l.scoring_criteria, ''),
+               l.category_id, l.id
+     RETURNING id
+    """)
+    question_ids = [row[0] for row in cr.fetchall()]
+    if question_ids:
+        cr.execute("""
+            UPDATE supplier_audit_question_line AS line
+               SET question_id = q.id
+              FROM supplier_audit_question_line l
+         LEFT JOIN supplier_audit a ON a.id = l.audit_id
+              JOIN audit_checklist_question q
+                ON q.id = ANY(%s)
+               AND q.checklist_id IS NOT DISTINCT FROM a.checklist_id
+               AND q.name = l.name
+               AND COALESCE(q.evidence, '') = COALESCE(l.evidence, '')
+               AND COALESCE(q.scoring_criteria, '') = COALESCE(l.scoring_criteria, '')
+               AND q.category_id IS NOT DISTINCT FROM l.category_id
+             WHERE line.id = l.id AND line.question_id IS NULL
+        """, [question_ids])
+        _logger.info("%s archived questions created for %s question lines", len(question_ids), cr.rowcount)
+
+    # The text is now read from the question of each line
+    for column in LINE_TEXT_COLUMNS:
+        cr.execute("ALTER TABLE supplier_audit_question_line DROP COLUMN IF EXISTS %s" % column)
@@ -1,4 +1,11 @@
 from . import supplier_audit
 from . import audit_checklist
 from . import audit_finding
-from . import corrective_action
\ No newline at end of file
+from . import audit_finding_rule
+from . import corrective_action
+from . import audit_programme
+from . import audit_category_score
+from . import supplier_scorecard
+from . import res_partner
+from . import audit_profile_log
+from . import ir_sequence
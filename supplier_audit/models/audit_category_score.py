@@ -0,0 +1,40 @@
+from odoo import models, fields, _
+
+
+class SupplierAuditCategoryScore(models.Model):
+    _name = 'supplier.audit.category.score'
+    _description = 'Supplier Audit Category Score'
+    _order = 'audit_id, sequence, category_id'
+
+    audit_id = fields.Many2one('supplier.audit', string='Audit', required=True,
+                               ondelete='cascade', index=True)
+    category_id = fields.Many2one('audit.question.category', string='Category', required=True,
+                                  ondelete='restrict')
+    sequence = fields.Integer('Sequence', related='category_id.sequence', store=True)
+    # Audit fields copied on the summary for the portfolio dashboard
+    partner_id = fields.Many2one('res.partner', string='Supplier', related='audit_id.partner_id',
+                                 store=True, index=True)
+    audit_date = fields.Date('Audit Date', related='audit_id.audit_date', store=True)
+    audit_state = fields.Selection(string='Audit Status', related='audit_id.state', store=True)
+    company_id = fields.Many2one('res.company', string='Company', related='audit_id.company_id', store=True)
+    question_count = fields.Integer('Questions', default=0)
+    answered_count = fields.Integer('Answered', default=0)
+    total_score = fields.Integer('Score', default=0)
+    max_score = fields.Integer('Max Score', default=0)
+    percentage = fields.Float('Score (%)', default=0.0, group_operator='avg')
+
+    _sql_constraints = [
+        ('audit_category_uniq', 'unique(audit_id, category_id)',
+         'An audit can only have one score per category.'),
+    ]
+
+    def action_view_questions(self):
+        self.ensure_one()
+        return {
+            'name': _('%s - %s') % (self.audit_id.name, self.category_id.name),
+            'type': 'ir.actions.act_window',
+            'res_model': 'supplier.audit.question.line',
+            'view_mode': 'tree',
+            'domain': [('audit_id', '=', self.audit_id.id), ('category_id', '=', self.category_id.id)],
+            'context': {'default_audit_id': self.audit_id.id, 'default_category_id': self.category_id.id},
+        }
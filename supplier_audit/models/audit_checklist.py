@@ -1,10 +1,16 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
-from openpyxl import load_workbook
-from io import BytesIO
+from io import StringIO
 import base64
+import csv
 import os
 
+from ..tools.checklist_import import (
+    cell_value, detect_header_columns, get_reader, normalize_category, question_key,
+)
+from ..tools.numbering import renumber, renumber_later
+from ..tools.profiling import profiled
+
 # ALLOWED_CATEGORIES = [
 #     'Management',
 #     'Manufacturing',
@@ -12,6 +18,26 @@ import os
 #     'Quality Assurance & Process'
 # ]
 
+# Number of questions created per batch during an import
+IMPORT_CHUNK_SIZE = 1000
+# Number of changes listed in the import preview
+PREVIEW_LIMIT = 500
+# Question text shared by the audits; frozen once part of a checklist version
+FROZEN_QUESTION_FIELDS = ['name', 'evidence', 'scoring_criteria', 'category_id']
+# Question fields compared when merging a re-uploaded checklist
+MERGED_QUESTION_FIELDS = ['name', 'evidence', 'scoring_criteria', 'status', 'observation', 'action', 'sequence']
+# Question fields the serial numbers depend on
+NUMBERING_FIELDS = {'sequence', 'checklist_id', 'active'}
+
+
+def _next_version_name(name):
+    """Bump the last number of a version label: '1.0' -> '1.1', 'A' -> 'A.1'."""
+    prefix, _sep, last = name.rpartition('.')
+    if last.isdigit():
+        return '%s.%s' % (prefix, int(last) + 1) if prefix else str(int(last) + 1)
+    return name + '.1'
+
+
 class AuditChecklist(models.Model):
     _name = 'audit.checklist'
     _description = 'Audit Checklist Template'
@@ -25,12 +51,17 @@ class AuditChecklist(models.Model):
 
     question_ids = fields.One2many('audit.checklist.question', 'checklist_id', string='Questions')
     total_questions = fields.Integer('Total Questions', compute='_compute_question_count', store=True)
+    version_ids = fields.One2many('audit.checklist.version', 'checklist_id', string='Versions', copy=False)
     company_id = fields.Many2one('res.company', string='Company', default=lambda self: self.env.company)
 
-    uploaded_excel_file = fields.Binary(string="Upload Excel File", required=True)
+    uploaded_excel_file = fields.Binary(string="Upload Checklist File", required=True,
+                                        help="Checklist questions as an xlsx, ods or csv file.")
     uploaded_file_name = fields.Char(string="File Name")
+    import_report_file = fields.Binary(string="Import Report", attachment=True, readonly=True, copy=False)
+    import_report_name = fields.Char(string="Import Report Name", copy=False)
+    import_summary = fields.Char(string="Last Import", readonly=True, copy=False)
 
-    @api.depends('question_ids')
+    @api.depends('question_ids', 'question_ids.active')
     def _compute_question_count(self):
         for record in self:
             record.total_questions = len(record.question_ids)
@@ -43,6 +74,38 @@ class AuditChecklist(models.Model):
         })
         return super().copy(default)
 
+    def _get_frozen_version(self, questions=None):
+        """Return the frozen version matching the current questions, or
+        the given ``questions``.
+
+        The latest version is reused while the active questions did not
+        change, and any version with the same questions for explicit
+        ``questions``; otherwise a new version is frozen and the checklist
+        version label is bumped if the current one is already taken.
+        """
+        self.ensure_one()
+        question_ids = set((self.question_ids if questions is None else questions).ids)
+        latest = self.version_ids[:1]
+        if latest and set(latest.question_ids.ids) == question_ids:
+            return latest
+        if questions is not None:
+            # e.g. the questions of audits created before a checklist change
+            matching = self.version_ids.filtered(lambda version: set(version.question_ids.ids) == question_ids)
+            if matching:
+                return matching[0]
+
+        used_names = set(self.version_ids.mapped('name'))
+        name = self.version or '1.0'
+        while name in used_names:
+            name = _next_version_name(name)
+        if name != self.version:
+            self.version = name
+        return self.env['audit.checklist.version'].create({
+            'checklist_id': self.id,
+            'name': name,
+            'question_ids': [(6, 0, list(question_ids))],
+        })
+
     # def _get_or_create_allowed_categories(self):
     #     category_map = {}
     #     for cat_name in ALLOWED_CATEGORIES:
@@ -52,88 +115,274 @@ class AuditChecklist(models.Model):
     #         category_map[cat_name] = category
     #     return category_map
 
+    def _get_question_reader(self):
+        """Return the reader used to parse the uploaded question file.
+
+        Override to support additional file formats.
+        """
+        self.ensure_one()
+        reader = get_reader(self.uploaded_file_name)
+        if not reader:
+            raise UserError(_("Unsupported file format for %s. Please upload an xlsx, ods or csv file.")
+                            % self.uploaded_file_name)
+        return reader
+
+    @profiled
     def action_upload_questions(self):
+        """Preview the changes the uploaded file makes to the questions."""
+        self.ensure_one()
+        result = self._run_question_import(apply=False)
+        preview = self.env['audit.checklist.import.preview'].create({
+            'checklist_id': self.id,
+            'create_count': result['create'],
+            'update_count': result['update'],
+            'archive_count': result['archive'],
+            'unchanged_count': result['unchanged'],
+            'issue_count': len(result['report']),
+            'line_ids': [(0, 0, {
+                'operation': operation,
+                'sheet_name': sheet_name,
+                'row_number': row_idx,
+                'question': question,
+                'changed_fields': changed_fields,
+            }) for operation, sheet_name, row_idx, question, changed_fields in result['changes']],
+        })
+        return {
+            'name': _('Import Preview'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'audit.checklist.import.preview',
+            'view_mode': 'form',
+            'res_id': preview.id,
+            'target': 'new',
+        }
+
+    @profiled
+    def action_apply_question_import(self):
+        self.ensure_one()
+        result = self._run_question_import(apply=True)
+        self._store_import_report(result)
+
+    def _run_question_import(self, apply):
         self.ensure_one()
 
         if not self.uploaded_excel_file:
-            raise UserError(_("Please upload an Excel file."))
+            raise UserError(_("Please upload a checklist file."))
 
+        reader = self._get_question_reader()
         try:
-            decoded_file = base64.b64decode(self.uploaded_excel_file)
-            workbook = load_workbook(filename=BytesIO(decoded_file), data_only=True)
+            sheets = reader(base64.b64decode(self.uploaded_excel_file))
+            try:
+                return self._merge_question_rows(sheets, apply=apply)
+            finally:
+                sheets.close()
+        except UserError:
+            raise
         except Exception as e:
-            raise UserError(f"Error reading Excel file: {str(e)}")
-
-        # Normalization map (optional use if category is found)
-        CATEGORY_NORMALIZATION = {
-            'management': 'Management',
-            'manufacturing': 'Manufacturing',
-            'production readiness': 'Production Readiness',
-            'production': 'Production Readiness',
-            'quality': 'Quality Assurance & Process',
-            'quality assurance': 'Quality Assurance & Process',
-            'qa': 'Quality Assurance & Process',
-        }
-
-        # Build existing category map (only used if category is found)
-        category_map = {}
-        categories = self.env['audit.question.category'].search([])
-        for cat in categories:
-            category_map[cat.name.lower()] = cat.id
-
-        questions = []
-
-        for sheet in workbook.worksheets:
-            headers = {}
-            header_row_index = None
+            raise UserError(f"Error reading checklist file: {str(e)}")
 
-            # Auto-detect header row
-            for row_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
-                lower_row = [str(cell).strip().lower() if cell else '' for cell in row]
-                if 'question' in lower_row:
-                    headers = {str(cell).strip().lower(): i for i, cell in enumerate(row) if cell}
-                    header_row_index = row_idx
-                    break
+    def _get_category_map(self):
+        """Map lowercase category names to category ids."""
+        categories = self.env['audit.question.category'].search_read([], ['name'])
+        return {cat['name'].lower(): cat['id'] for cat in categories}
 
-            if not headers or header_row_index is None:
-                raise UserError(_("Could not detect a valid header row. Please include a 'Question' column."))
+    def _get_existing_question_map(self):
+        """Map the question keys of the checklist (archived ones included)
+        to the stored values of the merged fields."""
+        self.ensure_one()
+        questions = self.env['audit.checklist.question'].with_context(active_test=False).search_read(
+            [('checklist_id', '=', self.id)], ['question_key', 'active'] + MERGED_QUESTION_FIELDS,
+            order='active desc, id',
+        )
+        existing = {}
+        for question in questions:
+            existing.setdefault(question['question_key'], question)
+        return existing
+
+    def _merge_question_rows(self, sheets, apply=True):
+        """Merge the questions of ``sheets`` into the checklist.
+
+        ``sheets`` yields ``(sheet_name, rows)`` pairs, rows being tuples of
+        cell values. Rows are matched to the existing questions on their
+        question key: new keys are created, changed questions are written,
+        and active questions missing from the file are archived. With
+        ``apply=False`` nothing is written and only the changes are
+        computed.
+
+        Returns a dict with the ``create``, ``update``, ``archive`` and
+        ``unchanged`` counts, the ``report`` of the rows that were skipped or
+        corrected as ``(sheet_name, row_number, result, message)`` tuples,
+        and the first PREVIEW_LIMIT ``changes`` as
+        ``(operation, sheet_name, row_number, question, changed_fields)``.
+        """
+        self.ensure_one()
+        category_map = self._get_category_map()
+        existing = self._get_existing_question_map()
+        Question = self.env['audit.checklist.question']
+        result = {'create': 0, 'update': 0, 'archive': 0, 'unchanged': 0, 'report': [], 'changes': []}
+        seen = {}
+        batch = []
+        # Existing questions to update: the new sequences, then the other
+        # changes grouped by identical values, applied once the file is read
+        sequences = {}
+        updates = {}
+        has_errors = False
+        position = 0
+
+        def add_change(operation, sheet_name, row_idx, question, changed_fields=''):
+            result[operation] += 1
+            if len(result['changes']) < PREVIEW_LIMIT:
+                result['changes'].append((operation, sheet_name, row_idx, question, changed_fields))
+
+        for sheet_name, rows in sheets:
+            columns = None
+            for row_idx, row in enumerate(rows, start=1):
+                if columns is None:
+                    # Auto-detect header row
+                    columns = detect_header_columns(row)
+                    continue
+                if not row or not any(row):
+                    continue
 
-            for row in sheet.iter_rows(min_row=header_row_index + 1, values_only=True):
-                if not row or not row[headers.get('question', -1)]:
+                question_vals, messages = self._parse_question_row(row, columns, category_map)
+                if not question_vals:
+                    result['report'].append((sheet_name, row_idx, 'skipped', '; '.join(messages)))
+                    continue
+                key = question_key(question_vals['name'], question_vals.get('category_id'))
+                if key in seen:
+                    result['report'].append((sheet_name, row_idx, 'skipped',
+                                             _("Duplicate of row %s of sheet %s") % (seen[key][1], seen[key][0])))
+                    continue
+                seen[key] = (sheet_name, row_idx)
+                if messages:
+                    result['report'].append((sheet_name, row_idx, 'warning', '; '.join(messages)))
+
+                position += 1
+                question_vals['sequence'] = position
+                current = existing.get(key)
+                if not current:
+                    add_change('create', sheet_name, row_idx, question_vals['name'])
+                    if apply:
+                        batch.append(question_vals)
+                        if len(batch) >= IMPORT_CHUNK_SIZE:
+                            Question.create(batch)
+                            batch = []
                     continue
 
-                def get_cell(col_name):
-                    idx = headers.get(col_name.lower())
-                    return str(row[idx]).strip() if idx is not None and row[idx] else ''
-
-                # Get category from 'category' or 'category_id' if present
-                category_col = 'category' if 'category' in headers else 'category_id' if 'category_id' in headers else ''
-                category_raw = get_cell(category_col).lower() if category_col else ''
-                normalized_name = CATEGORY_NORMALIZATION.get(category_raw, category_raw)
-                category_id = category_map.get(normalized_name.lower()) if normalized_name else False
-
-                status = get_cell('status')
-                if status not in ['0', '1', '2', '3']:
-                    status = '3'
-
-                question_vals = {
-                    'name': get_cell('question'),
-                    'evidence': get_cell('evidence required'),
-                    'scoring_criteria': get_cell('scoring criteria'),
-                    'status': status,
-                    'observation': get_cell('observation'),
-                    'action': get_cell('action'),
+                changes = {
+                    field_name: question_vals.get(field_name) or False
+                    for field_name in MERGED_QUESTION_FIELDS
+                    if (question_vals.get(field_name) or False) != (current[field_name] or False)
                 }
+                if not current['active']:
+                    changes['active'] = True
+                if not changes:
+                    result['unchanged'] += 1
+                    continue
+                add_change('update', sheet_name, row_idx, question_vals['name'], ', '.join(sorted(changes)))
+                if apply:
+                    if 'sequence' in changes:
+                        sequences[current['id']] = changes.pop('sequence')
+                    if changes:
+                        updates.setdefault(tuple(sorted(changes.items())), []).append(current['id'])
+
+            if columns is None:
+                has_errors = True
+                result['report'].append((sheet_name, 0, 'error',
+                                         _("Could not detect a valid header row. Please include a 'Question' column.")))
+
+        if apply:
+            self._update_question_sequences(sequences)
+            for changes, question_ids in updates.items():
+                Question.browse(question_ids).write(dict(changes))
+            if batch:
+                Question.create(batch)
+
+        # Never archive the whole checklist because of an unreadable file
+        if seen and not has_errors:
+            to_archive = [
+                question for key, question in existing.items()
+                if key not in seen and question['active']
+            ]
+            for question in to_archive:
+                add_change('archive', '', 0, question['name'])
+            if apply and to_archive:
+                Question.browse([question['id'] for question in to_archive]).write({'active': False})
+        if apply and sequences:
+            Question._renumber(self)
+        return result
+
+    def _update_question_sequences(self, sequences):
+        """Set the sequences of the questions, given as a ``{question_id:
+        sequence}`` dict, in one query. The sequence is not part of the
+        frozen question text, so the questions are updated in place."""
+        if not sequences:
+            return
+        Question = self.env['audit.checklist.question']
+        Question.flush_model(['sequence'])
+        self.env.cr.execute("""
+            UPDATE audit_checklist_question AS question
+               SET sequence = new.sequence,
+                   write_uid = %s,
+                   write_date = (now() at time zone 'UTC')
+              FROM unnest(%s::int[], %s::int[]) AS new(id, sequence)
+             WHERE question.id = new.id
+        """, [self.env.uid, list(sequences), list(sequences.values())])
+        Question.browse(list(sequences)).invalidate_recordset(['sequence', 'write_uid', 'write_date'])
+
+    def _parse_question_row(self, row, columns, category_map):
+        """Return the question values of a data row and the related messages."""
+        cells = {field_name: cell_value(row, idx) for field_name, idx in columns.items()}
+        messages = []
+        name = cells.get('name', '')
+        if not name:
+            return None, [_("Missing question text")]
+
+        question_vals = {
+            'checklist_id': self.id,
+            'name': name,
+            'evidence': cells.get('evidence', ''),
+            'scoring_criteria': cells.get('scoring_criteria', ''),
+            'observation': cells.get('observation', ''),
+            'action': cells.get('action', ''),
+        }
 
-                if category_id:
-                    question_vals['category_id'] = category_id
-
-                questions.append((0, 0, question_vals))
-
-        if not questions:
-            raise UserError(_("No valid questions found in the uploaded file."))
-
-        self.question_ids = questions
+        status = cells.get('status', '')
+        if status.endswith('.0'):
+            status = status[:-2]
+        if status not in ['0', '1', '2', '3']:
+            if status:
+                messages.append(_("Invalid score %r, defaulted to 3") % status)
+            status = '3'
+        question_vals['status'] = status
+
+        category_raw = cells.get('category', '')
+        if category_raw:
+            category_id = category_map.get(normalize_category(category_raw))
+            if category_id:
+                question_vals['category_id'] = category_id
+            else:
+                messages.append(_("Unknown category %r") % category_raw)
+
+        return question_vals, messages
+
+    def _store_import_report(self, result):
+        """Attach the per-row import report as a downloadable CSV file."""
+        self.ensure_one()
+        counts = dict(result, warning=0, skipped=0, error=0)
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Sheet', 'Row', 'Result', 'Message'])
+        for sheet_name, row_idx, row_result, message in result['report']:
+            counts[row_result] += 1
+            writer.writerow([sheet_name, row_idx or '', row_result, message])
+
+        self.write({
+            'import_report_file': base64.b64encode(output.getvalue().encode('utf-8')),
+            'import_report_name': '%s - import report.csv' % (self.uploaded_file_name or self.name),
+            'import_summary': _("%(create)s created, %(update)s updated, %(archive)s archived, "
+                                "%(unchanged)s unchanged, %(warning)s with warnings, "
+                                "%(skipped)s skipped, %(error)s errors") % counts,
+        })
 
 
 class AuditChecklistQuestion(models.Model):
@@ -142,7 +391,12 @@ class AuditChecklistQuestion(models.Model):
     _order = 'sequence, id'
 
     sequence = fields.Integer('Sequence Number', default=10)
-    sl_no = fields.Integer('Sl.No', compute='_compute_serial_no', store=True)
+    active = fields.Boolean('Active', default=True)
+    question_key = fields.Char('Question Key', compute='_compute_question_key', store=True, index=True,
+                               help="Hash of the normalized question text and category, used to match "
+                                    "questions when a checklist is uploaded again.")
+    # Maintained by _renumber() in the display order of the checklist
+    sl_no = fields.Integer('Sl.No', readonly=True, copy=False)
     name = fields.Text('Question', required=True)
     evidence = fields.Text('Evidence')
     scoring_criteria = fields.Text('Scoring Criteria')
@@ -158,12 +412,101 @@ class AuditChecklistQuestion(models.Model):
         string='Category',
         domain="[('name', 'in', ['Management', 'Manufacturing', 'Production Readiness', 'Quality Assurance & Process'])]"
     )
+    version_ids = fields.Many2many('audit.checklist.version', 'audit_checklist_version_question_rel',
+                                   'question_id', 'version_id', string='Checklist Versions', copy=False)
+
+    def _get_frozen_questions(self):
+        """Return the questions of self that belong to a checklist version."""
+        if not self.ids:
+            return self.browse()
+        self.env.cr.execute("""
+            SELECT DISTINCT question_id FROM audit_checklist_version_question_rel
+            WHERE question_id IN %s
+        """, [tuple(self.ids)])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    def write(self, vals):
+        """Changing the text of a frozen question archives it and creates a
+        new question instead, so existing audits keep the text they used."""
+        checklists = self.checklist_id
+        frozen = self.browse()
+        if any(field_name in vals for field_name in FROZEN_QUESTION_FIELDS):
+            frozen = self._get_frozen_questions()
+        result = super(AuditChecklistQuestion, self - frozen).write(vals)
+        if frozen:
+            new_vals_list = []
+            for question in frozen:
+                new_vals = question.copy_data()[0]
+                new_vals.update(vals)
+                new_vals_list.append(new_vals)
+            self.create(new_vals_list)
+            super(AuditChecklistQuestion, frozen).write({'active': False})
+        if frozen or NUMBERING_FIELDS.intersection(vals):
+            self._renumber(checklists | self.checklist_id)
+        return result
+
+    def unlink(self):
+        # Frozen questions are still referenced by audits: archive them
+        checklists = self.checklist_id
+        frozen = self._get_frozen_questions()
+        if frozen:
+            super(AuditChecklistQuestion, frozen).write({'active': False})
+        result = super(AuditChecklistQuestion, self - frozen).unlink()
+        self._renumber(checklists)
+        return result
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        questions = super().create(vals_list)
+        self._renumber(questions.checklist_id)
+        return questions
+
+    @api.model
+    def _renumber(self, checklists):
+        """Queue the checklists for the numbering of their questions, done
+        once per checklist before the transaction is committed."""
+        renumber_later(self, checklists.ids)
+
+    @api.model
+    def _renumber_parents(self, checklist_ids):
+        """Number the active questions of the checklists in their display
+        order; archived questions get 0."""
+        renumber(self.env, self._name, 'checklist_id', checklist_ids, numbered_where='active')
+
+    @api.depends('name', 'category_id')
+    def _compute_question_key(self):
+        for question in self:
+            question.question_key = question_key(question.name, question.category_id.id)
+
+
+class AuditChecklistVersion(models.Model):
+    _name = 'audit.checklist.version'
+    _description = 'Audit Checklist Version'
+    _order = 'id desc'
+
+    name = fields.Char('Version', required=True, readonly=True)
+    checklist_id = fields.Many2one('audit.checklist', string='Checklist', required=True,
+                                   ondelete='cascade', readonly=True, index=True)
+    question_ids = fields.Many2many('audit.checklist.question', 'audit_checklist_version_question_rel',
+                                    'version_id', 'question_id', string='Questions', readonly=True,
+                                    context={'active_test': False})
+    question_count = fields.Integer('Questions', compute='_compute_question_count')
+    audit_count = fields.Integer('Audits', compute='_compute_audit_count')
+
+    def _compute_question_count(self):
+        for version in self:
+            version.question_count = len(version.question_ids)
+
+    def _compute_audit_count(self):
+        groups = self.env['supplier.audit']._read_group(
+            [('checklist_version_id', 'in', self.ids)], ['checklist_version_id'], ['checklist_version_id'])
+        counts = {group['checklist_version_id'][0]: group['checklist_version_id_count'] for group in groups}
+        for version in self:
+            version.audit_count = counts.get(version.id, 0)
+
+    def name_get(self):
+        return [(version.id, '%s v%s' % (version.checklist_id.name, version.name)) for version in self]
 
-    @api.depends('sequence', 'checklist_id')
-    def _compute_serial_no(self):
-        for checklist in self.mapped('checklist_id'):
-            for i, line in enumerate(checklist.question_ids, start=1):
-                line.sl_no = i
 
 class AuditQuestionCategory(models.Model):
     _name = 'audit.question.category'
@@ -183,6 +526,13 @@ class AuditQuestionCategory(models.Model):
         for record in self:
             record.question_count = len(record.question_ids)
 
+    def write(self, vals):
+        result = super().write(vals)
+        if 'name' in vals:
+            # Category names are part of the cached radar chart payloads
+            self.env['supplier.audit'].clear_caches()
+        return result
+
     @api.model
     def delete_junk_categories(self):
         allowed = ALLOWED_CATEGORIES
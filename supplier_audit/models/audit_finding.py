@@ -1,7 +1,11 @@
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from datetime import timedelta
 
 
+# Finding fields the supplier scorecards depend on
+SCORECARD_FINDING_FIELDS = {'audit_id', 'severity', 'finding_date'}
+
+
 class AuditFinding(models.Model):
     _name = 'audit.finding'
     _description = 'Audit Finding'
@@ -12,11 +16,11 @@ class AuditFinding(models.Model):
                        readonly=True, default=lambda self: _('New'))
     description = fields.Text('Finding Description', required=True, tracking=True)
     audit_id = fields.Many2one('supplier.audit', string='Audit', required=True,
-                               ondelete='cascade', tracking=True)
+                               ondelete='cascade', index=True, tracking=True)
     partner_id = fields.Many2one('res.partner', string='Supplier',
-                                 related='audit_id.partner_id', store=True)
+                                 related='audit_id.partner_id', store=True, index=True)
     question_line_id = fields.Many2one('supplier.audit.question.line',
-                                       string='Related Question', tracking=True)
+                                       string='Related Question', index=True, tracking=True)
     category_id = fields.Many2one('audit.question.category', string='Category',
                                   related='question_line_id.category_id', store=True)
 
@@ -27,7 +31,7 @@ class AuditFinding(models.Model):
         ('major', 'Major'),
         ('minor', 'Minor'),
         ('observation', 'Observation'),
-    ], string='Severity', required=True, tracking=True)
+    ], string='Severity', required=True, index=True, tracking=True)
 
     standard_reference = fields.Char('Standard/Requirement Reference', tracking=True)
     evidence = fields.Text('Evidence', tracking=True)
@@ -49,11 +53,35 @@ class AuditFinding(models.Model):
     assigned_to = fields.Many2one('res.users', string='Assigned To', tracking=True)
     company_id = fields.Many2one('res.company', related='audit_id.company_id', store=True)
 
-    @api.model
-    def create(self, vals):
-        if vals.get('name', _('New')) == _('New'):
-            vals['name'] = self.env['ir.sequence'].next_by_code('audit.finding') or _('New')
-        return super(AuditFinding, self).create(vals)
+    def init(self):
+        # Critical and major findings per supplier and date (scorecards)
+        tools.create_index(self._cr, 'audit_finding_partner_severe_date_index',
+                           self._table, ['partner_id', 'finding_date'],
+                           where="severity IN ('critical', 'major')")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # The references of all new findings are reserved at once
+        new = _('New')
+        unnamed = [vals for vals in vals_list if vals.get('name', new) == new]
+        for vals, name in zip(unnamed, self.env['ir.sequence']._next_block_by_code('audit.finding', len(unnamed))):
+            vals['name'] = name or new
+        findings = super(AuditFinding, self).create(vals_list)
+        self.env['supplier.audit.scorecard']._refresh_partners(findings.partner_id)
+        return findings
+
+    def write(self, vals):
+        partners = self.partner_id
+        result = super(AuditFinding, self).write(vals)
+        if SCORECARD_FINDING_FIELDS.intersection(vals):
+            self.env['supplier.audit.scorecard']._refresh_partners(partners | self.partner_id)
+        return result
+
+    def unlink(self):
+        partners = self.partner_id
+        result = super(AuditFinding, self).unlink()
+        self.env['supplier.audit.scorecard']._refresh_partners(partners)
+        return result
 
     @api.depends('corrective_action_ids.state')
     def _compute_state(self):
@@ -0,0 +1,152 @@
+from odoo import models, fields, api, _
+from datetime import timedelta
+import logging
+import threading
+
+from ..tools.profiling import profiled
+
+_logger = logging.getLogger(__name__)
+
+# Audits evaluated per batch, each batch is created and committed at once
+FINDING_RULE_CHUNK_SIZE = 200
+
+
+class AuditFindingRule(models.Model):
+    _name = 'audit.finding.rule'
+    _description = 'Audit Finding Rule'
+    _order = 'sequence, id'
+
+    name = fields.Char('Rule Name', required=True)
+    sequence = fields.Integer('Sequence', default=10,
+                              help="The first matching rule creates the finding of a question.")
+    active = fields.Boolean('Active', default=True)
+    category_id = fields.Many2one('audit.question.category', string='Category', ondelete='cascade',
+                                  help="Leave empty to apply the rule to all categories.")
+    max_score = fields.Selection([
+        ('0', '0'),
+        ('1', '1'),
+        ('2', '2'),
+    ], string='Score at Most', required=True, default='0',
+        help="Answered questions scoring this value or less raise a finding.")
+    severity = fields.Selection([
+        ('critical', 'Critical'),
+        ('major', 'Major'),
+        ('minor', 'Minor'),
+        ('observation', 'Observation'),
+    ], string='Finding Severity', required=True, default='major')
+    apply_on_complete = fields.Boolean('Apply on Completion', default=True,
+                                       help="Raise the findings when the audit is completed.")
+    create_action = fields.Boolean('Create Draft Action',
+                                   help="Also create a draft corrective action for each finding, except when the "
+                                        "rules are applied on the completed audits by the backfill scheduler.")
+    action_type = fields.Selection([
+        ('corrective', 'Corrective Action'),
+        ('preventive', 'Preventive Action'),
+        ('improvement', 'Improvement')
+    ], string='Action Type', default='corrective')
+    action_due_days = fields.Integer('Action Due in (days)', default=30)
+
+    def _get_rules_by_category(self):
+        """Candidate rules of each category, in order; the ``False`` key
+        holds the rules applying to all categories."""
+        rules_by_category = {False: self.filtered(lambda rule: not rule.category_id)}
+        for category in self.category_id:
+            rules_by_category[category.id] = self.filtered(
+                lambda rule: not rule.category_id or rule.category_id == category)
+        return rules_by_category
+
+    def _fetch_candidate_lines(self, audit_ids, max_score):
+        """Answered question lines of the audits scoring ``max_score`` or
+        less and not linked to a finding yet, in audit and question order."""
+        self.env['supplier.audit.question.line'].flush_model(['audit_id', 'category_id', 'state', 'status'])
+        self.env['audit.finding'].flush_model(['question_line_id'])
+        self.env.cr.execute("""
+            SELECT l.id, l.audit_id, l.category_id, l.status, q.name
+              FROM supplier_audit_question_line l
+         LEFT JOIN audit_checklist_question q ON q.id = l.question_id
+             WHERE l.audit_id IN %s
+               AND l.state = 'answered'
+               AND l.status <= %s
+               AND NOT EXISTS (SELECT 1 FROM audit_finding f WHERE f.question_line_id = l.id)
+          ORDER BY l.audit_id, l.sequence, l.id
+        """, [tuple(audit_ids), max_score])
+        return self.env.cr.fetchall()
+
+    @profiled
+    def _generate_findings(self, audits, create_actions=True):
+        """Raise the findings of the rules on the low scored questions of the
+        audits, with their draft corrective actions unless ``create_actions``
+        is False, in one create each.
+
+        Questions that already have a finding are skipped, so the rules
+        can be run again. Returns the created findings.
+        """
+        rules = self.sorted()
+        if not rules or not audits:
+            return self.env['audit.finding']
+        rules_by_category = rules._get_rules_by_category()
+        audits_by_id = {audit.id: audit for audit in audits}
+
+        finding_vals = []
+        finding_rules = []
+        for line_id, audit_id, category_id, status, question in self._fetch_candidate_lines(
+                audits.ids, max(rules.mapped('max_score'))):
+            rule = next((rule for rule in rules_by_category.get(category_id, rules_by_category[False])
+                         if status <= rule.max_score), None)
+            if not rule:
+                continue
+            audit = audits_by_id[audit_id]
+            finding_vals.append({
+                'audit_id': audit_id,
+                'question_line_id': line_id,
+                'severity': rule.severity,
+                'description': _('Question scored %s: %s') % (status, question or ''),
+                'finding_date': audit.end_date or audit.audit_date,
+            })
+            finding_rules.append(rule)
+        findings = self.env['audit.finding'].create(finding_vals)
+        if not create_actions:
+            return findings
+
+        user = self.env.user
+        self.env['sa.corrective.action'].create([{
+            'description': _('Corrective action for: %s') % finding.description,
+            'finding_id': finding.id,
+            'audit_id': finding.audit_id.id,
+            'partner_id': finding.partner_id.id,
+            'action_type': rule.action_type or 'corrective',
+            'due_date': finding.finding_date + timedelta(days=rule.action_due_days),
+            'assigned_to': finding.audit_id.auditor_id.id or user.id,
+        } for finding, rule in zip(findings, finding_rules) if rule.create_action])
+        return findings
+
+    @api.model
+    def _apply_rules(self, audits, on_complete=False, auto_commit=False, create_actions=True):
+        """Run the active rules, or only the ones applying on completion, on
+        the audits by batches."""
+        domain = [('apply_on_complete', '=', True)] if on_complete else []
+        rules = self.search(domain)
+        findings = self.env['audit.finding']
+        if not rules:
+            return findings
+        auto_commit = auto_commit and not getattr(threading.current_thread(), 'testing', False)
+        for offset in range(0, len(audits), FINDING_RULE_CHUNK_SIZE):
+            findings |= rules._generate_findings(audits[offset:offset + FINDING_RULE_CHUNK_SIZE],
+                                                 create_actions=create_actions)
+            if auto_commit:
+                self.env.cr.commit()
+                _logger.info("Finding rules applied on %s/%s audits",
+                             min(offset + FINDING_RULE_CHUNK_SIZE, len(audits)), len(audits))
+        return findings
+
+    @api.model
+    def _cron_backfill_findings(self):
+        """Apply the rules on all the completed audits, e.g. after adding a
+        rule. Each batch is committed.
+
+        No corrective action is created: their due dates would follow the
+        end of audits that can be years old, so they would all be
+        escalated as overdue at once.
+        """
+        audits = self.env['supplier.audit'].search([('state', '=', 'done')], order='id')
+        return self._apply_rules(audits, auto_commit=True, create_actions=False)
@@ -0,0 +1,66 @@
+from odoo import models, fields, api, tools
+from datetime import timedelta
+
+
+class SupplierAuditProfileLog(models.Model):
+    _name = 'supplier.audit.profile.log'
+    _description = 'Supplier Audit Profiling Log'
+    _order = 'id desc'
+    _rec_name = 'entry_point'
+
+    # Rows are inserted with SQL by tools.profiling.profiled
+    entry_point = fields.Char('Entry Point', required=True, index=True, readonly=True)
+    model = fields.Char('Model', readonly=True)
+    record_count = fields.Integer('Records', readonly=True)
+    query_count = fields.Integer('Queries', readonly=True, group_operator='avg')
+    duration_ms = fields.Float('Duration (ms)', readonly=True, group_operator='avg')
+    recompute_count = fields.Integer('Queued Recomputations', readonly=True, group_operator='avg')
+    failed = fields.Boolean('Failed', readonly=True)
+
+    @api.autovacuum
+    def _gc_profile_logs(self):
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'supplier_audit.profiling_retention_days', 30))
+        self.env.cr.execute("DELETE FROM supplier_audit_profile_log WHERE create_date < %s",
+                            [fields.Datetime.now() - timedelta(days=days)])
+
+
+class SupplierAuditProfileSummary(models.Model):
+    _name = 'supplier.audit.profile.summary'
+    _description = 'Supplier Audit Profiling Summary'
+    _auto = False
+    _order = 'duration_p95 desc'
+    _rec_name = 'entry_point'
+
+    entry_point = fields.Char('Entry Point', readonly=True)
+    call_count = fields.Integer('Calls', readonly=True)
+    failed_count = fields.Integer('Failed Calls', readonly=True)
+    duration_p50 = fields.Float('Duration p50 (ms)', readonly=True)
+    duration_p95 = fields.Float('Duration p95 (ms)', readonly=True)
+    duration_max = fields.Float('Duration max (ms)', readonly=True)
+    query_p50 = fields.Float('Queries p50', readonly=True)
+    query_p95 = fields.Float('Queries p95', readonly=True)
+    recompute_p95 = fields.Float('Queued Recomputations p95', readonly=True)
+    records_avg = fields.Float('Records per Call', readonly=True)
+    last_call = fields.Datetime('Last Call', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT MIN(id) AS id,
+                       entry_point,
+                       COUNT(*) AS call_count,
+                       COUNT(*) FILTER (WHERE failed) AS failed_count,
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms) AS duration_p50,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms) AS duration_p95,
+                       MAX(duration_ms) AS duration_max,
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY query_count) AS query_p50,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY query_count) AS query_p95,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY recompute_count) AS recompute_p95,
+                       AVG(record_count) AS records_avg,
+                       MAX(create_date) AS last_call
+                  FROM supplier_audit_profile_log
+              GROUP BY entry_point
+            )
+        """ % self._table)
@@ -0,0 +1,184 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools.safe_eval import safe_eval
+from datetime import timedelta
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+
+class SupplierAuditProgramme(models.Model):
+    _name = 'supplier.audit.programme'
+    _description = 'Supplier Audit Programme'
+    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _order = 'date_start desc, id desc'
+
+    name = fields.Char('Programme Name', required=True, tracking=True)
+    checklist_id = fields.Many2one('audit.checklist', string='Audit Checklist',
+                                   required=True, tracking=True)
+    partner_domain = fields.Char('Supplier Domain', required=True,
+                                 default="[('supplier_rank', '>', 0)]")
+    date_start = fields.Date('Start Date', required=True, tracking=True)
+    date_end = fields.Date('End Date', required=True, tracking=True)
+    auditor_id = fields.Many2one('res.users', string='Lead Auditor',
+                                 required=True, default=lambda self: self.env.user, tracking=True)
+    company_id = fields.Many2one('res.company', string='Company',
+                                 default=lambda self: self.env.company)
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('running', 'Generating'),
+        ('done', 'Generated'),
+        ('cancelled', 'Cancelled')
+    ], string='Status', default='draft', tracking=True)
+
+    audit_ids = fields.One2many('supplier.audit', 'programme_id', string='Audits')
+    audit_count = fields.Integer('Audit Count', compute='_compute_audit_count')
+    planned_count = fields.Integer('Planned Audits', readonly=True, copy=False)
+    generated_count = fields.Integer('Generated Audits', readonly=True, copy=False)
+    # Generation walks the suppliers by id, so a chunked run can resume
+    # where the previous chunk stopped.
+    last_partner_id = fields.Integer('Last Processed Supplier', readonly=True, copy=False)
+
+    @api.constrains('date_start', 'date_end')
+    def _check_dates(self):
+        for programme in self:
+            if programme.date_end < programme.date_start:
+                raise ValidationError(_("The end date of the programme must be after its start date."))
+
+    def _compute_audit_count(self):
+        groups = self.env['supplier.audit']._read_group(
+            [('programme_id', 'in', self.ids)], ['programme_id'], ['programme_id'])
+        counts = {group['programme_id'][0]: group['programme_id_count'] for group in groups}
+        for programme in self:
+            programme.audit_count = counts.get(programme.id, 0)
+
+    def _get_partner_domain(self):
+        self.ensure_one()
+        try:
+            return safe_eval(self.partner_domain or '[]')
+        except Exception as e:
+            raise UserError(_("Invalid supplier domain: %s") % e)
+
+    def _get_planned_date(self, index):
+        """Spread the audits evenly over the programme window."""
+        self.ensure_one()
+        span = (self.date_end - self.date_start).days + 1
+        return self.date_start + timedelta(days=(index * span) // max(self.planned_count, 1))
+
+    def _prepare_audit_vals(self, partner, index):
+        self.ensure_one()
+        return {
+            'partner_id': partner.id,
+            'programme_id': self.id,
+            'checklist_id': self.checklist_id.id,
+            'auditor_id': self.auditor_id.id,
+            'company_id': self.company_id.id,
+            'audit_date': self._get_planned_date(index),
+            'state': 'planned',
+        }
+
+    def _generate_audit_chunk(self, limit):
+        """Create the audits for the next ``limit`` suppliers.
+
+        Returns True when suppliers are left to process.
+        """
+        self.ensure_one()
+        partners = self.env['res.partner'].search(
+            self._get_partner_domain() + [('id', '>', self.last_partner_id)],
+            order='id', limit=limit,
+        )
+        if partners:
+            audited_partners = self.env['supplier.audit'].search([
+                ('programme_id', '=', self.id),
+                ('partner_id', 'in', partners.ids),
+            ]).partner_id
+            created = self.env['supplier.audit'].create([
+                self._prepare_audit_vals(partner, self.generated_count + index)
+                for index, partner in enumerate(partners - audited_partners)
+            ])
+            self.write({
+                'last_partner_id': partners[-1].id,
+                'generated_count': self.generated_count + len(created),
+            })
+        return len(partners) == limit
+
+    def _start_generation(self):
+        for programme in self:
+            if programme.state != 'draft':
+                raise UserError(_("Only draft programmes can generate audits."))
+            programme.write({
+                'state': 'running',
+                # The suppliers already audited by the programme are skipped
+                'planned_count': self.env['res.partner'].search_count(
+                    programme._get_partner_domain() + [('id', 'not in', programme.audit_ids.partner_id.ids)]),
+            })
+
+    @api.model
+    def _get_chunk_size(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'supplier_audit.programme_chunk_size', 200))
+
+    def action_generate(self):
+        """Generate all audits of the programme in the current transaction."""
+        self._start_generation()
+        chunk_size = self._get_chunk_size()
+        for programme in self:
+            while programme._generate_audit_chunk(chunk_size):
+                pass
+            programme.state = 'done'
+
+    def action_schedule(self):
+        """Generate the audits in the background, one transaction per chunk."""
+        self._start_generation()
+        self.env.ref('supplier_audit.ir_cron_generate_programme_audits')._trigger()
+
+    def action_cancel(self):
+        self.write({'state': 'cancelled'})
+
+    def action_reset_to_draft(self):
+        # Restart the generation from the first supplier, the suppliers
+        # audited by the programme are skipped when generating again
+        self.write({
+            'state': 'draft',
+            'planned_count': 0,
+            'generated_count': 0,
+            'last_partner_id': 0,
+        })
+
+    def action_view_audits(self):
+        self.ensure_one()
+        return {
+            'name': _('Audits'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'supplier.audit',
+            'view_mode': 'tree,form,calendar',
+            'domain': [('programme_id', '=', self.id)],
+            'context': {'default_programme_id': self.id},
+        }
+
+    @api.model
+    def _cron_generate_audits(self, time_limit=240):
+        """Generate the audits of running programmes chunk by chunk.
+
+        Each chunk is committed on its own; when the time budget is spent the
+        cron is triggered again to continue where it stopped.
+        """
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        chunk_size = self._get_chunk_size()
+        deadline = time.monotonic() + time_limit
+        for programme in self.search([('state', '=', 'running')]):
+            while True:
+                has_more = programme._generate_audit_chunk(chunk_size)
+                if not has_more:
+                    programme.state = 'done'
+                if auto_commit:
+                    self.env.cr.commit()
+                if not has_more:
+                    break
+                if time.monotonic() > deadline:
+                    _logger.info("Audit programme %s: %s/%s audits generated, continuing later",
+                                 programme.name, programme.generated_count, programme.planned_count)
+                    self.env.ref('supplier_audit.ir_cron_generate_programme_audits')._trigger()
+                    return
@@ -1,5 +1,30 @@
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from datetime import timedelta
+import logging
+import threading
+import time
+
+from ..tools.profiling import profiled
+
+_logger = logging.getLogger(__name__)
+
+# Corrective action fields the supplier scorecards depend on
+SCORECARD_ACTION_FIELDS = {'partner_id', 'state', 'due_date'}
+# Source states of each corrective action state transition, as for the form buttons
+ACTION_TRANSITIONS = {
+    'planned': ['draft'],
+    'in_progress': ['planned'],
+    'review': ['in_progress'],
+    'completed': ['review'],
+    'cancelled': ['draft', 'planned', 'in_progress', 'review'],
+    'draft': ['cancelled'],
+}
+# Escalation levels: due soon, overdue, overdue for more than the critical delay
+ESCALATION_DUE_SOON = 1
+ESCALATION_OVERDUE = 2
+ESCALATION_CRITICAL = 3
+# Minimum priority of the actions reaching an escalation level
+ESCALATION_PRIORITIES = {ESCALATION_OVERDUE: '2', ESCALATION_CRITICAL: '3'}
 
 
 class CorrectiveAction(models.Model):
@@ -13,11 +38,11 @@ class CorrectiveAction(models.Model):
     description = fields.Text('Action Description', required=True, tracking=True)
 
     audit_id = fields.Many2one('supplier.audit', string='Audit',
-                               ondelete='cascade', tracking=True)
+                               ondelete='cascade', index=True, tracking=True)
     finding_id = fields.Many2one('audit.finding', string='Related Finding',
-                                 ondelete='cascade', tracking=True)
+                                 ondelete='cascade', index=True, tracking=True)
     partner_id = fields.Many2one('res.partner', string='Supplier',
-                                 required=True, tracking=True)
+                                 required=True, index=True, tracking=True)
 
     action_type = fields.Selection([
         ('corrective', 'Corrective Action'),
@@ -32,7 +57,7 @@ class CorrectiveAction(models.Model):
         ('review', 'Under Review'),
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled')
-    ], string='Status', default='draft', tracking=True)
+    ], string='Status', default='draft', index=True, tracking=True)
 
     priority = fields.Selection([
         ('0', 'Low'),
@@ -42,7 +67,7 @@ class CorrectiveAction(models.Model):
     ], string='Priority', default='1', tracking=True)
 
     planned_date = fields.Date('Planned Start Date', tracking=True)
-    due_date = fields.Date('Due Date', required=True, tracking=True)
+    due_date = fields.Date('Due Date', required=True, index=True, tracking=True)
     completion_date = fields.Date('Completion Date', tracking=True)
 
     assigned_to = fields.Many2one('res.users', string='Assigned To',
@@ -62,31 +87,229 @@ class CorrectiveAction(models.Model):
     company_id = fields.Many2one('res.company', string='Company',
                                  default=lambda self: self.env.company)
     attachment_ids = fields.Many2many('ir.attachment', string='Attachments')
+    escalation_level = fields.Selection([
+        ('0', 'None'),
+        ('1', 'Due Soon'),
+        ('2', 'Overdue'),
+        ('3', 'Critical'),
+    ], string='Escalation', default='0', required=True, readonly=True, copy=False,
+        help="Last deadline reminder sent by the escalation scheduler, reset when the due date changes.")
+
+    def init(self):
+        # Open actions by due date (overdue filters and reminders)
+        tools.create_index(self._cr, 'sa_corrective_action_open_due_date_index',
+                           self._table, ['due_date'], where="state NOT IN ('completed', 'cancelled')")
+        # Open actions per supplier (scorecards)
+        tools.create_index(self._cr, 'sa_corrective_action_open_partner_index',
+                           self._table, ['partner_id', 'due_date'],
+                           where="state NOT IN ('completed', 'cancelled')")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # The references of all new actions are reserved at once
+        new = _('New')
+        unnamed = [vals for vals in vals_list if vals.get('name', new) == new]
+        names = self.env['ir.sequence']._next_block_by_code('sa.corrective.action', len(unnamed))
+        for vals, name in zip(unnamed, names):
+            vals['name'] = name or new
+        actions = super(CorrectiveAction, self).create(vals_list)
+        self.env['supplier.audit.scorecard']._refresh_partners(actions.partner_id)
+        return actions
+
+    def write(self, vals):
+        if 'due_date' in vals and 'escalation_level' not in vals:
+            vals = dict(vals, escalation_level='0')
+        partners = self.partner_id
+        result = super(CorrectiveAction, self).write(vals)
+        if SCORECARD_ACTION_FIELDS.intersection(vals):
+            self.env['supplier.audit.scorecard']._refresh_partners(partners | self.partner_id)
+        return result
+
+    def unlink(self):
+        partners = self.partner_id
+        result = super(CorrectiveAction, self).unlink()
+        self.env['supplier.audit.scorecard']._refresh_partners(partners)
+        return result
+
+    @profiled
+    def bulk_transition(self, state, note=False):
+        """Move the actions to ``state`` in one write.
+
+        Actions that cannot reach ``state`` from their current state are
+        skipped. The per field tracking is replaced by one chatter summary
+        per audit, and the finding states and audit statistics are
+        recomputed together at the final flush. Returns the moved and the
+        skipped actions.
+        """
+        actions = self.filtered(lambda action: action.state in ACTION_TRANSITIONS.get(state, []))
+        previous_states = {action.id: action.state for action in actions}
+        vals = {'state': state}
+        if state == 'completed':
+            vals['completion_date'] = fields.Date.today()
+        actions.with_context(tracking_disable=True).write(vals)
+
+        by_audit = {}
+        for action in actions.filtered('audit_id'):
+            by_audit.setdefault(action.audit_id, []).append(action.id)
+        for audit, action_ids in by_audit.items():
+            audit._post_transition_summary(self.browse(action_ids), previous_states, state, note)
+        self.env.flush_all()
+        return actions, self - actions
 
     @api.model
-    def create(self, vals):
-        if vals.get('name', _('New')) == _('New'):
-            vals['name'] = self.env['ir.sequence'].next_by_code('sa.corrective.action') or _('New')
-        return super(CorrectiveAction, self).create(vals)
+    def _get_escalation_params(self):
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        return {
+            'reminder_days': int(get_param('supplier_audit.action_reminder_days', 3)),
+            'critical_days': int(get_param('supplier_audit.action_critical_days', 14)),
+            'batch_size': int(get_param('supplier_audit.action_escalation_batch_size', 1000)),
+            'time_limit': int(get_param('supplier_audit.action_escalation_time_limit', 300)),
+        }
+
+    @api.model
+    def _fetch_escalation_batch(self, params, limit):
+        """Return ``(action_id, level)`` of the open actions that reached an
+        escalation level they were not escalated to yet, most overdue first.
+
+        The query matches the partial index of the open actions by due date.
+        """
+        today = fields.Date.context_today(self)
+        self.flush_model(['state', 'due_date', 'escalation_level'])
+        self.env.cr.execute("""
+            SELECT id, level
+              FROM (SELECT id, due_date, escalation_level,
+                           CASE WHEN due_date < %(critical)s THEN %(level_critical)s
+                                WHEN due_date < %(today)s THEN %(level_overdue)s
+                                ELSE %(level_due_soon)s END AS level
+                      FROM sa_corrective_action
+                     WHERE state NOT IN ('completed', 'cancelled')
+                       AND due_date <= %(soon)s) AS actions
+             WHERE escalation_level::int < level
+          ORDER BY due_date, id
+             LIMIT %(limit)s
+        """, {
+            'today': today,
+            'soon': today + timedelta(days=params['reminder_days']),
+            'critical': today - timedelta(days=params['critical_days']),
+            'level_due_soon': ESCALATION_DUE_SOON,
+            'level_overdue': ESCALATION_OVERDUE,
+            'level_critical': ESCALATION_CRITICAL,
+            'limit': limit,
+        })
+        return self.env.cr.fetchall()
+
+    def _escalate(self, levels):
+        """Escalate the actions to their level in ``levels`` (action id to
+        level): raise their priority, schedule an activity for their
+        assignee and send one digest per assignee."""
+        today = fields.Date.context_today(self)
+        by_level = {}
+        for action in self:
+            by_level.setdefault(levels[action.id], self.browse())
+            by_level[levels[action.id]] |= action
+
+        # Set-based writes; the digest replaces the per record tracking
+        quiet = self.with_context(tracking_disable=True)
+        for level, actions in by_level.items():
+            priority = ESCALATION_PRIORITIES.get(level)
+            if priority:
+                quiet.browse(actions.filtered(lambda action: (action.priority or '0') < priority).ids).write(
+                    {'priority': priority})
+            quiet.browse(actions.ids).write({'escalation_level': str(level)})
+
+        activity_type = self.env.ref('mail.mail_activity_data_todo', raise_if_not_found=False)
+        model_id = self.env['ir.model']._get_id(self._name)
+        level_labels = dict(self._fields['escalation_level']._description_selection(self.env))
+        self.env['mail.activity'].with_context(mail_activity_quick_update=True).create([{
+            'res_model_id': model_id,
+            'res_id': action.id,
+            'activity_type_id': activity_type.id if activity_type else False,
+            'user_id': action.assigned_to.id,
+            'date_deadline': max(action.due_date, today),
+            'summary': _('%s: %s') % (level_labels[str(levels[action.id])], action.name),
+        } for action in self])
+
+        # One digest per assignee, listing their actions per supplier
+        by_user = {}
+        for action in self:
+            by_user.setdefault(action.assigned_to, {}).setdefault(action.partner_id, []).append(action.id)
+        digests = []
+        for user, partner_actions in by_user.items():
+            suppliers = [(partner, self.browse(partner_actions[partner]))
+                         for partner in sorted(partner_actions, key=lambda partner: partner.name or '')]
+            count = sum(len(action_ids) for action_ids in partner_actions.values())
+            body = self.env['ir.qweb']._render('supplier_audit.corrective_action_escalation_digest', {
+                'user': user,
+                'suppliers': suppliers,
+                'today': today,
+                'level_labels': level_labels,
+                'priority_labels': dict(self._fields['priority']._description_selection(self.env)),
+            })
+            digests.append({
+                'subject': _('%s corrective actions need your attention') % count,
+                'email_from': (user.company_id.email_formatted or self.env.company.email_formatted
+                               or self.env.user.email_formatted),
+                'recipient_ids': [(4, user.partner_id.id)],
+                'body_html': body,
+                'auto_delete': True,
+            })
+        self.env['mail.mail'].sudo().create(digests)
+
+    @api.model
+    def _cron_escalate_overdue_actions(self):
+        """Escalate the actions due soon, overdue and critically overdue.
+
+        The actions are processed in batches committed one by one. A run
+        stops after the configured time limit and re-triggers the cron to
+        process the remaining actions.
+        """
+        params = self._get_escalation_params()
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        start = time.monotonic()
+        escalated = 0
+        while True:
+            rows = self._fetch_escalation_batch(params, params['batch_size'])
+            if not rows:
+                break
+            levels = dict(rows)
+            self.browse(list(levels))._escalate(levels)
+            escalated += len(rows)
+            if auto_commit:
+                self.env.cr.commit()
+            if len(rows) < params['batch_size']:
+                break
+            if time.monotonic() - start > params['time_limit']:
+                cron = self.env.ref('supplier_audit.ir_cron_escalate_corrective_actions', raise_if_not_found=False)
+                if cron:
+                    cron._trigger()
+                break
+        _logger.info("Escalated %s corrective actions", escalated)
+        return escalated
 
+    @profiled
     def action_set_planned(self):
         self.write({'state': 'planned'})
 
+    @profiled
     def action_start(self):
         self.write({'state': 'in_progress'})
 
+    @profiled
     def action_review(self):
         self.write({'state': 'review'})
 
+    @profiled
     def action_complete(self):
         self.write({
             'state': 'completed',
             'completion_date': fields.Date.today()
         })
 
+    @profiled
     def action_cancel(self):
         self.write({'state': 'cancelled'})
 
+    @profiled
     def action_reset_to_draft(self):
         self.write({'state': 'draft'})
 
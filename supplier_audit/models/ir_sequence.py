@@ -0,0 +1,60 @@
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class IrSequence(models.Model):
+    _inherit = 'ir.sequence'
+
+    @api.model
+    def _next_block_by_code(self, code, count, sequence_date=None):
+        """Return ``count`` successive values of the sequence ``code``,
+        reserved in a single query; see ``next_by_code``.
+
+        Standard sequences reserve the block with ``nextval``, which takes
+        no lock, so concurrent bulk jobs get interleaved but unique
+        numbers. No gap sequences lock their row once for the whole block.
+        """
+        self.check_access_rights('read')
+        company_id = self.env.company.id
+        sequence = self.search([('code', '=', code), ('company_id', 'in', [company_id, False])],
+                               order='company_id', limit=1)
+        if not sequence:
+            _logger.debug("No ir.sequence has been found for code '%s'. Please make sure a sequence is set for "
+                          "current company.", code)
+            return [False] * count
+        return sequence._next_block(count, sequence_date=sequence_date)
+
+    def _next_block(self, count, sequence_date=None):
+        self.ensure_one()
+        if count <= 0:
+            return []
+        if not self.use_date_range:
+            numbers = self._reserve_block(self, 'ir_sequence_%03d' % self.id, count)
+            return self._format_block(numbers)
+        date = fields.Date.to_date(sequence_date or self.env.context.get('ir_sequence_date')) or fields.Date.today()
+        date_range = self.env['ir.sequence.date_range'].search([
+            ('sequence_id', '=', self.id), ('date_from', '<=', date), ('date_to', '>=', date),
+        ], limit=1) or self._create_date_range_seq(date)
+        numbers = self._reserve_block(date_range, 'ir_sequence_%03d_%03d' % (self.id, date_range.id), count)
+        return self._format_block(numbers, date=date, date_range=date_range.date_from)
+
+    def _reserve_block(self, record, pg_sequence, count):
+        """Reserve ``count`` numbers on ``record`` (the sequence or its date
+        range), in ascending order."""
+        if self.implementation == 'standard':
+            self._cr.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [pg_sequence, count])
+            return sorted(row[0] for row in self._cr.fetchall())
+        record.flush_recordset(['number_next'])
+        self._cr.execute("""
+            UPDATE %s SET number_next = number_next + %%s * %%s WHERE id = %%s RETURNING number_next
+        """ % record._table, [count, self.number_increment, record.id])
+        number_next = self._cr.fetchone()[0]
+        record.invalidate_recordset(['number_next'])
+        first = number_next - count * self.number_increment
+        return [first + index * self.number_increment for index in range(count)]
+
+    def _format_block(self, numbers, date=None, date_range=None):
+        prefix, suffix = self._get_prefix_suffix(date=date, date_range=date_range)
+        return ['%s%s%s' % (prefix, '%%0%sd' % self.padding % number, suffix) for number in numbers]
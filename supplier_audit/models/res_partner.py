@@ -0,0 +1,29 @@
+from odoo import models, fields, _
+
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+
+    audit_scorecard_ids = fields.One2many('supplier.audit.scorecard', 'partner_id', string='Audit Scorecard')
+    audit_risk_level = fields.Selection(related='audit_scorecard_ids.risk_level', string='Audit Risk')
+    audit_compliance_score = fields.Float(related='audit_scorecard_ids.last_compliance_score',
+                                          string='Audit Compliance')
+    audit_compliance_trend = fields.Selection(related='audit_scorecard_ids.compliance_trend',
+                                              string='Audit Trend')
+    audit_last_date = fields.Date(related='audit_scorecard_ids.last_audit_date', string='Last Audit')
+    audit_critical_findings = fields.Integer(related='audit_scorecard_ids.critical_findings_12m',
+                                             string='Critical Findings (12 months)')
+    audit_major_findings = fields.Integer(related='audit_scorecard_ids.major_findings_12m',
+                                          string='Major Findings (12 months)')
+    audit_open_actions = fields.Integer(related='audit_scorecard_ids.open_action_count', string='Open Audit Actions')
+
+    def action_view_supplier_audits(self):
+        self.ensure_one()
+        return {
+            'name': _('Audits of %s') % self.display_name,
+            'type': 'ir.actions.act_window',
+            'res_model': 'supplier.audit',
+            'view_mode': 'tree,form',
+            'domain': [('partner_id', '=', self.id)],
+            'context': {'default_partner_id': self.id},
+        }
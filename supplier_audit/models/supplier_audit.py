@@ -1,12 +1,66 @@
-from odoo import models, fields, api, _
-from odoo.exceptions import ValidationError
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import UserError, ValidationError
 from datetime import timedelta
 from markupsafe import Markup
 import logging
 import json
+import threading
+
+from ..tools.numbering import renumber, renumber_later
+from ..tools.profiling import profiled
 
 _logger = logging.getLogger(__name__)
 
+# Categories used by default for questions without a category, in order of preference
+AUDIT_CATEGORIES = ['Management', 'Manufacturing', 'Production Readiness', 'Quality Assurance & Process']
+# Each question has max score of 3
+MAX_QUESTION_SCORE = 3
+# Number of audits recomputed per batch
+SCORE_RECOMPUTE_CHUNK_SIZE = 500
+# Question line fields the scores depend on
+SCORE_LINE_FIELDS = {'audit_id', 'category_id', 'state', 'status'}
+# Question line fields the serial numbers depend on
+LINE_NUMBERING_FIELDS = {'audit_id', 'sequence'}
+# Question lines per page of the audit form category tabs
+QUESTION_PAGE_SIZE = 40
+QUESTION_PAGE_FIELDS = ['sequence', 'sl_no', 'category_id', 'name', 'evidence', 'scoring_criteria',
+                        'status', 'observation', 'action', 'state']
+# Source states of each audit state transition, as for the form buttons
+AUDIT_TRANSITIONS = {
+    'planned': ['draft'],
+    'in_progress': ['planned'],
+    'done': ['in_progress'],
+    'cancelled': ['draft', 'planned', 'in_progress'],
+    'draft': ['cancelled'],
+}
+# Question line fields an auditor can answer through the bulk answer API
+ANSWER_FIELDS = ['status', 'state', 'observation', 'action']
+
+
+def _audit_score_vals(total, completed, answered, score):
+    """Values of the audit score fields for the given line counters."""
+    max_score = answered * MAX_QUESTION_SCORE
+    return {
+        'total_questions': total,
+        'completed_questions': completed,
+        'answered_questions': answered,
+        'answered_score': score,
+        'completion_rate': (completed / total * 100) if total else 0.0,
+        'compliance_score': (score / max_score) if max_score else 0.0,
+    }
+
+
+def _category_score_vals(total, answered, score):
+    """Values of a category score row for the given line counters."""
+    max_score = answered * MAX_QUESTION_SCORE
+    return {
+        'question_count': total,
+        'answered_count': answered,
+        'total_score': score,
+        'max_score': max_score,
+        'percentage': (score / max_score * 100) if max_score else 0.0,
+    }
+
 
 class SupplierAudit(models.Model):
     _name = 'supplier.audit'
@@ -17,7 +71,8 @@ class SupplierAudit(models.Model):
     name = fields.Char('Audit Reference', required=True, copy=False,
                        readonly=True, default=lambda self: _('New'))
     partner_id = fields.Many2one('res.partner', string='Supplier',
-                                 required=True)
+                                 required=True, index=True)
+    # Indexed together with id in init(), matching _order
     audit_date = fields.Date('Audit Date', required=True, tracking=True)
     end_date = fields.Date('End Date', tracking=True)
     duration = fields.Integer('Duration (days)', compute='_compute_duration', store=True)
@@ -27,7 +82,7 @@ class SupplierAudit(models.Model):
         ('in_progress', 'In Progress'),
         ('done', 'Completed'),
         ('cancelled', 'Cancelled')
-    ], string='Status', default='draft', tracking=True)
+    ], string='Status', default='draft', index=True, tracking=True)
 
     radar_chart_placeholder = fields.Char(compute='_compute_dummy', store=False)
 
@@ -36,21 +91,58 @@ class SupplierAudit(models.Model):
         for rec in self:
             rec.radar_chart_placeholder = 'chart'
 
-    management_score = fields.Float(string="Management Score", default=0.0)
-    manufacturing_score = fields.Float(string="Manufacturing Score", default=0.0)
-    production_readiness_score = fields.Float(string="Production Readiness Score", default=0.0)
-    quality_assurance_score = fields.Float(string="Quality Assurance Score", default=0.0)
-
     @api.model
-    def get_audit_scores(self):
-        # Assuming we're displaying the chart for the current record
-        # In a real scenario, you might need to filter or aggregate data
-        audit = self
+    def get_portfolio_data(self, partner_ids=None, date_from=None, date_to=None, limit=10):
+        """Data of the supplier portfolio dashboard, read from the category
+        score summary so no audit or question line is loaded.
+
+        Returns the categories, the radar values per supplier, the monthly
+        category trends and the overall score per supplier.
+        """
+        Score = self.env['supplier.audit.category.score']
+        domain = [('audit_state', '!=', 'cancelled')]
+        if date_from:
+            domain.append(('audit_date', '>=', date_from))
+        if date_to:
+            domain.append(('audit_date', '<=', date_to))
+        if partner_ids:
+            domain.append(('partner_id', 'in', partner_ids))
+
+        def percentage(group):
+            return round(group['total_score'] / group['max_score'] * 100, 1) if group['max_score'] else 0.0
+
+        suppliers = Score._read_group(
+            domain, ['partner_id', 'audit_id:count_distinct', 'total_score', 'max_score'], ['partner_id'],
+            orderby='audit_id desc', limit=None if partner_ids else limit, lazy=False)
+        suppliers = [group for group in suppliers if group['partner_id']]
+        supplier_ids = [group['partner_id'][0] for group in suppliers]
+        domain.append(('partner_id', 'in', supplier_ids))
+
+        categories = self.env['audit.question.category'].browse(
+            group['category_id'][0] for group in Score._read_group(domain, ['category_id'], ['category_id']))
+        category_index = {category.id: index for index, category in enumerate(categories)}
+
+        radar = {partner_id: [0.0] * len(categories) for partner_id in supplier_ids}
+        for group in Score._read_group(domain, ['total_score', 'max_score'],
+                                       ['partner_id', 'category_id'], lazy=False):
+            radar[group['partner_id'][0]][category_index[group['category_id'][0]]] = percentage(group)
+
+        trends = {}
+        for group in Score._read_group(domain, ['total_score', 'max_score'],
+                                       ['category_id', 'audit_date:month'], orderby='audit_date', lazy=False):
+            trends.setdefault(group['audit_date:month'], [None] * len(categories))[
+                category_index[group['category_id'][0]]] = percentage(group)
+
         return {
-            'management': audit.management_score,
-            'manufacturing': audit.manufacturing_score,
-            'production_readiness': audit.production_readiness_score,
-            'quality_assurance': audit.quality_assurance_score
+            'categories': [{'id': category.id, 'name': category.name} for category in categories],
+            'suppliers': [{
+                'id': group['partner_id'][0],
+                'name': group['partner_id'][1],
+                'audit_count': group['audit_id'],
+                'percentage': percentage(group),
+                'values': radar[group['partner_id'][0]],
+            } for group in suppliers],
+            'trends': [{'period': period, 'values': values} for period, values in trends.items()],
         }
 
     auditor_id = fields.Many2one('res.users', string='Lead Auditor',
@@ -60,18 +152,23 @@ class SupplierAudit(models.Model):
 
     checklist_id = fields.Many2one('audit.checklist', string='Audit Checklist',
                                    required=True, tracking=True)
+    checklist_version_id = fields.Many2one('audit.checklist.version', string='Checklist Version',
+                                           readonly=True, copy=False)
+    programme_id = fields.Many2one('supplier.audit.programme', string='Audit Programme',
+                                   ondelete='set null', tracking=True)
     finding_ids = fields.One2many('audit.finding', 'audit_id', string='Audit Findings')
     corrective_action_ids = fields.One2many('sa.corrective.action', 'audit_id',
                                             string='Corrective Actions')
 
-    total_questions = fields.Integer('Total Questions', compute='_compute_progress_stats', store=True)
-    completed_questions = fields.Integer('Completed Questions',
-                                         compute='_compute_progress_stats', store=True)
-    completion_rate = fields.Float('Completion Rate (%)',
-                                   compute='_compute_progress_stats', store=True)
+    # Score fields are maintained by _recompute_scores from the question lines
+    total_questions = fields.Integer('Total Questions', readonly=True, copy=False)
+    completed_questions = fields.Integer('Completed Questions', readonly=True, copy=False)
+    completion_rate = fields.Float('Completion Rate (%)', readonly=True, copy=False)
 
-    compliance_score = fields.Float('Compliance Score (%)',
-                                    compute='_compute_compliance_score', store=True)
+    compliance_score = fields.Float('Compliance Score (%)', readonly=True, copy=False)
+    # Raw counters kept so that the scores can be maintained incrementally
+    answered_questions = fields.Integer('Answered Questions', readonly=True, copy=False)
+    answered_score = fields.Integer('Answered Score', readonly=True, copy=False)
 
     notes = fields.Text('Notes')
     company_id = fields.Many2one('res.company', string='Company',
@@ -99,289 +196,308 @@ class SupplierAudit(models.Model):
 
     question_line_ids = fields.One2many('supplier.audit.question.line', 'audit_id',
                                         string='Audit Questions')
+    checklist_summary = fields.Html('Checklist Summary', compute='_compute_checklist_summary', sanitize=False)
+
+    category_score_ids = fields.One2many('supplier.audit.category.score', 'audit_id',
+                                         string='Category Scores')
+
+    def init(self):
+        # Default list order, also used by the audit date filters
+        tools.create_index(self._cr, 'supplier_audit_date_id_index',
+                           self._table, ['audit_date DESC', 'id DESC'])
+        # Completed audits per supplier (scorecards, portfolio)
+        tools.create_index(self._cr, 'supplier_audit_partner_done_index',
+                           self._table, ['partner_id', 'audit_date DESC'], where="state = 'done'")
+
+    def _read_score_stats(self):
+        """Aggregate the question lines of the audits in a single query.
+
+        Returns ``(audit_stats, category_stats)``: the values of the audit
+        score fields per audit id, and the values of the category score rows
+        per ``(audit_id, category_id)``.
+        """
+        self.env['supplier.audit.question.line'].flush_model(['audit_id', 'category_id', 'state', 'status'])
+        self.env.cr.execute("""
+            SELECT audit_id, category_id, state, COUNT(*), COALESCE(SUM(status::int), 0)
+              FROM supplier_audit_question_line
+             WHERE audit_id IN %s
+          GROUP BY audit_id, category_id, state
+        """, [tuple(self.ids)])
+
+        audit_counters = {audit_id: [0, 0, 0, 0] for audit_id in self.ids}
+        category_counters = {}
+        for audit_id, category_id, state, count, score in self.env.cr.fetchall():
+            counters = [count, count if state in ('answered', 'na') else 0,
+                        count if state == 'answered' else 0, score if state == 'answered' else 0]
+            audit_counters[audit_id] = [a + b for a, b in zip(audit_counters[audit_id], counters)]
+            if category_id:
+                key = (audit_id, category_id)
+                category_counters[key] = [a + b for a, b in zip(category_counters.get(key, [0, 0, 0, 0]), counters)]
+
+        audit_stats = {key: _audit_score_vals(*counters) for key, counters in audit_counters.items()}
+        category_stats = {
+            key: _category_score_vals(total, answered, score)
+            for key, (total, completed, answered, score) in category_counters.items()
+        }
+        return audit_stats, category_stats
+
+    @profiled
+    def _recompute_scores(self):
+        """Recompute the score, progress and compliance fields and the
+        category score rows of the audits, writing only what changed.
+
+        Returns the drift found, as a list of ``(audit, description)``.
+        """
+        audits = self.exists()
+        if not audits:
+            return []
+        audit_stats, category_stats = audits._read_score_stats()
+        drift = []
+
+        Score = self.env['supplier.audit.category.score']
+        obsolete = Score.browse()
+        for score in Score.search([('audit_id', 'in', audits.ids)]):
+            vals = category_stats.pop((score.audit_id.id, score.category_id.id), None)
+            if vals is None:
+                drift.append((score.audit_id, '%s: obsolete score' % score.category_id.name))
+                obsolete |= score
+                continue
+            changed = {name: value for name, value in vals.items() if score[name] != value}
+            if changed:
+                drift.extend((score.audit_id, '%s %s: %s != %s' % (score.category_id.name, name, score[name], value))
+                             for name, value in changed.items())
+                score.write(changed)
+        obsolete.unlink()
+        missing = Score.create([
+            dict(vals, audit_id=audit_id, category_id=category_id)
+            for (audit_id, category_id), vals in category_stats.items()
+        ])
+        drift.extend((score.audit_id, '%s: missing score' % score.category_id.name) for score in missing)
+
+        # Audits are written whenever their category scores changed as well,
+        # their write_date keys the radar chart payload
+        drifted_audits = {audit.id for audit, description in drift}
+        for audit in audits:
+            vals = audit_stats[audit.id]
+            changed = {name: value for name, value in vals.items() if audit[name] != value}
+            drift.extend((audit, '%s: %s != %s' % (name, audit[name], value)) for name, value in changed.items())
+            if changed or audit.id in drifted_audits:
+                audit.write(vals)
+        return drift
 
-    # Category ID fields - Now editable regular fields
-    category_1_id = fields.Many2one('audit.question.category', string='Category 1')
-    category_2_id = fields.Many2one('audit.question.category', string='Category 2')
-    category_3_id = fields.Many2one('audit.question.category', string='Category 3')
-    category_4_id = fields.Many2one('audit.question.category', string='Category 4')
-    # category_5_id = fields.Many2one('audit.question.category', string='Category 5')
-    # category_6_id = fields.Many2one('audit.question.category', string='Category 6')
-    # category_7_id = fields.Many2one('audit.question.category', string='Category 7')
-    # category_8_id = fields.Many2one('audit.question.category', string='Category 8')
-    # category_9_id = fields.Many2one('audit.question.category', string='Category 9')
-    # category_10_id = fields.Many2one('audit.question.category', string='Category 10')
-
-    # Category Name fields - Still computed
-    category_1_name = fields.Char('Category 1 Name', compute='_compute_category_names', store=True)
-    category_2_name = fields.Char('Category 2 Name', compute='_compute_category_names', store=True)
-    category_3_name = fields.Char('Category 3 Name', compute='_compute_category_names', store=True)
-    category_4_name = fields.Char('Category 4 Name', compute='_compute_category_names', store=True)
-    # category_5_name = fields.Char('Category 5 Name', compute='_compute_category_names', store=True)
-    # category_6_name = fields.Char('Category 6 Name', compute='_compute_category_names', store=True)
-    # category_7_name = fields.Char('Category 7 Name', compute='_compute_category_names', store=True)
-    # category_8_name = fields.Char('Category 8 Name', compute='_compute_category_names', store=True)
-    # category_9_name = fields.Char('Category 9 Name', compute='_compute_category_names', store=True)
-    # category_10_name = fields.Char('Category 10 Name', compute='_compute_category_names', store=True)
-
-    # Category question line fields
-    category_1_question_ids = fields.One2many('supplier.audit.question.line',
-                                              compute='_compute_category_question_lines')
-    category_2_question_ids = fields.One2many('supplier.audit.question.line',
-                                              compute='_compute_category_question_lines')
-    category_3_question_ids = fields.One2many('supplier.audit.question.line',
-                                              compute='_compute_category_question_lines')
-    category_4_question_ids = fields.One2many('supplier.audit.question.line',
-                                              compute='_compute_category_question_lines')
-    # category_5_question_ids = fields.One2many('supplier.audit.question.line',
-    #                                           compute='_compute_category_question_lines')
-    # category_6_question_ids = fields.One2many('supplier.audit.question.line',
-    #                                           compute='_compute_category_question_lines')
-    # category_7_question_ids = fields.One2many('supplier.audit.question.line',
-    #                                           compute='_compute_category_question_lines')
-    # category_8_question_ids = fields.One2many('supplier.audit.question.line',
-    #                                           compute='_compute_category_question_lines')
-    # category_9_question_ids = fields.One2many('supplier.audit.question.line',
-    #                                           compute='_compute_category_question_lines')
-    # category_10_question_ids = fields.One2many('supplier.audit.question.line',
-    #                                            compute='_compute_category_question_lines')
-
-    # Category scoring fields for all 10 categories
-    category_1_total_questions = fields.Integer('Category 1 Questions', compute='_compute_category_scores', store=True,
-                                                default=0)
-    category_1_total_score = fields.Integer('Category 1 Score', compute='_compute_category_scores', store=True,
-                                            default=0)
-    category_1_max_score = fields.Integer('Category 1 Max Score', compute='_compute_category_scores', store=True,
-                                          default=0)
-    category_1_percentage = fields.Float('Category 1 %', compute='_compute_category_scores', store=True, default=0.0)
-
-    category_2_total_questions = fields.Integer('Category 2 Questions', compute='_compute_category_scores', store=True,
-                                                default=0)
-    category_2_total_score = fields.Integer('Category 2 Score', compute='_compute_category_scores', store=True,
-                                            default=0)
-    category_2_max_score = fields.Integer('Category 2 Max Score', compute='_compute_category_scores', store=True,
-                                          default=0)
-    category_2_percentage = fields.Float('Category 2 %', compute='_compute_category_scores', store=True, default=0.0)
-
-    category_3_total_questions = fields.Integer('Category 3 Questions', compute='_compute_category_scores', store=True,
-                                                default=0)
-    category_3_total_score = fields.Integer('Category 3 Score', compute='_compute_category_scores', store=True,
-                                            default=0)
-    category_3_max_score = fields.Integer('Category 3 Max Score', compute='_compute_category_scores', store=True,
-                                          default=0)
-    category_3_percentage = fields.Float('Category 3 %', compute='_compute_category_scores', store=True, default=0.0)
-
-    category_4_total_questions = fields.Integer('Category 4 Questions', compute='_compute_category_scores', store=True,
-                                                default=0)
-    category_4_total_score = fields.Integer('Category 4 Score', compute='_compute_category_scores', store=True,
-                                            default=0)
-    category_4_max_score = fields.Integer('Category 4 Max Score', compute='_compute_category_scores', store=True,
-                                          default=0)
-    category_4_percentage = fields.Float('Category 4 %', compute='_compute_category_scores', store=True, default=0.0)
-
-    # category_5_total_questions = fields.Integer('Category 5 Questions', compute='_compute_category_scores', store=True,
-    #                                             default=0)
-    # category_5_total_score = fields.Integer('Category 5 Score', compute='_compute_category_scores', store=True,
-    #                                         default=0)
-    # category_5_max_score = fields.Integer('Category 5 Max Score', compute='_compute_category_scores', store=True,
-    #                                       default=0)
-    # category_5_percentage = fields.Float('Category 5 %', compute='_compute_category_scores', store=True, default=0.0)
-    #
-    # category_6_total_questions = fields.Integer('Category 6 Questions', compute='_compute_category_scores', store=True,
-    #                                             default=0)
-    # category_6_total_score = fields.Integer('Category 6 Score', compute='_compute_category_scores', store=True,
-    #                                         default=0)
-    # category_6_max_score = fields.Integer('Category 6 Max Score', compute='_compute_category_scores', store=True,
-    #                                       default=0)
-    # category_6_percentage = fields.Float('Category 6 %', compute='_compute_category_scores', store=True, default=0.0)
-    #
-    # category_7_total_questions = fields.Integer('Category 7 Questions', compute='_compute_category_scores', store=True,
-    #                                             default=0)
-    # category_7_total_score = fields.Integer('Category 7 Score', compute='_compute_category_scores', store=True,
-    #                                         default=0)
-    # category_7_max_score = fields.Integer('Category 7 Max Score', compute='_compute_category_scores', store=True,
-    #                                       default=0)
-    # category_7_percentage = fields.Float('Category 7 %', compute='_compute_category_scores', store=True, default=0.0)
-    #
-    # category_8_total_questions = fields.Integer('Category 8 Questions', compute='_compute_category_scores', store=True,
-    #                                             default=0)
-    # category_8_total_score = fields.Integer('Category 8 Score', compute='_compute_category_scores', store=True,
-    #                                         default=0)
-    # category_8_max_score = fields.Integer('Category 8 Max Score', compute='_compute_category_scores', store=True,
-    #                                       default=0)
-    # category_8_percentage = fields.Float('Category 8 %', compute='_compute_category_scores', store=True, default=0.0)
-    #
-    # category_9_total_questions = fields.Integer('Category 9 Questions', compute='_compute_category_scores', store=True,
-    #                                             default=0)
-    # category_9_total_score = fields.Integer('Category 9 Score', compute='_compute_category_scores', store=True,
-    #                                         default=0)
-    # category_9_max_score = fields.Integer('Category 9 Max Score', compute='_compute_category_scores', store=True,
-    #                                       default=0)
-    # category_9_percentage = fields.Float('Category 9 %', compute='_compute_category_scores', store=True, default=0.0)
-    #
-    # category_10_total_questions = fields.Integer('Category 10 Questions', compute='_compute_category_scores',
-    #                                              store=True, default=0)
-    # category_10_total_score = fields.Integer('Category 10 Score', compute='_compute_category_scores', store=True,
-    #                                          default=0)
-    # category_10_max_score = fields.Integer('Category 10 Max Score', compute='_compute_category_scores', store=True,
-    #                                        default=0)
-    # category_10_percentage = fields.Float('Category 10 %', compute='_compute_category_scores', store=True, default=0.0)
-
-
-    @api.depends('question_line_ids.status', 'question_line_ids.category_id', 'question_line_ids.state')
-    def _compute_category_scores(self):
-        for rec in self:
-            try:
-                # Initialize all scores to 0
-                for i in range(1, 5):
-                    setattr(rec, f'category_{i}_total_questions', 0)
-                    setattr(rec, f'category_{i}_total_score', 0)
-                    setattr(rec, f'category_{i}_max_score', 0)
-                    setattr(rec, f'category_{i}_percentage', 0.0)
-
-                # Group questions by category
-                category_stats = {}
-                for question in rec.question_line_ids.filtered(lambda q: q.state == 'answered' and q.category_id):
-                    cat_id = question.category_id.id
-                    if cat_id not in category_stats:
-                        category_stats[cat_id] = {
-                            'total_questions': 0,
-                            'total_score': 0,
-                            'max_score': 0
-                        }
-
-                    category_stats[cat_id]['total_questions'] += 1
-                    category_stats[cat_id]['total_score'] += int(question.status)
-                    category_stats[cat_id]['max_score'] += 3  # Each question has max score of 3
-
-                # Map stats to category fields
-                for i in range(1, 5):
-                    category = getattr(rec, f'category_{i}_id')
-                    if category and category.id in category_stats:
-                        stats = category_stats[category.id]
-                        setattr(rec, f'category_{i}_total_questions', stats['total_questions'])
-                        setattr(rec, f'category_{i}_total_score', stats['total_score'])
-                        setattr(rec, f'category_{i}_max_score', stats['max_score'])
-
-                        if stats['max_score'] > 0:
-                            percentage = (stats['total_score'] / stats['max_score']) * 100
-                            setattr(rec, f'category_{i}_percentage', percentage)
-
-            except Exception as e:
-                _logger.error(f"Error computing category scores: {e}")
-                # If error occurs, set all to 0
-                for i in range(1, 5):
-                    setattr(rec, f'category_{i}_percentage', 0.0)
+    @api.model
+    @profiled
+    def _apply_score_deltas(self, deltas):
+        """Apply score counter deltas to the audits and their category scores.
+
+        ``deltas`` maps ``(audit_id, category_id)`` to the change of the
+        ``[total, completed, answered, score]`` counters of its lines.
+        """
+        deltas = {key: delta for key, delta in deltas.items() if key[0] and any(delta)}
+        if not deltas:
+            return
+
+        audit_deltas = {}
+        for (audit_id, category_id), delta in deltas.items():
+            audit_deltas[audit_id] = [a + b for a, b in zip(audit_deltas.get(audit_id, [0, 0, 0, 0]), delta)]
+        for audit in self.browse(audit_deltas):
+            total, completed, answered, score = audit_deltas[audit.id]
+            audit.write(_audit_score_vals(
+                audit.total_questions + total, audit.completed_questions + completed,
+                audit.answered_questions + answered, audit.answered_score + score,
+            ))
+
+        Score = self.env['supplier.audit.category.score']
+        scores = Score.search([
+            ('audit_id', 'in', list(audit_deltas)),
+            ('category_id', 'in', list({category_id for audit_id, category_id in deltas})),
+        ])
+        obsolete = Score.browse()
+        for score in scores:
+            delta = deltas.pop((score.audit_id.id, score.category_id.id), None)
+            if delta is None:
+                continue
+            total, completed, answered, total_score = delta
+            if score.question_count + total <= 0:
+                obsolete |= score
+                continue
+            score.write(_category_score_vals(
+                score.question_count + total, score.answered_count + answered, score.total_score + total_score,
+            ))
+        obsolete.unlink()
+        Score.create([
+            dict(_category_score_vals(total, answered, score), audit_id=audit_id, category_id=category_id)
+            for (audit_id, category_id), (total, completed, answered, score) in deltas.items()
+            if category_id and total > 0
+        ])
+
+    def action_check_scores(self):
+        """Fully recompute the scores, report and fix any drift of the
+        incrementally maintained values."""
+        drift = []
+        for offset in range(0, len(self), SCORE_RECOMPUTE_CHUNK_SIZE):
+            drift += self[offset:offset + SCORE_RECOMPUTE_CHUNK_SIZE]._recompute_scores()
+        for audit, description in drift:
+            _logger.warning("Score drift on audit %s (%s): %s", audit.name, audit.id, description)
+        if drift:
+            audits = len({audit.id for audit, description in drift})
+            message = _("%(count)s score values of %(audits)s audits had drifted and were fixed.",
+                        count=len(drift), audits=audits)
+        else:
+            message = _("The scores of the %s audits are consistent.", len(self))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Score Consistency Check'),
+                'message': message,
+                'type': 'warning' if drift else 'success',
+                'sticky': bool(drift),
+            },
+        }
+
+    def action_recompute_scores(self):
+        for offset in range(0, len(self), SCORE_RECOMPUTE_CHUNK_SIZE):
+            self[offset:offset + SCORE_RECOMPUTE_CHUNK_SIZE]._recompute_scores()
+
+    @api.model
+    def _cron_recompute_scores(self):
+        """Recompute the scores of all audits, one transaction per chunk."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        audit_ids = self.with_context(active_test=False).search([], order='id').ids
+        for offset in range(0, len(audit_ids), SCORE_RECOMPUTE_CHUNK_SIZE):
+            drift = self.browse(audit_ids[offset:offset + SCORE_RECOMPUTE_CHUNK_SIZE])._recompute_scores()
+            if drift:
+                _logger.warning("Fixed %s drifted score values in %s audits", len(drift),
+                                len({audit.id for audit, description in drift}))
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+
+    @api.model
+    def _init_category_scores(self):
+        """Create the missing category scores and score counters of existing audits."""
+        audits = self.with_context(active_test=False).search([
+            '|', ('category_score_ids', '=', False),
+            '&', ('answered_questions', '=', 0), ('question_line_ids.state', '=', 'answered'),
+            ('question_line_ids', '!=', False)])
+        audits.action_recompute_scores()
 
     def get_category_data(self):
         """Returns structured data for all categories for use in views"""
         self.ensure_one()
-        categories = []
-        for i in range(1, 5):
-            category_id = getattr(self, f'category_{i}_id')
-            if not category_id:
-                continue
-
-            categories.append({
-                'index': i,
-                'name': getattr(self, f'category_{i}_name'),
-                'total_questions': getattr(self, f'category_{i}_total_questions'),
-                'total_score': getattr(self, f'category_{i}_total_score'),
-                'max_score': getattr(self, f'category_{i}_max_score'),
-                'percentage': getattr(self, f'category_{i}_percentage'),
-            })
-        return categories
+        return [{
+            'category_id': score.category_id.id,
+            'name': score.category_id.name,
+            'total_questions': score.answered_count,
+            'total_score': score.total_score,
+            'max_score': score.max_score,
+            'percentage': score.percentage,
+        } for score in self.category_score_ids]
+
+    def get_question_page(self, category_id=False, state=False, offset=0, limit=QUESTION_PAGE_SIZE):
+        """Returns one page of the question lines for the category tabs of
+        the audit form, filtered by category and status.
+
+        The tabs are built from the category scores, so only the lines of
+        the requested page are read.
+        """
+        self.ensure_one()
+        Line = self.env['supplier.audit.question.line']
+        domain = [('audit_id', '=', self.id)]
+        if category_id:
+            domain.append(('category_id', '=', category_id))
+        if state:
+            domain.append(('state', '=', state))
+        return {
+            'tabs': [{
+                'category_id': score.category_id.id,
+                'name': score.category_id.name,
+                'question_count': score.question_count,
+                'answered_count': score.answered_count,
+            } for score in self.category_score_ids],
+            'total': self.total_questions,
+            'length': Line.search_count(domain),
+            'records': Line.search_read(domain, QUESTION_PAGE_FIELDS, offset=offset, limit=limit,
+                                        order='sequence, id'),
+            'status_selection': Line._fields['status']._description_selection(self.env),
+            'state_selection': Line._fields['state']._description_selection(self.env),
+        }
 
-    @api.depends('category_1_id', 'category_2_id', 'category_3_id', 'category_4_id',
-                 # 'category_5_id','category_6_id', 'category_7_id', 'category_8_id', 'category_9_id', 'category_10_id'
-                 )
-    def _compute_category_names(self):
-        for rec in self:
-            try:
-                for i in range(4):
-                    category_field = f'category_{i + 1}_id'
-                    name_field = f'category_{i + 1}_name'
-
-                    category = getattr(rec, category_field)
-                    if category and category.exists():
-                        setattr(rec, name_field, category.name)
-                    else:
-                        setattr(rec, name_field, '')
-            except Exception as e:
-                # Reset all name fields on error
-                import logging
-                _logger = logging.getLogger(__name__)
-                _logger.error(f"Error in _compute_category_names: {e}")
-
-                for i in range(4):
-                    setattr(rec, f'category_{i + 1}_name', '')
-
-    @api.depends('question_line_ids.category_id')
-    def _compute_category_question_lines(self):
-        for rec in self:
-            try:
-                for i in range(4):
-                    category_field = f'category_{i + 1}_id'
-                    question_field = f'category_{i + 1}_question_ids'
-
-                    category = getattr(rec, category_field)
-                    if category and category.exists():
-                        # Filter question lines by category record
-                        lines = rec.question_line_ids.filtered(
-                            lambda l: l.category_id == category
-                        )
-                        setattr(rec, question_field, lines)
-                    else:
-                        # Set empty recordset
-                        setattr(rec, question_field, self.env['supplier.audit.question.line'])
-            except Exception as e:
-                # Reset all question line fields on error
-                import logging
-                _logger = logging.getLogger(__name__)
-                _logger.error(f"Error in _compute_category_question_lines: {e}")
-
-                for i in range(4):
-                    setattr(rec, f'category_{i + 1}_question_ids',
-                            self.env['supplier.audit.question.line'])
-
-    @api.onchange('category_1_id', 'category_2_id', 'category_3_id', 'category_4_id',
-                  # 'category_5_id','category_6_id', 'category_7_id', 'category_8_id', 'category_9_id', 'category_10_id'
-                  )
-    def _onchange_categories(self):
-        """Update question lines when categories are changed"""
-        for rec in self:
-            # Get all current categories
-            current_categories = [
-                rec.category_1_id, rec.category_2_id, rec.category_3_id,
-                rec.category_4_id,
-                # rec.category_5_id, rec.category_6_id,
-                # rec.category_7_id, rec.category_8_id, rec.category_9_id,
-                # rec.category_10_id
-            ]
-
-            # Update category names
-            rec._compute_category_names()
-
-    def update_all_question_categories(self):
-        """Update all question lines to use the current categories"""
-        for rec in self:
-            # Get all current categories
-            current_categories = [
-                rec.category_1_id, rec.category_2_id, rec.category_3_id,
-                rec.category_4_id,
-                # rec.category_5_id, rec.category_6_id,
-                # rec.category_7_id, rec.category_8_id, rec.category_9_id,
-                # rec.category_10_id
-            ]
-
-            # Assign each question to one of the current categories
-            for line in rec.question_line_ids:
-                if line.category_id not in current_categories:
-                    # Assign to first available category
-                    for cat in current_categories:
-                        if cat:
-                            line.category_id = cat
-                            break
+    @profiled
+    def apply_question_answers(self, answers):
+        """Apply a batch of question answers captured offline.
+
+        ``answers`` is a list of dicts with the line ``id``, any of
+        ``status``, ``state``, ``observation`` and ``action``, the
+        ``write_date`` of the line as last seen by the client and optional
+        evidence ``attachments`` (dicts with ``name``, base64 ``datas`` and
+        ``mimetype``). A line modified on the server after that
+        ``write_date`` is not overwritten but returned as a conflict with
+        its current values. Lines with the same answer are written
+        together and the scores are updated once for the whole batch.
+        """
+        self.ensure_one()
+        if self.state != 'in_progress':
+            raise UserError(_("Answers can only be recorded on audits in progress."))
+        Line = self.env['supplier.audit.question.line']
+        status_values = {value for value, label in Line._fields['status'].selection}
+        state_values = {value for value, label in Line._fields['state'].selection}
+        lines = Line.browse([answer.get('id') for answer in answers if isinstance(answer.get('id'), int)])
+        lines = lines.filtered(lambda line: line.audit_id == self)
+
+        result = {'applied': [], 'conflicts': [], 'errors': []}
+        grouped = {}
+        attachment_vals = []
+        for answer in answers:
+            line = lines.browse(answer.get('id')) if isinstance(answer.get('id'), int) else Line
+            if line not in lines:
+                result['errors'].append({'id': answer.get('id'), 'error': _("Unknown question line.")})
+                continue
+            if line.id in result['applied']:
+                result['errors'].append({'id': line.id, 'error': _("Duplicate answer.")})
+                continue
+            # Write dates are exchanged with a precision of one second
+            if answer.get('write_date') and \
+                    fields.Datetime.to_datetime(answer['write_date']) < line.write_date.replace(microsecond=0):
+                result['conflicts'].append(line.read(ANSWER_FIELDS + ['write_date'])[0])
+                continue
+            vals = {field_name: answer[field_name] or False for field_name in ANSWER_FIELDS if field_name in answer}
+            if vals.get('status') and vals['status'] not in status_values \
+                    or vals.get('state') and vals['state'] not in state_values:
+                result['errors'].append({'id': line.id, 'error': _("Invalid score or status.")})
+                continue
+            # Same rule as the status onchange of the question line
+            if 'state' not in vals and vals.get('status') and vals['status'] != '0':
+                vals['state'] = 'answered'
+            grouped.setdefault(tuple(sorted(vals.items())), []).append(line.id)
+            attachment_vals.extend({
+                'name': attachment.get('name') or _('Evidence'),
+                'datas': attachment.get('datas'),
+                'mimetype': attachment.get('mimetype'),
+                'res_model': Line._name,
+                'res_id': line.id,
+            } for attachment in answer.get('attachments') or [])
+            result['applied'].append(line.id)
+
+        answered = lines.browse(result['applied'])
+        deltas = answered._get_score_deltas(sign=-1)
+        for vals, line_ids in grouped.items():
+            if vals:
+                Line.browse(line_ids).with_context(supplier_audit_skip_score_deltas=True).write(dict(vals))
+        for key, delta in answered._get_score_deltas().items():
+            deltas[key] = [a + b for a, b in zip(deltas.get(key, [0, 0, 0, 0]), delta)]
+        self._apply_score_deltas(deltas)
+        if attachment_vals:
+            self.env['ir.attachment'].create(attachment_vals)
+
+        # The new write dates are the base of the next sync of the client
+        self.env.flush_all()
+        answered.invalidate_recordset(['write_date'])
+        result['applied'] = [{'id': line.id, 'write_date': line.write_date} for line in answered]
+        result['scores'] = self.read(['total_questions', 'completed_questions', 'completion_rate',
+                                      'compliance_score'])[0]
+        return result
 
     @api.depends('audit_date', 'end_date')
     def _compute_duration(self):
@@ -395,30 +511,6 @@ class SupplierAudit(models.Model):
             else:
                 record.duration = 0
 
-    @api.depends('question_line_ids.state')
-    def _compute_progress_stats(self):
-        for record in self:
-            record.total_questions = len(record.question_line_ids)
-            record.completed_questions = len(record.question_line_ids.filtered(
-                lambda x: x.state in ['answered','na']))
-            record.completion_rate = (
-                    record.completed_questions / record.total_questions * 100) if record.total_questions else 0
-
-    @api.depends('question_line_ids.status')
-    def _compute_compliance_score(self):
-        for record in self:
-            answered_questions = record.question_line_ids.filtered(
-                lambda x: x.state == 'answered')
-            if answered_questions:
-                # Assuming status '3' is fully compliant, '2' is partially, etc.
-                total_score = sum(int(q.status) for q in answered_questions)
-                max_possible_score = len(answered_questions) * 3  # Max score is 3
-                print(total_score)
-                print(max_possible_score)
-                record.compliance_score = (total_score / max_possible_score) if max_possible_score else 0
-            else:
-                record.compliance_score = 0
-
     @api.depends('finding_ids.severity')
     def _compute_findings_stats(self):
         for record in self:
@@ -432,93 +524,138 @@ class SupplierAudit(models.Model):
             record.open_actions = len(record.corrective_action_ids.filtered(
                 lambda a: a.state not in ['completed', 'cancelled']))
 
+    def _get_default_line_category(self):
+        """Return the category given to questions that have none."""
+        categories = self.env['audit.question.category'].search([('name', 'in', AUDIT_CATEGORIES)])
+        category_map = {cat.name: cat for cat in categories}
+        for cat_name in AUDIT_CATEGORIES:
+            if cat_name in category_map:
+                return category_map[cat_name]
+        return self.env['audit.question.category'].search([], limit=1)
+
     @api.model
-    def create(self, vals):
-        if vals.get('name', _('New')) == _('New'):
-            vals['name'] = self.env['ir.sequence'].next_by_code('supplier.audit') or _('New')
-
-        audit = super(SupplierAudit, self).create(vals)
-
-        # Create question lines based on the selected checklist
-        if audit.checklist_id:
-            # Define the desired category order
-            desired_categories = ['Management', 'Manufacturing','Production Readiness', 'Quality Assurance & Process']
-            category_records = self.env['audit.question.category'].search([
-                ('name', 'in', desired_categories)
-            ])
-
-            # Map category names to their records
-            category_map = {cat.name: cat for cat in category_records}
-
-            # Assign categories in the desired order
-            for i, cat_name in enumerate(desired_categories, 1):
-                if cat_name in category_map:
-                    setattr(audit, f'category_{i}_id', category_map[cat_name])
-                else:
-                    # Log a warning if the category doesn't exist
-                    _logger.warning(f"Category '{cat_name}' not found in the system.")
-
-            # Create question lines
-            for question in audit.checklist_id.question_ids:
-                # Find the first matching category for the question
-                question_category = question.category_id
-                if question_category not in category_records:
-                    # Assign to the first available category if the question's category isn't in the desired list
-                    question_category = category_records[0] if category_records else False
-
-                self.env['supplier.audit.question.line'].create({
-                    'audit_id': audit.id,
-                    'question_id': question.id,
-                    'name': question.name,
-                    'category_id': question_category.id if question_category else False,
-                    'evidence': question.evidence,
-                    'scoring_criteria': question.scoring_criteria,
-                    'observation': question.observation,
-                    'action': question.action,
-                })
-
-        return audit
-
-    @api.onchange('checklist_id')
-    def _onchange_checklist_id(self):
-        for rec in self:
-            if rec.checklist_id:
-                # Clear previous question lines
-                rec.question_line_ids = [(5, 0, 0)]
-
-                # Define the desired category order
-                desired_categories = ['Management', 'Manufacturing','Production Readiness', 'Quality Assurance & Process']
-                category_records = self.env['audit.question.category'].search([
-                    ('name', 'in', desired_categories)
-                ])
-
-                # Map category names to their records
-                category_map = {cat.name: cat for cat in category_records}
-
-                # Assign categories in the desired order
-                for i, cat_name in enumerate(desired_categories, 1):
-                    if cat_name in category_map:
-                        setattr(rec, f'category_{i}_id', category_map[cat_name])
-                    else:
-                        setattr(rec, f'category_{i}_id', False)
-
-                # Re-create question lines
-                new_lines = []
-                for question in rec.checklist_id.question_ids:
-                    question_category = question.category_id
-                    if question_category not in category_records:
-                        question_category = category_records[0] if category_records else False
-
-                    new_lines.append((0, 0, {
-                        'question_id': question.id,
-                        'name': question.name,
-                        'category_id': question_category.id if question_category else False,
-                        'evidence': question.evidence,
-                        'scoring_criteria': question.scoring_criteria,
-                        'observation': question.observation,
-                        'action': question.action,
-                    }))
-                rec.question_line_ids = new_lines
+    def _prepare_question_line_vals(self, questions, default_category):
+        """Build the question line values for checklist questions.
+
+        Lines only reference the shared question text. Questions without a
+        category fall back to ``default_category``.
+        """
+        return [{
+            'question_id': question.id,
+            'category_id': question.category_id.id or default_category.id,
+        } for question in questions]
+
+    @api.model_create_multi
+    @profiled
+    def create(self, vals_list):
+        new = _('New')
+        unnamed = [vals for vals in vals_list if vals.get('name', new) == new]
+        for vals, name in zip(unnamed, self.env['ir.sequence']._next_block_by_code('supplier.audit', len(unnamed))):
+            vals['name'] = name or new
+        versions = {}
+        for vals in vals_list:
+            if vals.get('checklist_id'):
+                # Audits reference the frozen version of their checklist
+                if vals['checklist_id'] not in versions:
+                    checklist = self.env['audit.checklist'].browse(vals['checklist_id'])
+                    versions[vals['checklist_id']] = checklist._get_frozen_version()
+                vals.setdefault('checklist_version_id', versions[vals['checklist_id']].id)
+
+        audits = super(SupplierAudit, self).create(vals_list)
+
+        # Audits created with explicit lines keep them
+        audits.browse([
+            audit.id for audit, vals in zip(audits, vals_list) if not vals.get('question_line_ids')
+        ])._create_question_lines()
+
+        return audits
+
+    def write(self, vals):
+        if 'checklist_id' not in vals:
+            return super(SupplierAudit, self).write(vals)
+        # The question lines are only materialized on save: the form shows
+        # the summary of the selected checklist until then.
+        changed = self.filtered(lambda audit: audit.checklist_id.id != vals['checklist_id'])
+        if changed.filtered(lambda audit: audit.state != 'draft'):
+            raise UserError(_("The checklist can only be changed on draft audits."))
+        res = super(SupplierAudit, self).write(vals)
+        if changed and 'checklist_version_id' not in vals:
+            # Audits keeping their checklist keep their version and lines
+            checklist = self.env['audit.checklist'].browse(vals['checklist_id'])
+            super(SupplierAudit, changed).write({
+                'checklist_version_id': checklist._get_frozen_version().id if checklist else False,
+            })
+        if changed and not vals.get('question_line_ids'):
+            changed._replace_question_lines()
+        return res
+
+    def _create_question_lines(self):
+        """Instantiate the checklist version questions of the audits.
+
+        The lines of all audits are created at once, so the scores are
+        updated once for all of them.
+        """
+        default_category = None
+        version_lines = {}
+        line_vals_list = []
+        for audit in self:
+            version = audit.checklist_version_id
+            if not version:
+                continue
+            if version.id not in version_lines:
+                if default_category is None:
+                    default_category = self._get_default_line_category()
+                version_lines[version.id] = self._prepare_question_line_vals(version.question_ids, default_category)
+            line_vals_list.extend(
+                dict(line_vals, audit_id=audit.id) for line_vals in version_lines[version.id]
+            )
+        if line_vals_list:
+            self.env['supplier.audit.question.line'].create(line_vals_list)
+
+    @profiled
+    def _replace_question_lines(self):
+        """Replace the question lines by the ones of the current checklist
+        version, after the checklist of the audits changed."""
+        self.question_line_ids.unlink()
+        self._create_question_lines()
+
+    @api.depends('checklist_id')
+    def _compute_checklist_summary(self):
+        """Question count per category of the selected checklist.
+
+        Shown on the form while the question lines are not materialized,
+        i.e. until a new audit or a checklist change is saved.
+        """
+        checklists = self.checklist_id
+        counts = {}
+        if checklists:
+            default_category = self._get_default_line_category()
+            groups = self.env['audit.checklist.question']._read_group(
+                [('checklist_id', 'in', checklists.ids)],
+                ['checklist_id', 'category_id'], ['checklist_id', 'category_id'], lazy=False)
+            for group in groups:
+                category_id = group['category_id'][0] if group['category_id'] else default_category.id
+                checklist_counts = counts.setdefault(group['checklist_id'][0], {})
+                checklist_counts[category_id] = checklist_counts.get(category_id, 0) + group['__count']
+        categories = self.env['audit.question.category'].browse(
+            list({category_id for checklist_counts in counts.values() for category_id in checklist_counts}))
+        for record in self:
+            checklist_counts = counts.get(record.checklist_id.id)
+            if not checklist_counts:
+                record.checklist_summary = False
+                continue
+            rows = Markup('').join(
+                Markup('<tr><td>%s</td><td class="text-end">%s</td></tr>') % (
+                    category.name, checklist_counts[category.id])
+                for category in categories.sorted()
+                if category.id in checklist_counts
+            )
+            record.checklist_summary = Markup(
+                '<table class="table table-sm o_audit_checklist_summary">'
+                '<thead><tr><th>%s</th><th class="text-end">%s</th></tr></thead>'
+                '<tbody>%s</tbody>'
+                '<tfoot><tr><th>%s</th><th class="text-end">%s</th></tr></tfoot></table>'
+            ) % (_('Category'), _('Questions'), rows, _('Total'), sum(checklist_counts.values()))
 
     def action_plan(self):
         self.write({'state': 'planned'})
@@ -526,28 +663,86 @@ class SupplierAudit(models.Model):
     def action_start(self):
         self.write({'state': 'in_progress'})
 
+    def _get_completion_result(self):
+        """Audit result based on the findings and scores."""
+        self.ensure_one()
+        if self.critical_findings > 0:
+            return 'fail'
+        if self.major_findings > 0 or self.compliance_score < 80:
+            return 'conditional_pass'
+        return 'pass'
+
+    @profiled
     def action_complete(self):
         # Check if all questions are answered
         if self.completion_rate < 100:
             raise ValidationError(_("All questions must be answered before completing the audit."))
 
-        # Determine audit result based on findings and scores
-        result = 'pass'  # Default
-        if self.critical_findings > 0:
-            result = 'fail'
-        elif self.major_findings > 0 or self.compliance_score < 80:
-            result = 'conditional_pass'
-
+        # Raise the findings of the low scored questions before the result
+        self.env['audit.finding.rule']._apply_rules(self, on_complete=True)
         self.write({
             'state': 'done',
-            'result': result
+            'result': self._get_completion_result(),
         })
+        self.env['supplier.audit.scorecard']._refresh_partners(self.partner_id)
 
     def action_cancel(self):
+        done = self.filtered(lambda audit: audit.state == 'done')
         self.write({'state': 'cancelled'})
+        self.env['supplier.audit.scorecard']._refresh_partners(done.partner_id)
 
     def action_reset_to_draft(self):
+        done = self.filtered(lambda audit: audit.state == 'done')
         self.write({'state': 'draft'})
+        self.env['supplier.audit.scorecard']._refresh_partners(done.partner_id)
+
+    @profiled
+    def bulk_transition(self, state, note=False):
+        """Move the audits to ``state`` with set-based writes.
+
+        Audits that cannot reach ``state`` from their current state, or
+        cannot be completed because questions are unanswered, are skipped.
+        The per field tracking is replaced by one chatter summary per
+        audit. Returns the moved and the skipped audits.
+        """
+        audits = self.filtered(lambda audit: audit.state in AUDIT_TRANSITIONS.get(state, []))
+        if state == 'done':
+            audits = audits.filtered(lambda audit: audit.completion_rate >= 100)
+        previous_states = {audit.id: audit.state for audit in audits}
+
+        quiet = audits.with_context(tracking_disable=True)
+        if state == 'done':
+            self.env['audit.finding.rule']._apply_rules(audits, on_complete=True)
+            results = {}
+            for audit in audits:
+                results.setdefault(audit._get_completion_result(), []).append(audit.id)
+            for result, audit_ids in results.items():
+                quiet.browse(audit_ids).write({'state': 'done', 'result': result})
+        else:
+            quiet.write({'state': state})
+
+        for audit in audits:
+            audit._post_transition_summary(audit, previous_states, state, note)
+        if state == 'done':
+            self.env['supplier.audit.scorecard']._refresh_partners(audits.partner_id)
+        self.env.flush_all()
+        return audits, self - audits
+
+    def _post_transition_summary(self, records, previous_states, state, note=False):
+        """Post one note on the audit summarizing the bulk status change
+        of ``records`` (the audit itself or its children)."""
+        self.ensure_one()
+        labels = dict(records._fields['state']._description_selection(self.env))
+        items = Markup('').join(
+            Markup('<li>%s: %s \u2192 %s</li>') % (
+                record.display_name, labels.get(previous_states[record.id]), labels.get(state))
+            for record in records
+        )
+        body = Markup('<p>%s</p><ul>%s</ul>') % (
+            _('Bulk status change of %s records to %s.') % (len(records), labels.get(state)), items)
+        if note:
+            body += Markup('<p>%s</p>') % note
+        self.message_post(body=body, subtype_xmlid='mail.mt_note')
 
     def create_finding(self):
         return {
@@ -562,6 +757,21 @@ class SupplierAudit(models.Model):
             'target': 'new',
         }
 
+    def action_generate_findings(self):
+        """Apply the finding rules on the audits."""
+        findings = self.env['audit.finding.rule']._apply_rules(self)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Findings'),
+                'message': _("%s findings and %s corrective actions were created.") % (
+                    len(findings), len(findings.corrective_action_ids)),
+                'type': 'success',
+                'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+            },
+        }
+
     def create_corrective_action(self):
         return {
             'name': _('New Corrective Action'),
@@ -582,149 +792,30 @@ class SupplierAudit(models.Model):
         store=False
     )
 
-    @api.depends('category_1_percentage', 'category_2_percentage', 'category_3_percentage', 'category_4_percentage',
-                 # 'category_5_percentage', 'category_6_percentage', 'category_7_percentage', 'category_8_percentage', 'category_9_percentage', 'category_10_percentage',
-                 'category_1_name', 'category_2_name', 'category_3_name', 'category_4_name',
-                 # 'category_5_name','category_6_name', 'category_7_name', 'category_8_name', 'category_9_name', 'category_10_name'
-                 )
+    @api.depends('write_date', 'category_score_ids.percentage', 'category_score_ids.category_id')
     def _compute_radar_chart_data(self):
+        # The chart styling and benchmark datasets live in the radar_chart
+        # widget, only the category labels and percentages are sent
         for rec in self:
-            try:
-                # Get category data using the existing method
-                categories = rec.get_category_data()
-
-                # Prepare labels and data for the chart
-                labels = []
-                audit_data = []
-
-                for cat in categories:
-                    if cat['name'] and cat['name'].strip():  # Only include categories with names
-                        labels.append(cat['name'])
-                        audit_data.append(round(cat['percentage'], 1))  # Round to 1 decimal place
-
-                # If no categories, provide default
-                if not labels:
-                    labels = ['No Categories Configured']
-                    audit_data = [0]
-
-                # Define benchmark data
-                good_data = [100] * len(labels)
-                standard_data = [80] * len(labels)
-                poor_data = [67] * len(labels)
-
-                # Construct the Chart.js radar chart configuration
-                chart_config = {
-                    "type": "radar",
-                    "data": {
-                        "labels": labels,
-                        "datasets": [
-                            {
-                                "label": "Audit Results",
-                                "data": audit_data,
-                                "backgroundColor": "rgba(54, 162, 235, 0.2)",
-                                "borderColor": "#36A2EB",
-                                "borderWidth": 2,
-                                "pointBackgroundColor": "#36A2EB",
-                                "pointBorderColor": "#36A2EB",
-                                "pointBorderWidth": 2,
-                                "pointRadius": 5,
-                                "fill": True
-                            },
-                            {
-                                "label": "Good (100%)",
-                                "data": good_data,
-                                "backgroundColor": "rgba(75, 192, 192, 0.1)",
-                                "borderColor": "#4BC0C0",
-                                "borderWidth": 1,
-                                "pointBackgroundColor": "#4BC0C0",
-                                "pointRadius": 3,
-                                "fill": False
-                            },
-                            {
-                                "label": "Standard (80%)",
-                                "data": standard_data,
-                                "backgroundColor": "rgba(255, 206, 86, 0.1)",
-                                "borderColor": "#FFCE56",
-                                "borderWidth": 1,
-                                "pointBackgroundColor": "#FFCE56",
-                                "pointRadius": 3,
-                                "fill": False
-                            },
-                            {
-                                "label": "Poor (67%)",
-                                "data": poor_data,
-                                "backgroundColor": "rgba(255, 99, 132, 0.1)",
-                                "borderColor": "#FF6384",
-                                "borderWidth": 1,
-                                "pointBackgroundColor": "#FF6384",
-                                "pointRadius": 3,
-                                "fill": False
-                            }
-                        ]
-                    },
-                    "options": {
-                        "responsive": True,
-                        "maintainAspectRatio": False,
-                        "scales": {
-                            "r": {
-                                "angleLines": {
-                                    "display": True,
-                                    "color": "rgba(0, 0, 0, 0.1)"
-                                },
-                                "grid": {
-                                    "color": "rgba(0, 0, 0, 0.1)"
-                                },
-                                "suggestedMin": 0,
-                                "suggestedMax": 100,
-                                "ticks": {
-                                    "stepSize": 25,
-                                    "callback": "function(value) { return value + '%'; }"
-                                }
-                            }
-                        },
-                        "plugins": {
-                            "legend": {
-                                "position": "top",
-                                "labels": {
-                                    "usePointStyle": True,
-                                    "padding": 20
-                                }
-                            },
-                            "tooltip": {
-                                "callbacks": {
-                                    "label": "function(context) { return context.dataset.label + ': ' + context.parsed.r + '%'; }"
-                                }
-                            }
-                        },
-                        "interaction": {
-                            "intersect": False
-                        }
-                    }
-                }
-
-                # Store the chart configuration as a JSON string
-                rec.radar_chart_data = json.dumps(chart_config)
-
-            except Exception as e:
-                _logger.error(f"Error computing radar chart data for audit {rec.id}: {e}")
-                # Set empty chart data on error
-                rec.radar_chart_data = json.dumps({
-                    "type": "radar",
-                    "data": {
-                        "labels": ["Error Loading Data"],
-                        "datasets": [{
-                            "label": "Error",
-                            "data": [0],
-                            "backgroundColor": "rgba(255, 99, 132, 0.2)",
-                            "borderColor": "#FF6384",
-                            "borderWidth": 2
-                        }]
-                    },
-                    "options": {
-                        "responsive": True,
-                        "maintainAspectRatio": False
-                    }
-                })
+            if not rec.id:
+                rec.radar_chart_data = json.dumps(rec._get_radar_chart_values())
+                continue
+            rec.radar_chart_data = self._get_radar_chart_payload(rec.id, rec.write_date)
+
+    @tools.ormcache('audit_id', 'write_date')
+    def _get_radar_chart_payload(self, audit_id, write_date):
+        # write_date changes whenever the category scores of the audit do
+        return json.dumps(self.browse(audit_id)._get_radar_chart_values())
+
+    def _get_radar_chart_values(self):
+        self.ensure_one()
+        labels = []
+        values = []
+        for cat in self.get_category_data():
+            if cat['name'] and cat['name'].strip():  # Only include categories with names
+                labels.append(cat['name'])
+                values.append(round(cat['percentage'], 1))
+        return {'labels': labels, 'values': values}
 
 
 class SupplierAuditQuestionLine(models.Model):
@@ -732,18 +823,25 @@ class SupplierAuditQuestionLine(models.Model):
     _description = 'Supplier Audit Question Line'
     _order = 'sequence, id'
 
+    # audit_id and state are covered by the composite indexes of init()
     audit_id = fields.Many2one('supplier.audit', string='Audit', ondelete='cascade')
-    question_id = fields.Many2one('audit.checklist.question', string='Question Template')
-    name = fields.Text('Question', required=True)
+    question_id = fields.Many2one('audit.checklist.question', string='Question Template',
+                                  required=True, ondelete='restrict')
+    # The question text is shared with the (frozen) checklist question
+    name = fields.Text('Question', related='question_id.name')
     sequence = fields.Integer('Sequence', default=10)
+    # Maintained by _renumber() in the display order of the audit
+    sl_no = fields.Integer('Sl.No', readonly=True, copy=False)
     category_id = fields.Many2one(
         'audit.question.category',
         string="Category",
         required=True,
+        index=True,
         ondelete='restrict'
     )
-    evidence = fields.Text('Evidence/Observations')
-    scoring_criteria = fields.Text('Scoring Criteria', help="Criteria for scoring the question")
+    evidence = fields.Text('Evidence/Observations', related='question_id.evidence')
+    scoring_criteria = fields.Text('Scoring Criteria', related='question_id.scoring_criteria',
+                                   help="Criteria for scoring the question")
     status = fields.Selection([
         ('0', '0'),
         ('1', '1'),
@@ -760,6 +858,76 @@ class SupplierAuditQuestionLine(models.Model):
 
     finding_ids = fields.One2many('audit.finding', 'question_line_id', string='Related Findings')
 
+    def init(self):
+        # Lines of an audit in their display order (audit form, one2many reads)
+        tools.create_index(self._cr, 'supplier_audit_question_line_audit_sequence_index',
+                           self._table, ['audit_id', 'sequence', 'id'])
+        # Score aggregation, answered with an index-only scan
+        tools.create_index(self._cr, 'supplier_audit_question_line_audit_score_index',
+                           self._table, ['audit_id', 'category_id', 'state', 'status'])
+
+    def _get_score_deltas(self, sign=1):
+        """Contribution of the lines to the ``[total, completed, answered,
+        score]`` counters, per ``(audit_id, category_id)``."""
+        deltas = {}
+        for line in self:
+            key = (line.audit_id.id, line.category_id.id)
+            answered = line.state == 'answered'
+            counters = [1, int(line.state in ('answered', 'na')), int(answered),
+                        int(line.status or 0) if answered else 0]
+            deltas[key] = [a + sign * b for a, b in zip(deltas.get(key, [0, 0, 0, 0]), counters)]
+        return deltas
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env['supplier.audit']._apply_score_deltas(lines._get_score_deltas())
+        self._renumber(lines.audit_id)
+        return lines
+
+    def write(self, vals):
+        audits = self.audit_id if LINE_NUMBERING_FIELDS.intersection(vals) else None
+        # Batched writers update the scores once themselves
+        if not SCORE_LINE_FIELDS.intersection(vals) or self.env.context.get('supplier_audit_skip_score_deltas'):
+            result = super().write(vals)
+        else:
+            deltas = self._get_score_deltas(sign=-1)
+            result = super().write(vals)
+            for key, delta in self._get_score_deltas().items():
+                deltas[key] = [a + b for a, b in zip(deltas.get(key, [0, 0, 0, 0]), delta)]
+            self.env['supplier.audit']._apply_score_deltas(deltas)
+        if audits is not None:
+            self._renumber(audits | self.audit_id)
+        return result
+
+    def unlink(self):
+        audits = self.audit_id
+        deltas = self._get_score_deltas(sign=-1)
+        result = super().unlink()
+        self.env['supplier.audit']._apply_score_deltas(deltas)
+        self._renumber(audits)
+        return result
+
+    @api.model
+    def _renumber(self, audits):
+        """Queue the audits for the numbering of their lines, done once per
+        audit before the transaction is committed."""
+        renumber_later(self, audits.ids)
+
+    @api.model
+    def _renumber_parents(self, audit_ids):
+        """Number the lines of the audits in their display order."""
+        renumber(self.env, self._name, 'audit_id', audit_ids)
+
+    @api.model
+    def _init_serial_numbers(self):
+        """Number the lines of existing audits that were never numbered."""
+        self.env.cr.execute("""
+            SELECT DISTINCT audit_id FROM supplier_audit_question_line
+             WHERE audit_id IS NOT NULL AND COALESCE(sl_no, 0) = 0
+        """)
+        renumber(self.env, self._name, 'audit_id', [row[0] for row in self.env.cr.fetchall()])
+
     def mark_as_not_applicable(self):
         self.state = 'na'
 
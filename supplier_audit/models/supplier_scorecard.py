@@ -0,0 +1,193 @@
+from odoo import models, fields, api
+from dateutil.relativedelta import relativedelta
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+# Number of suppliers refreshed per batch by the cron
+SCORECARD_CHUNK_SIZE = 1000
+# Precommit data key of the suppliers queued for a scorecard refresh
+SCORECARD_PRECOMMIT_KEY = 'supplier_audit.scorecard_partners'
+# Compliance scores (fractions) below which a supplier is a medium or high risk
+RISK_HIGH_COMPLIANCE = 0.67
+RISK_MEDIUM_COMPLIANCE = 0.8
+
+
+class SupplierAuditScorecard(models.Model):
+    _name = 'supplier.audit.scorecard'
+    _description = 'Supplier Audit Scorecard'
+    _order = 'risk_level desc, last_compliance_score, partner_id'
+    _rec_name = 'partner_id'
+
+    partner_id = fields.Many2one('res.partner', string='Supplier', required=True,
+                                 ondelete='cascade', index=True)
+    last_audit_id = fields.Many2one('supplier.audit', string='Last Audit', ondelete='set null')
+    last_audit_date = fields.Date('Last Audit Date')
+    done_audit_count = fields.Integer('Completed Audits')
+    last_compliance_score = fields.Float('Last Compliance Score')
+    previous_compliance_score = fields.Float('Previous Compliance Score')
+    compliance_trend = fields.Selection([
+        ('up', 'Improving'),
+        ('stable', 'Stable'),
+        ('down', 'Declining'),
+    ], string='Trend')
+    critical_findings_12m = fields.Integer('Critical Findings (12 months)')
+    major_findings_12m = fields.Integer('Major Findings (12 months)')
+    open_action_count = fields.Integer('Open Actions')
+    overdue_action_count = fields.Integer('Overdue Actions')
+    risk_level = fields.Selection([
+        ('0', 'Low'),
+        ('1', 'Medium'),
+        ('2', 'High'),
+    ], string='Risk Level')
+    refresh_date = fields.Datetime('Last Refresh')
+
+    _sql_constraints = [
+        ('partner_uniq', 'unique(partner_id)', 'A supplier can only have one audit scorecard.'),
+    ]
+
+    @api.model
+    def _get_risk_level(self, vals):
+        if not vals['done_audit_count'] and not vals['open_action_count']:
+            return False
+        if vals['critical_findings_12m'] or (
+                vals['done_audit_count'] and vals['last_compliance_score'] < RISK_HIGH_COMPLIANCE):
+            return '2'
+        if vals['major_findings_12m'] or vals['overdue_action_count'] or (
+                vals['done_audit_count'] and vals['last_compliance_score'] < RISK_MEDIUM_COMPLIANCE):
+            return '1'
+        return '0'
+
+    @api.model
+    def _read_scorecard_values(self, partner_ids):
+        """Compute the scorecard values of the suppliers with one grouped
+        query per source table."""
+        today = fields.Date.context_today(self)
+        values = {partner_id: {
+            'last_audit_id': False,
+            'last_audit_date': False,
+            'done_audit_count': 0,
+            'last_compliance_score': 0.0,
+            'previous_compliance_score': 0.0,
+            'compliance_trend': False,
+            'critical_findings_12m': 0,
+            'major_findings_12m': 0,
+            'open_action_count': 0,
+            'overdue_action_count': 0,
+        } for partner_id in partner_ids}
+        self.env['supplier.audit'].flush_model(['partner_id', 'state', 'audit_date', 'compliance_score'])
+        self.env['audit.finding'].flush_model(['partner_id', 'severity', 'finding_date'])
+        self.env['sa.corrective.action'].flush_model(['partner_id', 'state', 'due_date'])
+        cr = self.env.cr
+
+        # The last two completed audits of each supplier
+        cr.execute("""
+            SELECT partner_id, id, audit_date, compliance_score, audit_count
+              FROM (SELECT partner_id, id, audit_date, compliance_score,
+                           ROW_NUMBER() OVER (PARTITION BY partner_id ORDER BY audit_date DESC, id DESC) AS rank,
+                           COUNT(*) OVER (PARTITION BY partner_id) AS audit_count
+                      FROM supplier_audit
+                     WHERE partner_id IN %s AND state = 'done') AS audits
+             WHERE rank <= 2
+          ORDER BY partner_id, rank
+        """, [tuple(partner_ids)])
+        for partner_id, audit_id, audit_date, compliance_score, audit_count in cr.fetchall():
+            vals = values[partner_id]
+            if not vals['last_audit_id']:
+                vals.update(last_audit_id=audit_id, last_audit_date=audit_date, done_audit_count=audit_count,
+                            last_compliance_score=compliance_score or 0.0, compliance_trend='stable')
+                continue
+            vals['previous_compliance_score'] = compliance_score or 0.0
+            if vals['last_compliance_score'] > vals['previous_compliance_score']:
+                vals['compliance_trend'] = 'up'
+            elif vals['last_compliance_score'] < vals['previous_compliance_score']:
+                vals['compliance_trend'] = 'down'
+
+        cr.execute("""
+            SELECT partner_id,
+                   COUNT(*) FILTER (WHERE severity = 'critical'),
+                   COUNT(*) FILTER (WHERE severity = 'major')
+              FROM audit_finding
+             WHERE partner_id IN %s AND finding_date >= %s AND severity IN ('critical', 'major')
+          GROUP BY partner_id
+        """, [tuple(partner_ids), today - relativedelta(months=12)])
+        for partner_id, critical, major in cr.fetchall():
+            values[partner_id].update(critical_findings_12m=critical, major_findings_12m=major)
+
+        cr.execute("""
+            SELECT partner_id, COUNT(*), COUNT(*) FILTER (WHERE due_date < %s)
+              FROM sa_corrective_action
+             WHERE partner_id IN %s AND state NOT IN ('completed', 'cancelled')
+          GROUP BY partner_id
+        """, [today, tuple(partner_ids)])
+        for partner_id, open_count, overdue_count in cr.fetchall():
+            values[partner_id].update(open_action_count=open_count, overdue_action_count=overdue_count)
+
+        for vals in values.values():
+            vals['risk_level'] = self._get_risk_level(vals)
+        return values
+
+    @api.model
+    def _refresh_partners(self, partners):
+        """Queue the suppliers for a refresh of their scorecards. The queued
+        suppliers are refreshed once, before the transaction is committed,
+        so bulk changes of audits, findings and actions refresh each
+        supplier a single time."""
+        data = self.env.cr.precommit.data
+        if SCORECARD_PRECOMMIT_KEY not in data:
+            data[SCORECARD_PRECOMMIT_KEY] = set()
+            self.env.cr.precommit.add(self._refresh_queued_partners)
+        data[SCORECARD_PRECOMMIT_KEY].update(partner_id for partner_id in partners.ids if partner_id)
+
+    @api.model
+    def _refresh_queued_partners(self):
+        partner_ids = self.env.cr.precommit.data.pop(SCORECARD_PRECOMMIT_KEY, set())
+        if partner_ids:
+            self._update_scorecards(sorted(partner_ids))
+            self.env.flush_all()
+
+    @api.model
+    def _update_scorecards(self, partner_ids):
+        """Bring the scorecards of the suppliers up to date, creating the
+        missing ones and writing only the scorecards that changed."""
+        if not partner_ids:
+            return
+        self = self.sudo()
+        values = self._read_scorecard_values(partner_ids)
+        field_names = list(next(iter(values.values())))
+        now = fields.Datetime.now()
+        for current in self.search_read([('partner_id', 'in', partner_ids)], ['partner_id'] + field_names,
+                                        load=None):
+            vals = values.pop(current['partner_id'])
+            if any(current[name] != value for name, value in vals.items()):
+                self.browse(current['id']).write(dict(vals, refresh_date=now))
+        self.create([
+            dict(vals, partner_id=partner_id, refresh_date=now)
+            for partner_id, vals in values.items()
+            if vals['done_audit_count'] or vals['open_action_count']
+        ])
+
+    @api.model
+    def _cron_refresh_scorecards(self):
+        """Refresh all scorecards, so the 12 month windows and overdue
+        actions follow the calendar."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        self.env.cr.execute("""
+            SELECT partner_id FROM supplier_audit WHERE state = 'done'
+             UNION
+            SELECT partner_id FROM sa_corrective_action WHERE state NOT IN ('completed', 'cancelled')
+             UNION
+            SELECT partner_id FROM supplier_audit_scorecard
+        """)
+        partner_ids = sorted(row[0] for row in self.env.cr.fetchall() if row[0])
+        for offset in range(0, len(partner_ids), SCORECARD_CHUNK_SIZE):
+            self._update_scorecards(partner_ids[offset:offset + SCORECARD_CHUNK_SIZE])
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+        _logger.info("Refreshed the audit scorecards of %s suppliers", len(partner_ids))
+
+    def action_view_audits(self):
+        self.ensure_one()
+        return self.partner_id.action_view_supplier_audits()
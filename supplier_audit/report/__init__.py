@@ -0,0 +1 @@
+from . import supplier_audit_report
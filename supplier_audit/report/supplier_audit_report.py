@@ -0,0 +1,128 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools.pdf import merge_pdf
+from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+REPORT_XMLID = 'supplier_audit.action_report_supplier_audit'
+# Marks the merged PDF downloads of the batch print, garbage collected
+BATCH_REPORT_DESCRIPTION = 'supplier_audit.batch_report'
+BATCH_REPORT_RETENTION_DAYS = 1
+# Name of the PDF kept on completed audits, see the report action
+AUDIT_REPORT_NAME_PATTERN = r'^Supplier Audit - .* - [0-9]{14}\.pdf$'
+
+
+class SupplierAuditReport(models.AbstractModel):
+    _name = 'report.supplier_audit.supplier_audit_report_template'
+    _description = 'Supplier Audit Report'
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        docs = self.env['supplier.audit'].browse(docids)
+
+        # Load the lines, findings and actions of all the audits at once
+        # instead of per audit while rendering
+        lines = docs.question_line_ids
+        lines.mapped('question_id.name')
+        lines.mapped('category_id.name')
+        findings = docs.finding_ids
+        actions = docs.corrective_action_ids
+        docs.category_score_ids.mapped('category_id.name')
+        docs.mapped('partner_id.name')
+        docs.mapped('auditor_id.name')
+
+        lines_by_audit = {audit.id: [] for audit in docs}
+        for line in lines:
+            lines_by_audit[line.audit_id.id].append(line)
+        findings_by_audit = {audit.id: [] for audit in docs}
+        for finding in findings:
+            findings_by_audit[finding.audit_id.id].append(finding)
+        actions_by_audit = {audit.id: [] for audit in docs}
+        for action in actions:
+            actions_by_audit[action.audit_id.id].append(action)
+
+        return {
+            'doc_ids': docids,
+            'doc_model': 'supplier.audit',
+            'docs': docs,
+            'lines_by_audit': lines_by_audit,
+            'findings_by_audit': findings_by_audit,
+            'actions_by_audit': actions_by_audit,
+            'state_labels': dict(lines._fields['state']._description_selection(self.env)),
+            'severity_labels': dict(findings._fields['severity']._description_selection(self.env)),
+            'finding_state_labels': dict(findings._fields['state']._description_selection(self.env)),
+            'action_type_labels': dict(actions._fields['action_type']._description_selection(self.env)),
+            'action_state_labels': dict(actions._fields['state']._description_selection(self.env)),
+        }
+
+    @api.model
+    def _get_batch_size(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('supplier_audit.report_batch_size', 20))
+
+    @api.model
+    def _render_batch_pdf(self, audit_ids):
+        """Render the report of many audits as one PDF.
+
+        The audits are rendered in chunks, each in a separate wkhtmltopdf
+        run, and the chunk PDFs merged. Completed audits reuse the PDF
+        attached to them by a previous print. The chunks are rendered on
+        the current cursor, so they see the changes of the transaction and
+        their attachments are committed or rolled back with it.
+        """
+        batch_size = self._get_batch_size()
+        chunks = [audit_ids[offset:offset + batch_size] for offset in range(0, len(audit_ids), batch_size)]
+        Report = self.env['ir.actions.report']
+        pdfs = [Report._render_qweb_pdf(REPORT_XMLID, chunk)[0] for chunk in chunks]
+        _logger.info("Rendered the report of %s audits in %s chunks", len(audit_ids), len(chunks))
+        return pdfs[0] if len(pdfs) == 1 else merge_pdf(pdfs)
+
+    @api.model
+    def action_print_batch(self, audits):
+        if not audits:
+            raise UserError(_("Select the audits to print."))
+        pdf_content = self._render_batch_pdf(audits.ids)
+        # Download only, removed by _gc_batch_reports
+        attachment = self.env['ir.attachment'].create({
+            'name': _('Supplier Audits (%s).pdf') % len(audits),
+            'type': 'binary',
+            'raw': pdf_content,
+            'mimetype': 'application/pdf',
+            'res_model': 'supplier.audit',
+            'description': BATCH_REPORT_DESCRIPTION,
+        })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % attachment.id,
+            'target': 'self',
+        }
+
+    @api.autovacuum
+    def _gc_batch_reports(self):
+        """Remove the batch report downloads of more than a day."""
+        self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', 'supplier.audit'),
+            ('res_id', '=', False),
+            ('description', '=', BATCH_REPORT_DESCRIPTION),
+            ('create_date', '<', fields.Datetime.now() - timedelta(days=BATCH_REPORT_RETENTION_DAYS)),
+        ]).unlink()
+
+    @api.autovacuum
+    def _gc_audit_reports(self):
+        """Keep only the newest report PDF of each audit. A completed audit
+        gets a new PDF when it is printed after a write, the older ones are
+        not reused."""
+        self.env['ir.attachment'].flush_model(['res_model', 'res_id', 'name'])
+        self.env.cr.execute("""
+            SELECT id
+              FROM (SELECT id, row_number() OVER (PARTITION BY res_id ORDER BY id DESC) AS rank
+                      FROM ir_attachment
+                     WHERE res_model = 'supplier.audit'
+                       AND res_id IS NOT NULL
+                       AND name ~ %s) AS reports
+             WHERE rank > 1
+        """, [AUDIT_REPORT_NAME_PATTERN])
+        attachment_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.env['ir.attachment'].sudo().browse(attachment_ids).unlink()
+        _logger.info("Removed %s outdated audit reports", len(attachment_ids))
@@ -0,0 +1,101 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+import { Pager } from "@web/core/pager/pager";
+import { Component, onWillStart, onWillUpdateProps, useState } from "@odoo/owl";
+
+const PAGE_SIZE = 40;
+
+const STATUS_DECORATIONS = { '0': 'text-danger', '1': 'text-danger', '2': 'text-warning', '3': 'text-success' };
+
+/**
+ * Category tabs of the audit questions. Only the lines of the selected
+ * category, status and page are fetched, instead of the whole question
+ * list of the audit.
+ */
+export class AuditQuestionTabs extends Component {
+    setup() {
+        this.orm = useService("orm");
+        this.limit = PAGE_SIZE;
+        this.state = useState({ categoryId: false, lineState: "", offset: 0, data: null });
+
+        onWillStart(() => this.loadPage());
+        onWillUpdateProps((nextProps) => {
+            if (nextProps.record.resId !== this.props.record.resId) {
+                Object.assign(this.state, { categoryId: false, lineState: "", offset: 0 });
+                return this.loadPage(nextProps.record.resId);
+            }
+        });
+    }
+
+    get editable() {
+        return !this.props.readonly && this.props.record.data.state === 'in_progress';
+    }
+
+    async loadPage(resId = this.props.record.resId) {
+        if (!resId) {
+            this.state.data = null;
+            return;
+        }
+        this.state.data = await this.orm.call("supplier.audit", "get_question_page", [[resId]], {
+            category_id: this.state.categoryId,
+            state: this.state.lineState || false,
+            offset: this.state.offset,
+            limit: this.limit,
+        });
+    }
+
+    async selectCategory(categoryId) {
+        this.state.categoryId = categoryId;
+        this.state.offset = 0;
+        await this.loadPage();
+    }
+
+    async onLineStateChange(ev) {
+        this.state.lineState = ev.target.value;
+        this.state.offset = 0;
+        await this.loadPage();
+    }
+
+    async onPagerUpdate({ offset, limit }) {
+        this.state.offset = offset;
+        this.limit = limit;
+        await this.loadPage();
+    }
+
+    rowClass(line) {
+        return (line.state === 'answered' && STATUS_DECORATIONS[line.status]) || '';
+    }
+
+    stateLabel(state) {
+        const option = this.state.data.state_selection.find(([value]) => value === state);
+        return option ? option[1] : '';
+    }
+
+    onStatusChange(line, ev) {
+        const status = ev.target.value || false;
+        const vals = { status };
+        // Same rule as the status onchange of the question line
+        if (status && status !== '0') {
+            vals.state = 'answered';
+        }
+        return this.updateLine(line, vals);
+    }
+
+    async updateLine(line, vals) {
+        await this.orm.write("supplier.audit.question.line", [line.id], vals);
+        // Reload the page (the line may leave the status filter) and the
+        // scores of the audit
+        await this.loadPage();
+        if (!(await this.props.record.isDirty())) {
+            await this.props.record.load();
+            this.props.record.model.notify();
+        }
+    }
+}
+
+AuditQuestionTabs.template = "supplier_audit.AuditQuestionTabs";
+AuditQuestionTabs.components = { Pager };
+
+registry.category("view_widgets").add("audit_question_tabs", AuditQuestionTabs);
@@ -0,0 +1,124 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+import { Component, onMounted, onWillStart, onWillUnmount, useRef, useState } from "@odoo/owl";
+import { buildRadarDatasets } from "@supplier_audit/js/radar_chart_widget";
+
+const COLORS = ['#36A2EB', '#FF6384', '#4BC0C0', '#FFCE56', '#9966FF', '#FF9F40', '#C9CBCF', '#2E7D32', '#8D6E63', '#00838F'];
+
+export class PortfolioDashboard extends Component {
+    setup() {
+        this.orm = useService("orm");
+        this.action = useService("action");
+        this.radarRef = useRef("radar");
+        this.trendRef = useRef("trend");
+        this.comparisonRef = useRef("comparison");
+        this.charts = {};
+        this.state = useState({ dateFrom: "", dateTo: "", limit: 10, data: null });
+
+        onWillStart(() => this.loadData());
+        onMounted(() => this.renderCharts());
+        onWillUnmount(() => this.destroyCharts());
+    }
+
+    async loadData() {
+        this.state.data = await this.orm.call("supplier.audit", "get_portfolio_data", [], {
+            date_from: this.state.dateFrom || false,
+            date_to: this.state.dateTo || false,
+            limit: this.state.limit,
+        });
+    }
+
+    async onFilterChange() {
+        await this.loadData();
+        this.renderCharts();
+    }
+
+    destroyCharts() {
+        for (const chart of Object.values(this.charts)) {
+            chart.destroy();
+        }
+        this.charts = {};
+    }
+
+    renderChart(name, ref, config) {
+        if (!ref.el) return;
+        if (this.charts[name]) {
+            this.charts[name].data = config.data;
+            this.charts[name].update();
+            return;
+        }
+        this.charts[name] = new Chart(ref.el.getContext('2d'), config);
+    }
+
+    renderCharts() {
+        const { categories, suppliers, trends } = this.state.data;
+        const labels = categories.map((category) => category.name);
+        const percentOptions = {
+            responsive: true,
+            maintainAspectRatio: false,
+            interaction: { intersect: false },
+        };
+
+        // One radar per supplier, drawn over the benchmark lines
+        const benchmarks = buildRadarDatasets(labels, []).slice(1);
+        this.renderChart("radar", this.radarRef, {
+            type: 'radar',
+            data: {
+                labels,
+                datasets: suppliers.map((supplier, index) => ({
+                    label: supplier.name,
+                    data: supplier.values,
+                    borderColor: COLORS[index % COLORS.length],
+                    backgroundColor: 'transparent',
+                    borderWidth: 2,
+                    pointRadius: 3,
+                })).concat(benchmarks),
+            },
+            options: { ...percentOptions, scales: { r: { suggestedMin: 0, suggestedMax: 100 } } },
+        });
+
+        this.renderChart("trend", this.trendRef, {
+            type: 'line',
+            data: {
+                labels: trends.map((trend) => trend.period),
+                datasets: categories.map((category, index) => ({
+                    label: category.name,
+                    data: trends.map((trend) => trend.values[index]),
+                    borderColor: COLORS[index % COLORS.length],
+                    spanGaps: true,
+                    fill: false,
+                })),
+            },
+            options: { ...percentOptions, scales: { y: { suggestedMin: 0, suggestedMax: 100 } } },
+        });
+
+        this.renderChart("comparison", this.comparisonRef, {
+            type: 'bar',
+            data: {
+                labels: suppliers.map((supplier) => supplier.name),
+                datasets: [{
+                    label: 'Score (%)',
+                    data: suppliers.map((supplier) => supplier.percentage),
+                    backgroundColor: suppliers.map((supplier, index) => COLORS[index % COLORS.length]),
+                }],
+            },
+            options: { ...percentOptions, scales: { y: { suggestedMin: 0, suggestedMax: 100 } } },
+        });
+    }
+
+    openSupplierAudits(supplier) {
+        this.action.doAction({
+            type: 'ir.actions.act_window',
+            name: supplier.name,
+            res_model: 'supplier.audit',
+            views: [[false, 'list'], [false, 'form']],
+            domain: [['partner_id', '=', supplier.id]],
+        });
+    }
+}
+
+PortfolioDashboard.template = "supplier_audit.PortfolioDashboard";
+
+registry.category("actions").add("supplier_audit.portfolio_dashboard", PortfolioDashboard);
@@ -1,17 +1,86 @@
 /** @odoo-module **/
 
 import { registry } from "@web/core/registry";
-import { Component, onMounted, onWillUnmount, useRef } from "@odoo/owl";
+import { Component, onMounted, onPatched, onWillUnmount, useRef } from "@odoo/owl";
+
+// Benchmark lines drawn behind the audit results
+const BENCHMARKS = [
+    { label: 'Good (100%)', value: 100, color: '#4BC0C0', background: 'rgba(75, 192, 192, 0.1)' },
+    { label: 'Standard (80%)', value: 80, color: '#FFCE56', background: 'rgba(255, 206, 86, 0.1)' },
+    { label: 'Poor (67%)', value: 67, color: '#FF6384', background: 'rgba(255, 99, 132, 0.1)' },
+];
+
+// Static Chart.js options, the server only sends the labels and values
+const CHART_OPTIONS = {
+    responsive: true,
+    maintainAspectRatio: false,
+    scales: {
+        r: {
+            angleLines: { display: true, color: 'rgba(0, 0, 0, 0.1)' },
+            grid: { color: 'rgba(0, 0, 0, 0.1)' },
+            suggestedMin: 0,
+            suggestedMax: 100,
+            ticks: {
+                stepSize: 25,
+                callback: (value) => value + '%',
+            },
+        },
+    },
+    plugins: {
+        legend: {
+            position: 'top',
+            labels: { usePointStyle: true, padding: 20 },
+        },
+        tooltip: {
+            callbacks: {
+                label: (context) => context.dataset.label + ': ' + context.parsed.r + '%',
+            },
+        },
+    },
+    interaction: { intersect: false },
+};
+
+export function buildRadarDatasets(labels, values, resultLabel = 'Audit Results') {
+    return [
+        {
+            label: resultLabel,
+            data: values,
+            backgroundColor: 'rgba(54, 162, 235, 0.2)',
+            borderColor: '#36A2EB',
+            borderWidth: 2,
+            pointBackgroundColor: '#36A2EB',
+            pointBorderColor: '#36A2EB',
+            pointBorderWidth: 2,
+            pointRadius: 5,
+            fill: true,
+        },
+        ...BENCHMARKS.map((benchmark) => ({
+            label: benchmark.label,
+            data: labels.map(() => benchmark.value),
+            backgroundColor: benchmark.background,
+            borderColor: benchmark.color,
+            borderWidth: 1,
+            pointBackgroundColor: benchmark.color,
+            pointRadius: 3,
+            fill: false,
+        })),
+    ];
+}
 
 export class RadarChartWidget extends Component {
     setup() {
         this.chartRef = useRef("chart");
         this.chart = null;
+        this.payload = null;
 
         onMounted(() => {
             this.renderChart();
         });
 
+        onPatched(() => {
+            this.renderChart();
+        });
+
         onWillUnmount(() => {
             if (this.chart) {
                 this.chart.destroy();
@@ -19,97 +88,43 @@ export class RadarChartWidget extends Component {
         });
     }
 
-    renderChart() {
-        if (!this.chartRef.el) return;
-
-        const ctx = this.chartRef.el.getContext('2d');
-
-        // Get chart data from the field
-        let chartData;
+    getChartValues(payload) {
         try {
-            const dataStr = this.props.record.data[this.props.name];
-            chartData = dataStr ? JSON.parse(dataStr) : this.getDefaultChartData();
+            const { labels = [], values = [] } = payload ? JSON.parse(payload) : {};
+            if (labels.length) {
+                return { labels, values };
+            }
         } catch (error) {
             console.error('Error parsing chart data:', error);
-            chartData = this.getDefaultChartData();
         }
+        return { labels: ['No Categories Configured'], values: [0] };
+    }
 
-        // Destroy existing chart if it exists
-        if (this.chart) {
-            this.chart.destroy();
-        }
-
-        // Add native JS callback functions (replacing invalid JSON strings)
-        const optionsWithCallbacks = {
-            ...chartData.options,
-            scales: {
-                ...(chartData.options?.scales || {}),
-                r: {
-                    ...(chartData.options?.scales?.r || {}),
-                    ticks: {
-                        ...chartData.options?.scales?.r?.ticks,
-                        callback: function (value) {
-                            return value + '%';
-                        }
-                    }
-                }
-            },
-            plugins: {
-                ...(chartData.options?.plugins || {}),
-                tooltip: {
-                    ...chartData.options?.plugins?.tooltip,
-                    callbacks: {
-                        ...chartData.options?.plugins?.tooltip?.callbacks,
-                        label: function (context) {
-                            return context.dataset.label + ': ' + context.parsed.r + '%';
-                        }
-                    }
-                }
-            }
-        };
-
-    // Create new chart
-    this.chart = new Chart(ctx, {
-        type: 'radar',
-        data: chartData.data,
-        options: optionsWithCallbacks
-    });
-}
+    renderChart() {
+        if (!this.chartRef.el) return;
 
+        const payload = this.props.record.data[this.props.name];
+        if (this.chart && payload === this.payload) return;
+        this.payload = payload;
 
-    getDefaultChartData() {
-        return {
-            data: {
-                labels: ['Management', 'Manufacturing', 'Production Readiness', 'Quality Assurance'],
-                datasets: [{
-                    label: 'Audit Results',
-                    data: [0, 0, 0, 0],
-                    backgroundColor: 'rgba(54, 162, 235, 0.2)',
-                    borderColor: '#36A2EB',
-                    borderWidth: 2
-                }]
-            },
-            options: {
-                scales: {
-                    r: {
-                        angleLines: { display: true },
-                        suggestedMin: 0,
-                        suggestedMax: 100,
-                        ticks: { stepSize: 25 }
-                    }
-                }
-            }
-        };
-    }
+        const { labels, values } = this.getChartValues(payload);
+        const data = { labels, datasets: buildRadarDatasets(labels, values) };
 
-    async willUpdateProps(nextProps) {
-        if (this.props.record.data[this.props.name] !== nextProps.record.data[nextProps.name]) {
-            await this.renderChart();
+        // Update the existing chart in place instead of rebuilding it
+        if (this.chart) {
+            this.chart.data = data;
+            this.chart.update();
+            return;
         }
+        this.chart = new Chart(this.chartRef.el.getContext('2d'), {
+            type: 'radar',
+            data,
+            options: CHART_OPTIONS,
+        });
     }
 }
 
 RadarChartWidget.template = "RadarChartWidget";
 RadarChartWidget.supportedTypes = ["text"];
 
-registry.category("fields").add("radar_chart", RadarChartWidget);
\ No newline at end of file
+registry.category("fields").add("radar_chart", RadarChartWidget);
@@ -0,0 +1,236 @@
+import logging
+import time
+from datetime import date, timedelta
+from contextlib import contextmanager
+
+from odoo.tests import TransactionCase, tagged
+
+from ..tools.load_generator import LoadGenerator
+
+_logger = logging.getLogger(__name__)
+
+REPORT_XMLID = 'supplier_audit.action_report_supplier_audit'
+
+
+@tagged('post_install', '-at_install', '-standard', 'supplier_audit_benchmark')
+class TestSupplierAuditPerformance(TransactionCase):
+    """Timings and query counts of the audit workflows.
+
+    Run with ``--test-tags supplier_audit_benchmark``. Each measure is
+    logged, the query count ceilings catch regressions that make a
+    workflow scale with the number of questions.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = []
+        cls.generator = LoadGenerator(cls.env, seed=42)
+        cls.checklist = cls.generator.generate_checklists(1, questions=200)
+        cls.small_checklist = cls.generator.generate_checklists(1, questions=50)
+        cls.suppliers = cls.generator.generate_suppliers(20)
+
+    @classmethod
+    def tearDownClass(cls):
+        lines = ['%-40s %10s %8s' % ('benchmark', 'ms', 'queries')]
+        lines += ['%-40s %10.1f %8d' % result for result in cls.results]
+        _logger.info("Supplier audit benchmarks:\n%s", '\n'.join(lines))
+        super().tearDownClass()
+
+    @contextmanager
+    def measure(self, label):
+        """Record the wall time and query count of the block, including
+        the work deferred to the end of the transaction (precommit)."""
+        self.env.cr.flush()
+        queries = self.cr.sql_log_count
+        start = time.perf_counter()
+        counter = {}
+        yield counter
+        self.env.cr.flush()
+        counter['queries'] = self.cr.sql_log_count - queries
+        counter['ms'] = (time.perf_counter() - start) * 1000
+        self.results.append((label, counter['ms'], counter['queries']))
+
+    def _create_audits(self, count, checklist=None):
+        return self.env['supplier.audit'].create([{
+            'partner_id': self.suppliers[index % len(self.suppliers)].id,
+            'checklist_id': (checklist or self.checklist).id,
+            'audit_date': '2026-01-15',
+        } for index in range(count)])
+
+    def test_audit_creation(self):
+        with self.measure('create 50 audits (200 questions)'):
+            audits = self._create_audits(50)
+        self.assertEqual(len(audits.question_line_ids), 50 * 200)
+        self.assertTrue(all(audit.total_questions == 200 for audit in audits))
+
+    def test_checklist_upload(self):
+        checklist = self.env['audit.checklist'].create({
+            'name': 'Upload Benchmark',
+            'uploaded_excel_file': self.generator.question_file(2000),
+            'uploaded_file_name': 'upload_benchmark.xlsx',
+        })
+        with self.measure('preview upload (2000 questions)'):
+            checklist.action_upload_questions()
+        with self.measure('apply upload (2000 questions)'):
+            checklist.action_apply_question_import()
+        self.assertEqual(checklist.total_questions, 2000)
+        with self.measure('re-upload unchanged (2000 questions)') as counter:
+            checklist.action_apply_question_import()
+        self.assertEqual(checklist.total_questions, 2000)
+        self.assertLess(counter['queries'], 50, "An unchanged re-upload should not write questions one by one")
+
+    def test_answer_questions(self):
+        small, large = self._create_audits(1, self.small_checklist) | self._create_audits(1)
+        queries = {}
+        for audit in (small, large):
+            line = audit.question_line_ids[len(audit.question_line_ids) // 2]
+            with self.measure('answer 1 question (%s questions)' % audit.total_questions) as counter:
+                line.write({'status': '2', 'state': 'answered'})
+            queries[audit] = counter['queries']
+        self.assertEqual(queries[small], queries[large],
+                         "Answering a question should not depend on the number of questions of the audit")
+
+        with self.measure('answer 200 questions one by one'):
+            for line in large.question_line_ids:
+                line.write({'status': '3', 'state': 'answered'})
+        self.assertEqual(large.completion_rate, 100)
+        self.assertAlmostEqual(large.compliance_score, 1.0)
+
+    def test_action_complete(self):
+        audits = self._create_audits(20)
+        self.generator.answer_lines(audits.question_line_ids)
+        self.generator.generate_findings(audits)
+        with self.measure('action_complete x20 (200 questions)'):
+            for audit in audits:
+                audit.action_complete()
+        self.assertTrue(all(audit.state == 'done' for audit in audits))
+
+    def test_report_rendering(self):
+        audits = self._create_audits(10)
+        self.generator.answer_lines(audits.question_line_ids)
+        self.generator.generate_findings(audits)
+        with self.measure('report html x10 (200 questions)') as counter:
+            html, _content_type = self.env['ir.actions.report']._render_qweb_html(REPORT_XMLID, audits.ids)
+        self.assertIn(audits[0].name.encode(), html)
+
+        audits.invalidate_recordset()
+        self.env['supplier.audit.question.line'].invalidate_model()
+        with self.measure('report html x1 (200 questions)') as single:
+            self.env['ir.actions.report']._render_qweb_html(REPORT_XMLID, audits[:1].ids)
+        self.assertLess(counter['queries'], single['queries'] * 3,
+                        "The report queries should be batched over the printed audits")
+
+    def test_radar_chart_data(self):
+        audits = self._create_audits(100)
+        self.generator.answer_lines(audits.question_line_ids)
+        audits.invalidate_recordset(['radar_chart_data'])
+        with self.measure('radar chart data x100 (cold)'):
+            audits.mapped('radar_chart_data')
+        audits.invalidate_recordset(['radar_chart_data'])
+        with self.measure('radar chart data x100 (cached)') as counter:
+            audits.mapped('radar_chart_data')
+        self.assertLessEqual(counter['queries'], 2, "The cached radar payload should not read the scores again")
+
+    def test_question_page(self):
+        small, large = self._create_audits(1, self.small_checklist) | self._create_audits(1)
+        queries = {}
+        for audit in (small, large):
+            audit.invalidate_recordset()
+            with self.measure('question tab page (%s questions)' % audit.total_questions) as counter:
+                page = audit.get_question_page(category_id=audit.category_score_ids[:1].category_id.id)
+            self.assertLessEqual(len(page['records']), 40)
+            queries[audit] = counter['queries']
+        self.assertEqual(queries[small], queries[large],
+                         "A question tab page should not depend on the number of questions of the audit")
+
+    def test_bulk_answers(self):
+        audit = self._create_audits(1)
+        audit.action_start()
+        lines = audit.question_line_ids
+        answers = [{
+            'id': line.id,
+            'status': str(index % 4),
+            'state': 'answered',
+            'observation': 'Checked on site',
+            'write_date': line.write_date,
+        } for index, line in enumerate(lines)]
+        with self.measure('bulk answers (200 questions)') as counter:
+            result = audit.apply_question_answers(answers)
+        self.assertEqual(len(result['applied']), 200)
+        self.assertFalse(result['conflicts'] or result['errors'])
+        self.assertEqual(audit.completion_rate, 100)
+        self.assertLess(counter['queries'], 50, "Bulk answers should be written per answer, not per line")
+
+    def test_action_escalation(self):
+        audits = self._create_audits(10)
+        self.generator.answer_lines(audits.question_line_ids)
+        self.generator.generate_findings(audits)
+        actions = self.env['sa.corrective.action'].search([('audit_id', 'in', audits.ids)])
+        actions.write({'state': 'in_progress'})
+        today = date.today()
+        for index, action in enumerate(actions):
+            action.due_date = today + timedelta(days=index % 40 - 30)
+        with self.measure('escalate %s open actions' % len(actions)):
+            escalated = self.env['sa.corrective.action']._cron_escalate_overdue_actions()
+        self.assertTrue(escalated)
+        self.assertTrue(all(action.priority >= '2' for action in actions if action.escalation_level >= '2'))
+        with self.measure('escalate again (nothing to do)'):
+            self.assertFalse(self.env['sa.corrective.action']._cron_escalate_overdue_actions())
+
+    def test_bulk_transition(self):
+        audits = self._create_audits(10)
+        self.generator.answer_lines(audits.question_line_ids)
+        self.generator.generate_findings(audits)
+        actions = self.env['sa.corrective.action'].search([('audit_id', 'in', audits.ids)])
+        actions.write({'state': 'review'})
+        messages = self.env['mail.message'].search_count([])
+        with self.measure('bulk complete %s actions' % len(actions)):
+            moved, skipped = actions.bulk_transition('completed')
+        self.assertEqual(moved, actions)
+        self.assertFalse(skipped)
+        self.assertTrue(all(finding.state == 'closed' for finding in actions.finding_id))
+        self.assertTrue(all(audit.open_actions == 0 for audit in audits))
+        self.assertLessEqual(self.env['mail.message'].search_count([]) - messages, len(audits),
+                             "A bulk status change should post one summary per audit")
+
+    def test_sequence_block(self):
+        audits = self._create_audits(5)
+        self.generator.answer_lines(audits.question_line_ids)
+        with self.measure('create findings in one batch'):
+            findings = self.generator.generate_findings(audits)
+        names = findings.mapped('name')
+        self.assertEqual(len(set(names)), len(findings))
+        self.assertEqual(names, sorted(names), "The references should be assigned in creation order")
+        blocks = self.env['ir.sequence']._next_block_by_code('audit.finding', 3)
+        self.assertEqual(len(blocks), 3)
+        self.assertLess(names[-1], blocks[0])
+
+    def test_finding_rules(self):
+        # The default rules are shipped archived
+        self.env['audit.finding.rule'].with_context(active_test=False).search([]).active = True
+        audits = self._create_audits(20)
+        self.generator.answer_lines(audits.question_line_ids)
+        low_lines = audits.question_line_ids.filtered(
+            lambda line: line.state == 'answered' and line.status in ('0', '1'))
+        with self.measure('finding rules x20 (200 questions)'):
+            findings = self.env['audit.finding.rule']._apply_rules(audits)
+        self.assertEqual(findings.question_line_id, low_lines)
+        with self.measure('finding rules again (nothing to do)'):
+            self.assertFalse(self.env['audit.finding.rule']._apply_rules(audits))
+
+    def test_serial_numbers(self):
+        checklist = self.generator.generate_checklists(1, questions=500)
+        questions = checklist.question_ids
+        self.env.cr.flush()
+        self.assertEqual(questions.mapped('sl_no'), list(range(1, 501)))
+        last = questions[-1]
+        with self.measure('move 1 question to the top (500 questions)') as counter:
+            last.sequence = questions[0].sequence - 1
+        self.assertEqual(last.sl_no, 1)
+        self.assertEqual(questions[0].sl_no, 2)
+        self.assertLess(counter['queries'], 10, "A resequence should be renumbered with one query")
+
+        audit = self._create_audits(1, checklist)
+        self.env.cr.flush()
+        self.assertEqual(audit.question_line_ids.mapped('sl_no'), list(range(1, 501)))
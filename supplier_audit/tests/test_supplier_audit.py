@@ -0,0 +1,336 @@
+import base64
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+from ..tools.audit_export import XlsxExportWriter
+
+
+@tagged('post_install', '-at_install')
+class TestSupplierAudit(TransactionCase):
+    """Behaviour of the audit workflows on small fixtures. The timings of
+    the same workflows at scale are in test_performance."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.category = cls.env.ref('supplier_audit.category_management')
+        cls.supplier = cls.env['res.partner'].create({'name': 'Test Supplier', 'supplier_rank': 1})
+        cls.checklist = cls.env['audit.checklist'].create({
+            'name': 'Test Checklist',
+            'uploaded_excel_file': base64.b64encode(b'Question'),
+            'uploaded_file_name': 'test_checklist.csv',
+            'question_ids': [(0, 0, {
+                'name': 'Question %s' % index,
+                'evidence': 'Evidence %s' % index,
+                'category_id': cls.category.id,
+                'sequence': index,
+            }) for index in range(1, 4)],
+        })
+
+    def _create_audit(self, **vals):
+        return self.env['supplier.audit'].create(dict({
+            'partner_id': self.supplier.id,
+            'checklist_id': self.checklist.id,
+            'audit_date': fields.Date.today(),
+        }, **vals))
+
+    def _create_action(self, **vals):
+        return self.env['sa.corrective.action'].create(dict({
+            'description': 'Test action',
+            'partner_id': self.supplier.id,
+            'due_date': fields.Date.today() + timedelta(days=30),
+            'assigned_to': self.env.user.id,
+        }, **vals))
+
+    def _answer(self, audit, status='3'):
+        audit.question_line_ids.write({'state': 'answered', 'status': status})
+
+    def test_programme_reset(self):
+        suppliers = self.supplier | self.env['res.partner'].create({'name': 'Second Supplier'})
+        programme = self.env['supplier.audit.programme'].create({
+            'name': 'Test Programme',
+            'checklist_id': self.checklist.id,
+            'partner_domain': repr([('id', 'in', suppliers.ids)]),
+            'date_start': fields.Date.today(),
+            'date_end': fields.Date.today() + timedelta(days=60),
+        })
+        programme.action_generate()
+        self.assertEqual(programme.audit_ids.partner_id, suppliers)
+
+        programme.action_reset_to_draft()
+        self.assertEqual((programme.planned_count, programme.generated_count, programme.last_partner_id),
+                         (0, 0, 0))
+        # Audited suppliers are skipped when generating again
+        new_supplier = self.env['res.partner'].create({'name': 'Third Supplier'})
+        programme.partner_domain = repr([('id', 'in', (suppliers | new_supplier).ids)])
+        programme.action_generate()
+        self.assertEqual(programme.state, 'done')
+        self.assertEqual((programme.planned_count, programme.generated_count), (1, 1))
+        programme.invalidate_recordset(['audit_ids'])
+        self.assertEqual(programme.audit_ids.partner_id, suppliers | new_supplier)
+        new_audit = programme.audit_ids.filtered(lambda audit: audit.partner_id == new_supplier)
+        self.assertEqual(new_audit.audit_date, programme.date_start)
+
+    def test_import_merge(self):
+        checklist = self.env['audit.checklist'].create({
+            'name': 'Imported Checklist',
+            'uploaded_excel_file': base64.b64encode(b'Question'),
+            'uploaded_file_name': 'imported.csv',
+        })
+        header = ('Category', 'Question')
+
+        def rows(*names):
+            return [('Sheet1', [header] + [('Management', name) for name in names])]
+
+        result = checklist._merge_question_rows(rows('Q1', 'Q2', 'Q3'))
+        self.assertEqual(result['create'], 3)
+        self.env.cr.flush()
+        questions = checklist.question_ids
+        self.assertEqual(questions.mapped('name'), ['Q1', 'Q2', 'Q3'])
+        self.assertEqual(questions.mapped('sl_no'), [1, 2, 3])
+        self._create_audit(checklist_id=checklist.id)
+
+        # Preview only
+        result = checklist._merge_question_rows(rows('Q0', 'Q1', 'Q2'), apply=False)
+        self.assertEqual((result['create'], result['update'], result['archive']), (1, 2, 1))
+        self.assertEqual(checklist.question_ids, questions)
+
+        checklist._merge_question_rows(rows('Q0', 'Q1', 'Q2'))
+        self.env.cr.flush()
+        self.env.invalidate_all()
+        self.assertEqual(checklist.question_ids.mapped('name'), ['Q0', 'Q1', 'Q2'])
+        self.assertEqual(checklist.question_ids.mapped('sl_no'), [1, 2, 3])
+        # The frozen questions are moved in place, not copied
+        self.assertEqual(checklist.question_ids[1:], questions[:2])
+        self.assertFalse(questions[2].active)
+        self.assertEqual(questions[2].sl_no, 0)
+
+        result = checklist._merge_question_rows(rows('Q0', 'Q1', 'Q2'))
+        self.assertEqual(result['unchanged'], 3)
+
+    def test_question_lines_share_frozen_questions(self):
+        audit = self._create_audit()
+        questions = self.checklist.question_ids
+        self.assertEqual(audit.question_line_ids.question_id, questions)
+        # The lines store the answers only, their text is the question's
+        self.assertEqual(audit.question_line_ids.mapped('name'), questions.mapped('name'))
+        self.assertEqual(audit.question_line_ids.mapped('evidence'), questions.mapped('evidence'))
+        line_fields = self.env['supplier.audit.question.line']._fields
+        self.assertFalse(any(line_fields[name].store for name in ('name', 'evidence', 'scoring_criteria')))
+        self.assertEqual(audit.checklist_version_id.question_ids, questions)
+        self.assertEqual(self._create_audit().checklist_version_id, audit.checklist_version_id,
+                         "Audits of unchanged questions share their version")
+
+        # Copy-on-write: editing a frozen question creates a new question,
+        # the existing audits keep sharing the text they were created with
+        question = questions[0]
+        question.write({'name': 'Reworded question'})
+        self.env.invalidate_all()
+        self.assertFalse(question.active)
+        self.assertEqual(question.name, 'Question 1')
+        self.assertIn('Reworded question', self.checklist.question_ids.mapped('name'))
+        self.assertEqual(audit.question_line_ids[0].question_id, question)
+        self.assertEqual(audit.question_line_ids[0].name, 'Question 1')
+
+        new_audit = self._create_audit()
+        self.assertNotEqual(new_audit.checklist_version_id, audit.checklist_version_id)
+        self.assertIn('Reworded question', new_audit.question_line_ids.mapped('name'))
+        self.assertNotIn(question, new_audit.question_line_ids.question_id)
+
+        # Deleting a frozen question archives it
+        questions[1].unlink()
+        self.assertTrue(questions[1].exists())
+        self.assertFalse(questions[1].active)
+
+    def test_scorecard_refresh(self):
+        audit = self._create_audit()
+        audit.write({'state': 'in_progress'})
+        self._answer(audit)
+        audit.action_complete()
+        scorecard = self.env['supplier.audit.scorecard'].search([('partner_id', '=', self.supplier.id)])
+        self.assertFalse(scorecard, "Scorecards are refreshed before the commit")
+        self.env.cr.flush()
+        scorecard = self.env['supplier.audit.scorecard'].search([('partner_id', '=', self.supplier.id)])
+        self.assertEqual(scorecard.last_audit_id, audit)
+        self.assertEqual(scorecard.done_audit_count, 1)
+
+    def test_audit_report_cleanup(self):
+        audit = self._create_audit()
+        Attachment = self.env['ir.attachment']
+        reports = Attachment.create([{
+            'name': 'Supplier Audit - %s - %s.pdf' % (audit.name, stamp),
+            'raw': b'%PDF',
+            'res_model': 'supplier.audit',
+            'res_id': audit.id,
+        } for stamp in ('20260101000000', '20260102000000')])
+        upload = Attachment.create({
+            'name': 'Supplier Audit - scan.pdf',
+            'raw': b'%PDF',
+            'res_model': 'supplier.audit',
+            'res_id': audit.id,
+        })
+        self.env['report.supplier_audit.supplier_audit_report_template']._gc_audit_reports()
+        self.assertEqual((reports | upload).exists(), reports[1] | upload,
+                         "Only the newest report of the audit is kept")
+
+    def test_xlsx_export_sheet_rollover(self):
+        writer = XlsxExportWriter()
+        writer.max_rows = 3
+        writer.add_sheet('Questions', ['Question'])
+        writer.write_rows([[index] for index in range(5)])
+        writer.add_sheet('Findings', ['Finding'])
+        writer.write_rows([[1]])
+        writer.close().close()
+        self.assertEqual(writer.workbook.sheetnames,
+                         ['Questions', 'Questions (2)', 'Questions (3)', 'Findings'])
+
+    def test_queued_export_failure(self):
+        audit = self._create_audit()
+        Wizard = self.env['supplier.audit.export.wizard']
+        failing = Wizard.create({'audit_domain': repr([('no_such_field', '=', 1)]), 'state': 'queued'})
+        export = Wizard.create({'audit_ids': [(6, 0, audit.ids)], 'state': 'queued'})
+        Wizard._cron_export_audit_results()
+        self.assertEqual(failing.state, 'failed', "A failed export is not retried")
+        self.assertEqual(export.state, 'done', "The exports after a failed one still run")
+
+        # Queued exports are not vacuumed before the cron ran them
+        queued = Wizard.create({'audit_ids': [(6, 0, audit.ids)], 'state': 'queued'})
+        self.env.cr.execute("UPDATE supplier_audit_export_wizard SET write_date = write_date - interval '2 days'")
+        Wizard.invalidate_model()
+        Wizard._transient_clean_rows_older_than(3600)
+        self.assertEqual((failing | export | queued).exists(), queued)
+
+    def test_checklist_change(self):
+        audit = self._create_audit()
+        version = audit.checklist_version_id
+        audit.action_plan()
+        audit.action_start()
+        # Writing the same checklist keeps the version and the lines
+        lines = audit.question_line_ids
+        audit.write({'checklist_id': self.checklist.id})
+        self.assertEqual(audit.checklist_version_id, version)
+        self.assertEqual(audit.question_line_ids, lines)
+
+        other = self.env['audit.checklist'].create({
+            'name': 'Other Checklist',
+            'uploaded_excel_file': base64.b64encode(b'Question'),
+            'question_ids': [(0, 0, {'name': 'Other question', 'category_id': self.category.id})],
+        })
+        draft = self._create_audit()
+        draft.write({'checklist_id': other.id})
+        self.assertEqual(draft.checklist_version_id.checklist_id, other)
+        self.assertEqual(draft.question_line_ids.question_id, other.question_ids)
+
+    def test_escalation(self):
+        today = fields.Date.context_today(self.env['sa.corrective.action'])
+        due_soon = self._create_action(due_date=today + timedelta(days=1))
+        overdue = self._create_action(due_date=today - timedelta(days=1))
+        critical = self._create_action(due_date=today - timedelta(days=30))
+        later = self._create_action(due_date=today + timedelta(days=30))
+        done = self._create_action(due_date=today - timedelta(days=30), state='completed')
+        actions = due_soon | overdue | critical | later | done
+
+        self.env['sa.corrective.action']._cron_escalate_overdue_actions()
+        self.assertEqual(actions.mapped('escalation_level'), ['1', '2', '3', '0', '0'])
+        self.assertEqual(actions.mapped('priority'), ['1', '2', '3', '1', '1'])
+        self.assertEqual(len(actions.activity_ids), 3)
+        self.assertEqual(self.env['sa.corrective.action']._cron_escalate_overdue_actions(), 0,
+                         "Escalated actions are not escalated again")
+
+        # Actions without a priority are escalated too
+        cleared = self._create_action(due_date=today - timedelta(days=1), priority=False)
+        self.env['sa.corrective.action']._cron_escalate_overdue_actions()
+        self.assertEqual((cleared.escalation_level, cleared.priority), ('2', '2'))
+
+        # A new due date restarts the escalation
+        overdue.due_date = today + timedelta(days=10)
+        self.assertEqual(overdue.escalation_level, '0')
+
+    def test_bulk_transition(self):
+        draft = self._create_audit()
+        started = self._create_audit()
+        started.write({'state': 'in_progress'})
+        moved, skipped = (draft | started).bulk_transition('planned', note='Planned for Q3')
+        self.assertEqual((moved, skipped), (draft, started))
+        self.assertEqual(draft.state, 'planned')
+        self.assertEqual(started.state, 'in_progress')
+        self.assertIn('Planned for Q3', draft.message_ids[0].body)
+
+        # Audits with unanswered questions cannot be completed
+        answered = self._create_audit()
+        answered.write({'state': 'in_progress'})
+        self._answer(answered)
+        moved, skipped = (started | answered).bulk_transition('done')
+        self.assertEqual((moved, skipped), (answered, started))
+        self.assertEqual(answered.state, 'done')
+        self.assertTrue(answered.result)
+
+        action = self._create_action(audit_id=draft.id)
+        completed = self._create_action(audit_id=draft.id, state='completed')
+        moved, skipped = (action | completed).bulk_transition('planned')
+        self.assertEqual((moved, skipped), (action, completed))
+        self.assertEqual(action.state, 'planned')
+
+    def test_sequence_block(self):
+        names = self.env['ir.sequence']._next_block_by_code('audit.finding', 3)
+        self.assertEqual(len(set(names)), 3)
+        self.assertEqual(names, sorted(names))
+        audit = self._create_audit()
+        findings = self.env['audit.finding'].create([{
+            'audit_id': audit.id,
+            'description': 'Finding %s' % index,
+            'severity': 'minor',
+        } for index in range(3)])
+        self.assertEqual(len(set(findings.mapped('name'))), 3)
+        self.assertTrue(all(name > names[-1] for name in findings.mapped('name')))
+
+    def test_finding_rules(self):
+        rules = self.env['audit.finding.rule'].with_context(active_test=False).search([])
+        audit = self._create_audit()
+        self._answer(audit)
+        lines = audit.question_line_ids
+        lines[0].status = '0'
+        lines[1].status = '1'
+        self.assertFalse(self.env['audit.finding.rule']._apply_rules(audit),
+                         "The default rules are shipped inactive")
+
+        rules.active = True
+        findings = self.env['audit.finding.rule']._apply_rules(audit)
+        self.assertEqual(findings.question_line_id, lines[:2])
+        major = findings.filtered(lambda finding: finding.question_line_id == lines[0])
+        minor = findings - major
+        self.assertEqual((major.severity, minor.severity), ('major', 'minor'))
+        self.assertEqual(len(major.corrective_action_ids), 1)
+        self.assertFalse(minor.corrective_action_ids)
+        self.assertFalse(self.env['audit.finding.rule']._apply_rules(audit),
+                         "Questions with a finding are skipped")
+
+        # The backfill raises findings without corrective actions
+        done = self._create_audit()
+        self._answer(done, status='0')
+        done.state = 'done'
+        findings = self.env['audit.finding.rule']._cron_backfill_findings()
+        self.assertEqual(findings.audit_id, done)
+        self.assertFalse(findings.corrective_action_ids)
+
+    def test_serial_numbers(self):
+        questions = self.checklist.question_ids
+        audit = self._create_audit()
+        self.env.cr.flush()
+        self.assertEqual(questions.mapped('sl_no'), [1, 2, 3])
+        self.assertEqual(audit.question_line_ids.mapped('sl_no'), [1, 2, 3])
+
+        # Several moves in one transaction are numbered once, at the end
+        questions[2].sequence = 0
+        questions[0].sequence = 10
+        lines = audit.question_line_ids
+        lines[2].sequence = 0
+        self.env.cr.flush()
+        self.assertEqual(questions.mapped('sl_no'), [3, 2, 1])
+        self.assertEqual(lines.mapped('sl_no'), [2, 3, 1])
+
+        questions[1].active = False
+        self.env.cr.flush()
+        self.assertEqual(questions.mapped('sl_no'), [2, 0, 1])
@@ -0,0 +1,2 @@
+from . import checklist_import
+from . import audit_export
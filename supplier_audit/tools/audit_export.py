@@ -0,0 +1,102 @@
+"""Streaming writers for audit result exports.
+
+A writer receives sheets one after the other: ``add_sheet(name, header)``
+followed by any number of ``write_rows(rows)`` calls. Rows go straight to
+a temporary file so the export size is not bound by the worker memory.
+Like the checklist readers, the writers do not depend on the ORM.
+"""
+from io import TextIOWrapper
+import csv
+import tempfile
+import zipfile
+
+from openpyxl import Workbook
+
+
+# Rows of an XLSX worksheet, header included
+XLSX_MAX_ROWS = 1048576
+
+
+class XlsxExportWriter:
+    """Multi-sheet XLSX export, written with openpyxl's write-only mode.
+
+    A sheet longer than XLSX_MAX_ROWS continues on new sheets named
+    "Questions (2)", "Questions (3)"... with the same header.
+    """
+    extension = 'xlsx'
+    mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    max_rows = XLSX_MAX_ROWS
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self.name = None
+        self.header = None
+        self.part = 0
+        self.row_count = 0
+
+    def add_sheet(self, name, header):
+        self.name = name
+        self.header = header
+        self.part = 0
+        self._new_sheet()
+
+    def _new_sheet(self):
+        self.part += 1
+        suffix = ' (%s)' % self.part if self.part > 1 else ''
+        self.sheet = self.workbook.create_sheet(title=self.name[:31 - len(suffix)] + suffix)
+        self.sheet.append(self.header)
+        self.row_count = 1
+
+    def write_rows(self, rows):
+        for row in rows:
+            if self.row_count >= self.max_rows:
+                self._new_sheet()
+            self.sheet.append(row)
+            self.row_count += 1
+
+    def close(self):
+        """Return the exported file, positioned at its start."""
+        self.workbook.save(self.file)
+        self.file.seek(0)
+        return self.file
+
+
+class CsvExportWriter:
+    """Zip archive holding one CSV file per sheet."""
+    extension = 'zip'
+    mimetype = 'application/zip'
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.archive = zipfile.ZipFile(self.file, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.stream = None
+        self.writer = None
+
+    def _close_sheet(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+    def add_sheet(self, name, header):
+        self._close_sheet()
+        entry = self.archive.open('%s.csv' % name, 'w', force_zip64=True)
+        self.stream = TextIOWrapper(entry, encoding='utf-8', newline='')
+        self.writer = csv.writer(self.stream)
+        self.writer.writerow(header)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self._close_sheet()
+        self.archive.close()
+        self.file.seek(0)
+        return self.file
+
+
+WRITERS = {
+    'xlsx': XlsxExportWriter,
+    'csv': CsvExportWriter,
+}
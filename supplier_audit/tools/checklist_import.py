@@ -0,0 +1,188 @@
+"""Streaming readers for checklist question files.
+
+Every reader takes the raw file content and yields ``(sheet_name, rows)``
+pairs, ``rows`` being an iterator of tuples of cell values. The readers do
+not depend on the ORM so they can be benchmarked on their own (see
+``benchmarks/bench_checklist_import.py``).
+"""
+from io import BytesIO, TextIOWrapper
+from xml.etree import ElementTree
+import csv
+import hashlib
+import os
+import zipfile
+
+from openpyxl import load_workbook
+
+# Normalization map (optional use if category is found)
+CATEGORY_NORMALIZATION = {
+    'management': 'Management',
+    'manufacturing': 'Manufacturing',
+    'production readiness': 'Production Readiness',
+    'production': 'Production Readiness',
+    'quality': 'Quality Assurance & Process',
+    'quality assurance': 'Quality Assurance & Process',
+    'qa': 'Quality Assurance & Process',
+}
+
+# Question field -> accepted (lowercase) column headers
+QUESTION_COLUMNS = {
+    'name': ['question'],
+    'evidence': ['evidence required'],
+    'scoring_criteria': ['scoring criteria'],
+    'status': ['status'],
+    'observation': ['observation'],
+    'action': ['action'],
+    'category': ['category', 'category_id'],
+}
+
+
+def detect_header_columns(row):
+    """Return the question field -> column index mapping of a header row.
+
+    Returns None when the row is not a header row (no 'Question' column).
+    """
+    lower_row = [str(cell).strip().lower() if cell else '' for cell in row or ()]
+    if 'question' not in lower_row:
+        return None
+    headers = {}
+    for idx, cell in enumerate(lower_row):
+        if cell and cell not in headers:
+            headers[cell] = idx
+    columns = {}
+    for field_name, names in QUESTION_COLUMNS.items():
+        for name in names:
+            if name in headers:
+                columns[field_name] = headers[name]
+                break
+    return columns
+
+
+def cell_value(row, idx):
+    if idx is None or idx >= len(row) or row[idx] is None:
+        return ''
+    return str(row[idx]).strip()
+
+
+def normalize_category(name):
+    """Return the lowercase category name an imported category maps to."""
+    name = name.strip().lower()
+    return CATEGORY_NORMALIZATION.get(name, name).lower()
+
+
+def question_key(name, category_id):
+    """Return the stable key of a question: a hash of its normalized text
+    (case and whitespace insensitive) and category."""
+    text = ' '.join((name or '').lower().split())
+    return hashlib.sha1(('%s|%s' % (category_id or 0, text)).encode('utf-8')).hexdigest()
+
+
+def read_xlsx(data):
+    workbook = load_workbook(filename=BytesIO(data), read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            yield sheet.title, sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_csv(data):
+    text = TextIOWrapper(BytesIO(data), encoding='utf-8-sig', newline='')
+    try:
+        dialect = csv.Sniffer().sniff(text.read(8192), delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    text.seek(0)
+    yield 'CSV', csv.reader(text, dialect)
+
+
+_TABLE_NS = '{urn:oasis:names:tc:opendocument:xmlns:table:1.0}'
+_OFFICE_NS = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}'
+_TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+_ODS_TABLE = _TABLE_NS + 'table'
+_ODS_ROW = _TABLE_NS + 'table-row'
+_ODS_CELLS = (_TABLE_NS + 'table-cell', _TABLE_NS + 'covered-table-cell')
+_ODS_VALUE_ATTRIBUTES = [_OFFICE_NS + name for name in (
+    'value', 'date-value', 'time-value', 'boolean-value', 'string-value')]
+# Spreadsheets pad sheets with huge runs of repeated empty rows and cells
+_ODS_MAX_EMPTY_REPEAT = 1000
+
+
+def _ods_cell_value(cell):
+    if cell.get(_OFFICE_NS + 'value-type') is None:
+        return None
+    for attribute in _ODS_VALUE_ATTRIBUTES:
+        value = cell.get(attribute)
+        if value is not None:
+            return value
+    return '\n'.join(''.join(p.itertext()) for p in cell.iter(_TEXT_NS + 'p'))
+
+
+def _iter_ods_rows(events, stack):
+    row = None
+    for event, elem in events:
+        if event == 'start':
+            stack.append(elem)
+            if elem.tag == _ODS_ROW:
+                row = []
+            continue
+        stack.pop()
+        if elem.tag in _ODS_CELLS:
+            value = _ods_cell_value(elem)
+            repeat = int(elem.get(_TABLE_NS + 'number-columns-repeated', 1))
+            if value is None:
+                repeat = min(repeat, _ODS_MAX_EMPTY_REPEAT)
+            row.extend([value] * repeat)
+        elif elem.tag == _ODS_ROW:
+            while row and row[-1] is None:
+                row.pop()
+            repeat = int(elem.get(_TABLE_NS + 'number-rows-repeated', 1))
+            if not row and repeat > _ODS_MAX_EMPTY_REPEAT:
+                repeat = 0
+            values = tuple(row)
+            for _i in range(repeat):
+                yield values
+            row = None
+        elif elem.tag == _ODS_TABLE:
+            return
+        else:
+            continue
+        # Drop the parsed element so the tree never holds the whole sheet
+        stack[-1].remove(elem)
+
+
+def read_ods(data):
+    with zipfile.ZipFile(BytesIO(data)) as archive, archive.open('content.xml') as content:
+        events = ElementTree.iterparse(content, events=('start', 'end'))
+        stack = []
+        for event, elem in events:
+            if event == 'end':
+                stack.pop()
+                continue
+            stack.append(elem)
+            if elem.tag == _ODS_TABLE:
+                rows = _iter_ods_rows(events, stack)
+                yield elem.get(_TABLE_NS + 'name'), rows
+                # Skip whatever the consumer left of the sheet
+                for _row in rows:
+                    pass
+
+
+READERS = {
+    'xlsx': read_xlsx,
+    'xlsm': read_xlsx,
+    'csv': read_csv,
+    'txt': read_csv,
+    'ods': read_ods,
+}
+
+
+def get_reader(filename):
+    """Return the reader matching the extension of ``filename``.
+
+    Files without a name are read as xlsx; unknown extensions return None.
+    """
+    extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+    if not extension:
+        return read_xlsx
+    return READERS.get(extension)
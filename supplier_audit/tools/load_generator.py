@@ -0,0 +1,148 @@
+"""Synthetic data for load tests and benchmarks.
+
+Creates checklists, suppliers and audits with realistic answer, finding
+and corrective action distributions through the ORM, so the generated
+data goes through the same code as user input. The generation is seeded
+and therefore reproducible. From an Odoo shell::
+
+    from odoo.addons.supplier_audit.tools.load_generator import LoadGenerator
+    LoadGenerator(env, seed=42).generate(checklists=5, suppliers=200, audits=2000)
+    env.cr.commit()
+"""
+from datetime import date, timedelta
+from io import BytesIO
+import base64
+import random
+
+from openpyxl import Workbook
+
+# Share of the question answers per score; scores 0/1 are rare, 3 is the norm
+SCORE_WEIGHTS = {'0': 2, '1': 8, '2': 30, '3': 60}
+# Share of the questions marked not applicable
+NOT_APPLICABLE_RATIO = 0.05
+# Finding severity per low score
+FINDING_SEVERITIES = {'0': 'critical', '1': 'major', '2': 'minor'}
+# Share of the findings getting a corrective action
+ACTION_RATIO = 0.8
+ACTION_STATES = ['draft', 'planned', 'in_progress', 'review', 'completed', 'completed', 'completed']
+
+QUESTION_TOPICS = [
+    'documented procedure', 'training records', 'calibration', 'traceability', 'supplier control',
+    'change management', 'internal audits', 'non-conformance handling', 'preventive maintenance',
+    'process capability', 'packaging and labelling', 'management review',
+]
+
+
+class LoadGenerator:
+
+    def __init__(self, env, seed=0, batch_size=100):
+        self.env = env
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+
+    def question_rows(self, count):
+        """Rows of a checklist question file (header row included)."""
+        categories = self.env['audit.question.category'].search([]).mapped('name')
+        rows = [['Category', 'Question', 'Evidence Required', 'Scoring Criteria']]
+        for index in range(count):
+            topic = self.random.choice(QUESTION_TOPICS)
+            rows.append([
+                categories[index % len(categories)],
+                'Q%s: Is the %s in place, implemented and reviewed at planned intervals?' % (index + 1, topic),
+                'Records demonstrating the %s' % topic,
+                '0 = missing, 1 = partial, 2 = implemented, 3 = effective',
+            ])
+        return rows
+
+    def question_file(self, count):
+        """Base64 XLSX checklist file of ``count`` questions."""
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Checklist')
+        for row in self.question_rows(count):
+            sheet.append(row)
+        content = BytesIO()
+        workbook.save(content)
+        return base64.b64encode(content.getvalue())
+
+    def generate_checklists(self, count, questions=100):
+        """Create checklists through the question file upload."""
+        checklists = self.env['audit.checklist'].create([{
+            'name': 'Load Checklist %s' % (index + 1),
+            'code': 'LOAD-%s' % (index + 1),
+            'uploaded_excel_file': self.question_file(questions),
+            'uploaded_file_name': 'load_checklist_%s.xlsx' % (index + 1),
+        } for index in range(count)])
+        for checklist in checklists:
+            checklist.action_apply_question_import()
+        return checklists
+
+    def generate_suppliers(self, count):
+        return self.env['res.partner'].create([{
+            'name': 'Load Supplier %s' % (index + 1),
+            'is_company': True,
+            'supplier_rank': 1,
+        } for index in range(count)])
+
+    def answer_lines(self, lines):
+        """Answer question lines, grouping the writes per answer."""
+        scores = list(SCORE_WEIGHTS)
+        weights = list(SCORE_WEIGHTS.values())
+        answers = {}
+        for line in lines:
+            if self.random.random() < NOT_APPLICABLE_RATIO:
+                answers.setdefault(('na', False), []).append(line.id)
+            else:
+                answers.setdefault(('answered', self.random.choices(scores, weights)[0]), []).append(line.id)
+        for (state, status), line_ids in answers.items():
+            lines.browse(line_ids).write({'state': state, 'status': status})
+
+    def generate_findings(self, audits):
+        """Raise findings on the low scored lines, with corrective actions."""
+        finding_vals = []
+        for audit in audits:
+            for line in audit.question_line_ids:
+                if line.state == 'answered' and line.status in FINDING_SEVERITIES:
+                    finding_vals.append({
+                        'audit_id': audit.id,
+                        'question_line_id': line.id,
+                        'severity': FINDING_SEVERITIES[line.status],
+                        'description': 'Gap found on: %s' % line.name,
+                        'finding_date': audit.audit_date,
+                    })
+        findings = self.env['audit.finding'].create(finding_vals)
+
+        user = self.env.user
+        self.env['sa.corrective.action'].create([{
+            'description': 'Close the gap: %s' % finding.description,
+            'finding_id': finding.id,
+            'audit_id': finding.audit_id.id,
+            'partner_id': finding.partner_id.id,
+            'state': self.random.choice(ACTION_STATES),
+            'due_date': finding.finding_date + timedelta(days=self.random.randint(15, 90)),
+            'assigned_to': user.id,
+        } for finding in findings if self.random.random() < ACTION_RATIO])
+        return findings
+
+    def generate_audits(self, count, checklists, suppliers, days=730, complete_ratio=0.6):
+        """Create audits spread over the last ``days`` days; a share of them
+        is answered, gets findings and is completed."""
+        today = date.today()
+        audits = self.env['supplier.audit']
+        for offset in range(0, count, self.batch_size):
+            batch = self.env['supplier.audit'].create([{
+                'partner_id': self.random.choice(suppliers).id,
+                'checklist_id': self.random.choice(checklists).id,
+                'audit_date': today - timedelta(days=self.random.randint(0, days)),
+            } for index in range(offset, min(offset + self.batch_size, count))])
+            done = batch.filtered(lambda audit: self.random.random() < complete_ratio)
+            self.answer_lines(done.question_line_ids)
+            self.generate_findings(done)
+            for audit in done:
+                audit.action_complete()
+            audits |= batch
+        return audits
+
+    def generate(self, checklists=2, questions=100, suppliers=50, audits=200):
+        checklist_records = self.generate_checklists(checklists, questions)
+        supplier_records = self.generate_suppliers(suppliers)
+        return self.generate_audits(audits, checklist_records, supplier_records)
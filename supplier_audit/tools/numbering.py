@@ -0,0 +1,65 @@
+"""Serial numbering of ordered child rows.
+
+``renumber`` numbers the rows of the given parents 1, 2, 3... in their
+display order with a single ``ROW_NUMBER()`` window query and only
+updates the rows whose number changed. ``renumber_later`` queues the
+parents instead, and renumbers each of them once before the transaction
+is committed, so resequencing or importing k rows one write at a time
+costs one window query per parent rather than k.
+"""
+import functools
+
+# Precommit data key of the queued parents: {model name: set of parent ids}
+RENUMBER_PRECOMMIT_KEY = 'supplier_audit.renumber'
+
+
+def renumber(env, model_name, parent_field, parent_ids, field_name='sl_no', order='sequence, id',
+             numbered_where='TRUE'):
+    """Number the rows of ``model_name`` per ``parent_field`` among
+    ``parent_ids``. Rows not matching the SQL condition ``numbered_where``
+    (e.g. archived rows) get 0 and do not use a number.
+
+    Returns the ids of the updated rows.
+    """
+    parent_ids = [parent_id for parent_id in parent_ids if parent_id]
+    if not parent_ids:
+        return []
+    model = env[model_name]
+    model.flush_model([parent_field, field_name] + [term.split()[0] for term in order.split(',')])
+    table = model._table
+    env.cr.execute("""
+        UPDATE {table} AS target
+           SET {field} = numbered.number
+          FROM (SELECT id,
+                       CASE WHEN {where}
+                            THEN ROW_NUMBER() OVER (PARTITION BY {parent}, ({where}) ORDER BY {order})
+                            ELSE 0 END AS number
+                  FROM {table}
+                 WHERE {parent} = ANY(%s)) AS numbered
+         WHERE target.id = numbered.id
+           AND target.{field} IS DISTINCT FROM numbered.number
+     RETURNING target.id
+    """.format(table=table, field=field_name, parent=parent_field, order=order, where=numbered_where),
+        [list(parent_ids)])
+    updated_ids = [row[0] for row in env.cr.fetchall()]
+    model.browse(updated_ids).invalidate_recordset([field_name])
+    return updated_ids
+
+
+def renumber_later(model, parent_ids):
+    """Queue ``parent_ids`` for the renumbering of their ``model`` rows,
+    done once per parent by ``model._renumber_parents(parent_ids)`` before
+    the transaction is committed."""
+    env = model.env
+    data = env.cr.precommit.data
+    if RENUMBER_PRECOMMIT_KEY not in data:
+        data[RENUMBER_PRECOMMIT_KEY] = {}
+        env.cr.precommit.add(functools.partial(_renumber_queued, env))
+    data[RENUMBER_PRECOMMIT_KEY].setdefault(model._name, set()).update(
+        parent_id for parent_id in parent_ids if parent_id)
+
+
+def _renumber_queued(env):
+    queued = env.cr.precommit.data.pop(RENUMBER_PRECOMMIT_KEY, {})
+    for model_name, parent_ids in queued.items():
+        env[model_name]._renumber_parents(sorted(parent_ids))
@@ -0,0 +1,78 @@
+"""Opt-in profiling of the module entry points.
+
+Methods decorated with ``profiled`` log their SQL query count, wall time
+and the recomputations they queue into ``supplier.audit.profile.log``
+when profiling is enabled, either for the whole database with the
+``supplier_audit.profiling`` system parameter or for one call with the
+``supplier_audit_profile`` context key. Disabled, the decorator only
+costs a context and parameter lookup.
+"""
+import functools
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+PROFILING_PARAM = 'supplier_audit.profiling'
+PROFILING_CONTEXT_KEY = 'supplier_audit_profile'
+
+
+def is_profiling_enabled(env):
+    if env.context.get(PROFILING_CONTEXT_KEY):
+        return True
+    return env['ir.config_parameter'].sudo().get_param(PROFILING_PARAM) in ('1', 'True', 'true')
+
+
+def _pending_recomputes(env):
+    return sum(len(ids) for ids in env.transaction.tocompute.values())
+
+
+def _log_call(cr, values):
+    cr.execute("""
+        INSERT INTO supplier_audit_profile_log
+                    (entry_point, model, record_count, query_count, duration_ms, recompute_count, failed,
+                     create_uid, create_date, write_uid, write_date)
+             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC')
+    """, values)
+
+
+def profiled(method):
+    """Log the query count, wall time and queued recomputations of the
+    decorated model method when profiling is enabled.
+
+    Apply it below the ``api`` decorators, and not on compute methods:
+    the pending computations are flushed before the call so that its
+    queries are attributed to it. Failed calls are logged on a separate
+    cursor, as their transaction is rolled back.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        env = self.env
+        if not is_profiling_enabled(env):
+            return method(self, *args, **kwargs)
+        env.flush_all()
+        cr = env.cr
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        recomputes = 0
+        failed = True
+        try:
+            result = method(self, *args, **kwargs)
+            recomputes = _pending_recomputes(env)
+            env.flush_all()
+            failed = False
+            return result
+        finally:
+            values = ['%s.%s' % (self._name, method.__name__), self._name, len(self),
+                      cr.sql_log_count - queries, (time.perf_counter() - start) * 1000, recomputes, failed,
+                      env.uid, env.uid]
+            if failed:
+                # Never hide the exception of the call
+                try:
+                    with env.registry.cursor() as log_cr:
+                        _log_call(log_cr, values)
+                except Exception:
+                    _logger.warning("Could not log the failed call of %s", values[0], exc_info=True)
+            else:
+                _log_call(cr, values)
+    return wrapper
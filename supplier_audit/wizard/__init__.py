@@ -0,0 +1,4 @@
+from . import audit_programme_wizard
+from . import checklist_import_preview
+from . import audit_export
+from . import bulk_transition
@@ -0,0 +1,301 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools.safe_eval import safe_eval
+from datetime import timedelta
+from markupsafe import Markup
+import logging
+import threading
+
+from ..tools.audit_export import WRITERS
+
+_logger = logging.getLogger(__name__)
+
+# Rows read per query while exporting
+EXPORT_CHUNK_SIZE = 5000
+# Marks the attachments of the queued exports, garbage collected
+EXPORT_ATTACHMENT_DESCRIPTION = 'supplier_audit.export'
+EXPORT_RETENTION_DAYS = 7
+
+# Export sheets: (sheet name, header, SQL query). Each query takes the
+# audit ids, the last exported id and the chunk size, and returns the
+# row id first so the sheets are read by keyset pagination.
+EXPORT_SHEETS = [
+    ('Audits', [
+        'Reference', 'Supplier', 'Audit Date', 'End Date', 'Status', 'Result', 'Lead Auditor', 'Checklist',
+        'Checklist Version', 'Compliance Score (%)', 'Completion Rate (%)', 'Questions', 'Completed Questions',
+        'Critical Findings', 'Major Findings', 'Minor Findings', 'Open Actions',
+    ], """
+        SELECT a.id, a.name, p.name, a.audit_date, a.end_date, a.state, a.result, up.name, c.name,
+               v.name, ROUND((a.compliance_score * 100)::numeric, 1), ROUND(a.completion_rate::numeric, 1),
+               a.total_questions, a.completed_questions,
+               a.critical_findings, a.major_findings, a.minor_findings, a.open_actions
+          FROM supplier_audit a
+     LEFT JOIN res_partner p ON p.id = a.partner_id
+     LEFT JOIN res_users u ON u.id = a.auditor_id
+     LEFT JOIN res_partner up ON up.id = u.partner_id
+     LEFT JOIN audit_checklist c ON c.id = a.checklist_id
+     LEFT JOIN audit_checklist_version v ON v.id = a.checklist_version_id
+         WHERE a.id = ANY(%s) AND a.id > %s
+      ORDER BY a.id
+         LIMIT %s
+    """),
+    ('Category Scores', [
+        'Audit', 'Category', 'Questions', 'Answered', 'Score', 'Max Score', 'Score (%)',
+    ], """
+        SELECT s.id, a.name, cat.name, s.question_count, s.answered_count, s.total_score, s.max_score,
+               ROUND(s.percentage::numeric, 1)
+          FROM supplier_audit_category_score s
+          JOIN supplier_audit a ON a.id = s.audit_id
+     LEFT JOIN audit_question_category cat ON cat.id = s.category_id
+         WHERE s.audit_id = ANY(%s) AND s.id > %s
+      ORDER BY s.id
+         LIMIT %s
+    """),
+    ('Questions', [
+        'Audit', 'Category', 'Question', 'Status', 'Score', 'Observation', 'Action', 'Evidence',
+    ], """
+        SELECT l.id, a.name, cat.name, q.name, l.state, l.status, l.observation, l.action, q.evidence
+          FROM supplier_audit_question_line l
+          JOIN supplier_audit a ON a.id = l.audit_id
+          JOIN audit_checklist_question q ON q.id = l.question_id
+     LEFT JOIN audit_question_category cat ON cat.id = l.category_id
+         WHERE l.audit_id = ANY(%s) AND l.id > %s
+      ORDER BY l.id
+         LIMIT %s
+    """),
+    ('Findings', [
+        'Reference', 'Audit', 'Category', 'Severity', 'Status', 'Finding Date', 'Due Date', 'Description',
+        'Root Cause',
+    ], """
+        SELECT f.id, f.name, a.name, cat.name, f.severity, f.state, f.finding_date, f.due_date, f.description,
+               f.root_cause
+          FROM audit_finding f
+          JOIN supplier_audit a ON a.id = f.audit_id
+     LEFT JOIN audit_question_category cat ON cat.id = f.category_id
+         WHERE f.audit_id = ANY(%s) AND f.id > %s
+      ORDER BY f.id
+         LIMIT %s
+    """),
+    ('Corrective Actions', [
+        'Reference', 'Audit', 'Finding', 'Type', 'Status', 'Priority', 'Due Date', 'Completion Date',
+        'Assigned To', 'Description',
+    ], """
+        SELECT ca.id, ca.name, a.name, f.name, ca.action_type, ca.state, ca.priority, ca.due_date,
+               ca.completion_date, up.name, ca.description
+          FROM sa_corrective_action ca
+          JOIN supplier_audit a ON a.id = ca.audit_id
+     LEFT JOIN audit_finding f ON f.id = ca.finding_id
+     LEFT JOIN res_users u ON u.id = ca.assigned_to
+     LEFT JOIN res_partner up ON up.id = u.partner_id
+         WHERE ca.audit_id = ANY(%s) AND ca.id > %s
+      ORDER BY ca.id
+         LIMIT %s
+    """),
+]
+
+# Selection columns of the sheets: sheet name -> {column index: (model, field)}
+EXPORT_SELECTIONS = {
+    'Audits': {4: ('supplier.audit', 'state'), 5: ('supplier.audit', 'result')},
+    'Questions': {3: ('supplier.audit.question.line', 'state')},
+    'Findings': {3: ('audit.finding', 'severity'), 4: ('audit.finding', 'state')},
+    'Corrective Actions': {3: ('sa.corrective.action', 'action_type'), 4: ('sa.corrective.action', 'state'),
+                           5: ('sa.corrective.action', 'priority')},
+}
+
+
+class SupplierAuditExportWizard(models.TransientModel):
+    _name = 'supplier.audit.export.wizard'
+    _description = 'Export Supplier Audit Results'
+    # Queued exports are kept until the export cron ran them, see
+    # _transient_clean_rows_older_than()
+    _transient_max_hours = 24.0
+
+    audit_ids = fields.Many2many('supplier.audit', string='Audits')
+    audit_domain = fields.Char('Audit Domain')
+    audit_count = fields.Integer('Audits', compute='_compute_audit_count')
+    file_format = fields.Selection([
+        ('xlsx', 'Excel (one sheet per table)'),
+        ('csv', 'CSV (zip with one file per table)'),
+    ], string='Format', required=True, default='xlsx')
+    include_questions = fields.Boolean('Question Answers', default=True)
+    include_findings = fields.Boolean('Findings', default=True)
+    include_actions = fields.Boolean('Corrective Actions', default=True)
+    state = fields.Selection([
+        ('choose', 'Choose'),
+        ('queued', 'Queued'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], default='choose')
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        context = self.env.context
+        if context.get('active_model') == 'supplier.audit':
+            # "Select all" in the list view exports the whole domain
+            if context.get('active_domain') is not None:
+                res['audit_domain'] = repr(context['active_domain'])
+            elif context.get('active_ids'):
+                res['audit_ids'] = [(6, 0, context['active_ids'])]
+        return res
+
+    def _get_audit_ids(self):
+        self.ensure_one()
+        if self.audit_domain:
+            return self.env['supplier.audit'].search(safe_eval(self.audit_domain), order='id').ids
+        return sorted(self.audit_ids.ids)
+
+    @api.depends('audit_ids', 'audit_domain')
+    def _compute_audit_count(self):
+        for wizard in self:
+            if wizard.audit_domain:
+                wizard.audit_count = self.env['supplier.audit'].search_count(safe_eval(wizard.audit_domain))
+            else:
+                wizard.audit_count = len(wizard.audit_ids)
+
+    def _get_export_sheets(self):
+        skipped = set()
+        if not self.include_questions:
+            skipped.add('Questions')
+        if not self.include_findings:
+            skipped.add('Findings')
+        if not self.include_actions:
+            skipped.add('Corrective Actions')
+        return [sheet for sheet in EXPORT_SHEETS if sheet[0] not in skipped]
+
+    def _read_sheet_rows(self, query, audit_ids, selections):
+        """Yield the rows of a sheet, reading them by chunks of
+        EXPORT_CHUNK_SIZE after the last exported id."""
+        labels = {
+            index: dict(self.env[model]._fields[field_name]._description_selection(self.env))
+            for index, (model, field_name) in selections.items()
+        }
+        last_id = 0
+        while True:
+            self.env.cr.execute(query, [audit_ids, last_id, EXPORT_CHUNK_SIZE])
+            rows = self.env.cr.fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            for row in rows:
+                row = list(row[1:])
+                for index, selection in labels.items():
+                    row[index] = selection.get(row[index], row[index])
+                yield row
+
+    @api.model
+    def _get_sync_limit(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('supplier_audit.export_sync_limit', 1000))
+
+    def _get_export_file_name(self):
+        self.ensure_one()
+        return 'supplier_audits.%s' % WRITERS[self.file_format].extension
+
+    def _export_file(self):
+        """Write the export to a temporary file.
+
+        Returns the file, positioned at its start, and its writer.
+        """
+        self.ensure_one()
+        audit_ids = self._get_audit_ids()
+        self.env.flush_all()
+        writer = WRITERS[self.file_format]()
+        for sheet_name, header, query in self._get_export_sheets():
+            writer.add_sheet(sheet_name, header)
+            writer.write_rows(self._read_sheet_rows(query, audit_ids, EXPORT_SELECTIONS.get(sheet_name, {})))
+        _logger.info("Exported the results of %s audits", len(audit_ids))
+        return writer.close(), writer
+
+    def action_export(self):
+        """Download the export, streamed by the export controller. Exports
+        of more than ``supplier_audit.export_sync_limit`` audits are queued
+        for the export cron instead, which sends them to the user."""
+        self.ensure_one()
+        if not self.audit_count:
+            raise UserError(_("There are no audits to export."))
+        if self.audit_count > self._get_sync_limit():
+            self.state = 'queued'
+            self.env.ref('supplier_audit.ir_cron_export_audit_results')._trigger()
+            return {
+                'name': _('Export Audit Results'),
+                'type': 'ir.actions.act_window',
+                'res_model': self._name,
+                'view_mode': 'form',
+                'res_id': self.id,
+                'target': 'new',
+            }
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/supplier_audit/export/%s' % self.id,
+            'target': 'self',
+        }
+
+    def _send_export(self):
+        """Run the queued export and send it to the user who requested it."""
+        self.ensure_one()
+        export_file, writer = self._export_file()
+        with export_file:
+            attachment = self.env['ir.attachment'].create({
+                'name': self._get_export_file_name(),
+                'type': 'binary',
+                'raw': export_file.read(),
+                'mimetype': writer.mimetype,
+                'res_model': 'supplier.audit',
+                'description': EXPORT_ATTACHMENT_DESCRIPTION,
+            })
+        self.env['supplier.audit'].message_notify(
+            partner_ids=self.env.user.partner_id.ids,
+            subject=_('Export Audit Results'),
+            body=Markup('<p>%s <a href="/web/content/%s?download=true">%s</a></p>') % (
+                _('The export of %s audits is ready:') % self.audit_count, attachment.id, attachment.name),
+        )
+        self.state = 'done'
+
+    def _notify_export_failure(self):
+        """Mark the queued export as failed and tell the user who requested it."""
+        self.ensure_one()
+        self.state = 'failed'
+        self.env['supplier.audit'].message_notify(
+            partner_ids=self.create_uid.partner_id.ids,
+            subject=_('Export Audit Results'),
+            body=Markup('<p>%s</p>') % _(
+                'The export of the audit results failed. Please try again or contact your administrator.'),
+        )
+
+    @api.model
+    def _cron_export_audit_results(self):
+        """Run the queued exports, as the user who requested them. A failed
+        export is reported to its user and not retried, the next exports
+        still run."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        for wizard in self.search([('state', '=', 'queued')], order='id'):
+            try:
+                with self.env.cr.savepoint():
+                    wizard.with_user(wizard.create_uid)._send_export()
+            except Exception:
+                _logger.exception("Export %s of the audit results failed", wizard.id)
+                wizard._notify_export_failure()
+            if auto_commit:
+                self.env.cr.commit()
+
+    def _transient_clean_rows_older_than(self, seconds):
+        """Same as the standard vacuum, except for the queued exports the
+        export cron did not run yet."""
+        seconds = max(seconds, 300)
+        self.env.cr.execute("""
+            SELECT id FROM supplier_audit_export_wizard
+             WHERE state IS DISTINCT FROM 'queued'
+               AND COALESCE(write_date, create_date, (now() AT TIME ZONE 'UTC'))::timestamp
+                   < (now() AT TIME ZONE 'UTC') - interval %s
+        """, ['%s seconds' % seconds])
+        self.sudo().browse([row[0] for row in self.env.cr.fetchall()]).unlink()
+
+    @api.autovacuum
+    def _gc_export_files(self):
+        """Remove the files of the queued exports after a week."""
+        self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', 'supplier.audit'),
+            ('res_id', '=', False),
+            ('description', '=', EXPORT_ATTACHMENT_DESCRIPTION),
+            ('create_date', '<', fields.Datetime.now() - timedelta(days=EXPORT_RETENTION_DAYS)),
+        ]).unlink()
@@ -0,0 +1,54 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools.safe_eval import safe_eval
+
+
+class SupplierAuditProgrammeWizard(models.TransientModel):
+    _name = 'supplier.audit.programme.wizard'
+    _description = 'Plan Supplier Audit Programme'
+
+    name = fields.Char('Programme Name', required=True)
+    checklist_id = fields.Many2one('audit.checklist', string='Audit Checklist', required=True)
+    partner_domain = fields.Char('Supplier Domain', required=True,
+                                 default="[('supplier_rank', '>', 0)]")
+    partner_count = fields.Integer('Suppliers', compute='_compute_partner_count')
+    date_start = fields.Date('Start Date', required=True, default=fields.Date.context_today)
+    date_end = fields.Date('End Date', required=True)
+    auditor_id = fields.Many2one('res.users', string='Lead Auditor',
+                                 required=True, default=lambda self: self.env.user)
+    run_in_background = fields.Boolean(
+        'Run in Background', default=True,
+        help="Generate the audits with a scheduled action, one transaction per chunk of suppliers.")
+
+    @api.depends('partner_domain')
+    def _compute_partner_count(self):
+        for wizard in self:
+            try:
+                domain = safe_eval(wizard.partner_domain or '[]')
+                wizard.partner_count = self.env['res.partner'].search_count(domain)
+            except Exception:
+                wizard.partner_count = 0
+
+    def action_generate_audits(self):
+        self.ensure_one()
+        if self.date_end < self.date_start:
+            raise UserError(_("The end date of the programme must be after its start date."))
+        programme = self.env['supplier.audit.programme'].create({
+            'name': self.name,
+            'checklist_id': self.checklist_id.id,
+            'partner_domain': self.partner_domain,
+            'date_start': self.date_start,
+            'date_end': self.date_end,
+            'auditor_id': self.auditor_id.id,
+        })
+        if self.run_in_background:
+            programme.action_schedule()
+        else:
+            programme.action_generate()
+        return {
+            'name': _('Audit Programme'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'supplier.audit.programme',
+            'view_mode': 'form',
+            'res_id': programme.id,
+        }
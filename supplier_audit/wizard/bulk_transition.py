@@ -0,0 +1,75 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+# Models the wizard can change the status of, with their state field
+TRANSITION_MODELS = {
+    'supplier.audit': 'audit_state',
+    'sa.corrective.action': 'action_state',
+}
+
+
+class SupplierAuditBulkTransitionWizard(models.TransientModel):
+    _name = 'supplier.audit.bulk.transition.wizard'
+    _description = 'Bulk Status Change of Audits and Corrective Actions'
+
+    res_model = fields.Selection([
+        ('supplier.audit', 'Audits'),
+        ('sa.corrective.action', 'Corrective Actions'),
+    ], string='Records', required=True, readonly=True)
+    audit_ids = fields.Many2many('supplier.audit', string='Audits')
+    action_ids = fields.Many2many('sa.corrective.action', string='Corrective Actions')
+    record_count = fields.Integer('Selected Records', compute='_compute_record_count')
+    audit_state = fields.Selection([
+        ('planned', 'Planned'),
+        ('in_progress', 'In Progress'),
+        ('done', 'Completed'),
+        ('cancelled', 'Cancelled'),
+        ('draft', 'Draft'),
+    ], string='New Audit Status')
+    action_state = fields.Selection([
+        ('planned', 'Planned'),
+        ('in_progress', 'In Progress'),
+        ('review', 'Under Review'),
+        ('completed', 'Completed'),
+        ('cancelled', 'Cancelled'),
+        ('draft', 'Draft'),
+    ], string='New Action Status')
+    note = fields.Text('Note', help="Added to the status change summary posted on the audits")
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        context = self.env.context
+        if context.get('active_model') in TRANSITION_MODELS and context.get('active_ids'):
+            res['res_model'] = context['active_model']
+            field_name = 'audit_ids' if context['active_model'] == 'supplier.audit' else 'action_ids'
+            res[field_name] = [(6, 0, context['active_ids'])]
+        return res
+
+    @api.depends('res_model', 'audit_ids', 'action_ids')
+    def _compute_record_count(self):
+        for wizard in self:
+            wizard.record_count = len(wizard._get_records())
+
+    def _get_records(self):
+        return self.audit_ids if self.res_model == 'supplier.audit' else self.action_ids
+
+    def action_apply(self):
+        self.ensure_one()
+        state = self[TRANSITION_MODELS[self.res_model]]
+        if not state:
+            raise UserError(_("Please select the new status."))
+        moved, skipped = self._get_records().bulk_transition(state, self.note)
+        message = _("%s records moved.") % len(moved)
+        if skipped:
+            message += ' ' + _("%s records skipped, their current status does not allow this change.") % len(skipped)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Bulk Status Change'),
+                'message': message,
+                'type': 'warning' if skipped else 'success',
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
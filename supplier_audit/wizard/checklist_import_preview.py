@@ -0,0 +1,39 @@
+from odoo import models, fields
+
+
+class AuditChecklistImportPreview(models.TransientModel):
+    _name = 'audit.checklist.import.preview'
+    _description = 'Checklist Import Preview'
+
+    checklist_id = fields.Many2one('audit.checklist', string='Checklist', required=True, ondelete='cascade')
+    create_count = fields.Integer('New Questions', readonly=True)
+    update_count = fields.Integer('Updated Questions', readonly=True)
+    archive_count = fields.Integer('Archived Questions', readonly=True)
+    unchanged_count = fields.Integer('Unchanged Questions', readonly=True)
+    issue_count = fields.Integer('Rows with Issues', readonly=True,
+                                 help="Rows skipped or corrected during the import, detailed in the import report.")
+    line_ids = fields.One2many('audit.checklist.import.preview.line', 'preview_id', string='Changes',
+                               readonly=True)
+
+    def action_apply(self):
+        self.ensure_one()
+        self.checklist_id.action_apply_question_import()
+        return {'type': 'ir.actions.act_window_close'}
+
+
+class AuditChecklistImportPreviewLine(models.TransientModel):
+    _name = 'audit.checklist.import.preview.line'
+    _description = 'Checklist Import Preview Line'
+    _order = 'id'
+
+    preview_id = fields.Many2one('audit.checklist.import.preview', string='Preview', required=True,
+                                 ondelete='cascade')
+    operation = fields.Selection([
+        ('create', 'Create'),
+        ('update', 'Update'),
+        ('archive', 'Archive'),
+    ], string='Operation', readonly=True)
+    sheet_name = fields.Char('Sheet', readonly=True)
+    row_number = fields.Integer('Row', readonly=True)
+    question = fields.Text('Question', readonly=True)
+    changed_fields = fields.Char('Changed Fields', readonly=True)